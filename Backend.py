@@ -1,28 +1,94 @@
-import yaml
+import csv
+import functools
 import os
+import threading
+from contextlib import contextmanager
+
+import ConfigCodec as codec
+from ConfigPath import ConfigPath, PathResolver
+from ConfigDiff import ADDED, CHANGED, Change, diff, read_document
+from DocumentCache import DocumentCache
+from LazyLoader import material_keys, resolve
+from EditJournal import EditJournal, apply_entry, decode_entry, encode_entry
+from GroupIndex import GroupIndex
+from GroupPairs import GroupPairs
+
+
+_MISSING = object()
+
+
+def convert_value(text):
+    """
+    Convert text typed into the editor to the value it stands for (int,
+    float, bool, list, ...), the way YAML reads it. Text YAML cannot read is
+    kept as a string.
+    """
+    try:
+        return codec.load(text)
+    except (ValueError, codec.YAMLError):
+        return text
+
+
+def same_value(old, new):
+    """
+    Returns True if old and new would be written the same way: equal values
+    of the same types, with mapping keys in the same order. Unlike ==, this
+    tells 1, 1.0 and True apart.
+    """
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return list(old) == list(new) and all(same_value(old[key], new[key]) for key in old)
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(same_value, old, new))
+    return old == new or (old != old and new != new)
+
+
+def _synchronized(method):
+    """
+    Run a YAMLConfigManager method while holding the shared document lock,
+    so background compaction never serializes a half-applied edit.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with DocumentCache().lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class RightSection_BackEnd:
+    """
+    Reads and writes the values shown on the property pages of the editor.
+    Like the rest of this module it does not use Qt, so scripts can edit
+    properties the way the editor does.
+    """
+
     def __init__(self, file_path):
         """
         Initialize the backend with the path to the YAML file.
         """
         self.file_path = file_path
         self.config_data = self.load_config()
+        self._resolver = None
 
     def load_config(self):
         """
         Load the configuration data from the YAML file.
+        The parsed document is shared through the DocumentCache, so
+        repeated loads of an unchanged file do not re-parse it.
         """
         try:
-            with open(self.file_path, "r") as file:
-                return yaml.safe_load(file) or {}
+            return DocumentCache().load(self.file_path) or {}
         except FileNotFoundError:
             return {}
 
     def save_config(self):
         """
         Save the current configuration data back to the YAML file.
+        The document is shared with YAMLConfigManager through the
+        DocumentCache, so the 'Groups' section is always up to date.
         """
         if not self.file_path:
             raise ValueError(
@@ -30,8 +96,7 @@ class RightSection_BackEnd:
             )
 
         try:
-            with open(self.file_path, "w") as file:
-                yaml.safe_dump(self.config_data, file)
+            DocumentCache().write(self.file_path, self.config_data)
         except Exception as e:
             print(f"Error saving config: {e}")
             raise
@@ -43,58 +108,350 @@ class RightSection_BackEnd:
         """
         if not section:
             return self.config_data
-
-        keys = section.split(".")
-        data = self.config_data
-        for key in keys:
-            data = data.get(key, {})
-        return data
+        return self._paths().get(section, {})
 
     def update_value(self, path, value):
         """
-        Update a value in the configuration data given a dot-separated path.
+        Update a value in the configuration data given a dot-separated path
+        or a ConfigPath. A value that is already there is left alone, so a
+        save does not rewrite it (and drop its comments).
+        """
+        keys = ConfigPath.of(path)
+        with DocumentCache().lock:
+            if same_value(resolve(self._paths().get(keys, _MISSING)), value):
+                return
+            self._set_nested_value(keys, value)
+            DocumentCache().mark_changed(self.file_path, keys)
+
+    def apply_values(self, values):
+        """
+        Update several values at once; values maps paths to new values, as
+        returned by convert_to_type(). Only the values that differ from the
+        ones in memory are changed.
+        """
+        with DocumentCache().lock:
+            for path, value in values.items():
+                self.update_value(path, value)
+
+    def pending_changes(self, values=None):
+        """
+        Returns the changes (see ConfigDiff.Change) saving would write to the
+        file: the edits in memory that are not on disk yet, with values (a
+        dict of paths to new values) in place of the ones in memory.
+        Raises FileNotFoundError if the file does not exist yet.
+        """
+        values = values or {}
+        on_disk = read_document(self.file_path)
+        cache = DocumentCache()
+        with cache.lock:
+            hashes = cache.hashes(self.file_path, self.config_data)
+            changes = [
+                change
+                for change in diff(on_disk, self.config_data, new_hashes=hashes)
+                if change.path not in values
+            ]
+
+        paths = PathResolver(on_disk)
+        for path, value in values.items():
+            old = paths.get(path, _MISSING)
+            if old is _MISSING:
+                changes.append(Change(ADDED, path, new=value))
+            elif not same_value(old, value):
+                changes.append(Change(CHANGED, path, old=old, new=value))
+        return changes
+
+    def _set_nested_value(self, keys, value):
+        """
+        Helper function to set a value in a nested dictionary, creating
+        missing dictionaries along the way.
         """
-        keys = path.split(".")
-        self._set_nested_value(self.config_data, keys, value)
+        paths = self._paths()
+        data, key = paths.parent(keys, create=True)
+        if isinstance(data.get(key), (dict, list)):
+            paths.invalidate()
+        data[key] = value
 
-    def _set_nested_value(self, data, keys, value):
+    def _paths(self):
         """
-        Helper function to set a value in a nested dictionary.
+        Returns the PathResolver shared by every backend of this document.
         """
-        for key in keys[:-1]:
-            data = data.setdefault(key, {})
-        data[keys[-1]] = value
+        if self._resolver is None or self._resolver.root is not self.config_data:
+            self._resolver = DocumentCache().resolver(self.file_path, self.config_data)
+        return self._resolver
 
     def convert_to_type(self, value):
         """
         Convert a string value to its appropriate data type (e.g., int, float, bool).
         """
-        try:
-            return yaml.safe_load(value)
-        except ValueError:
-            return value
+        return convert_value(value)
 
 
 class YAMLConfigManager:
+    """
+    Singleton owning the loaded config document and every mutation of it.
+
+    Edits are appended to a small fsynced EditJournal next to the config
+    instead of rewriting the whole file. The journal is compacted into the
+    config (written atomically) after compact_delay seconds without further
+    edits, or immediately on save(). Set journal_enabled to False to write
+    the full file after every edit instead.
+
+    Lists under 'Groups' are mirrored by a GroupIndex for constant-time
+    membership checks. With dedupe_group_items enabled, add_items_to_group()
+    skips items that are already in the group.
+
+    The entity/block pairing is kept in a GroupPairs index (group_pairs()),
+    built on first use and updated by every key that is set or deleted
+    under 'Groups' and 'VanillaEntity'.
+    """
+
     _instance = None
+    journal_enabled = True
+    compact_delay = 2.0
+    dedupe_group_items = True
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super().__new__(cls, *args, **kwargs)
             cls._instance.yaml_data = None
             cls._instance.file_path = None
+            cls._instance._transaction_depth = 0
+            cls._instance._pending_write = False
+            cls._instance._undo_log = []
+            cls._instance._snapshotted_lists = set()
+            cls._instance._journal = None
+            cls._instance._journal_buffer = []
+            cls._instance._journal_mark = 0
+            cls._instance._dirty = False
+            cls._instance._flush_queued = False
+            cls._instance._journal_offset = 0
+            cls._instance._compaction_timer = None
+            cls._instance._resolver = None
+            cls._instance._group_indexes = {}
+            cls._instance._pairs = None
+            cls._instance._unseen_changes = []
         return cls._instance
 
-    def load_yaml(self, file_path):
+    @contextmanager
+    def transaction(self):
+        """
+        Group several mutations into a single file write.
+
+        Every mutating method called inside the block only changes the data in
+        memory; the file is written once when the outermost block exits. If the
+        block raises, all mutations made inside it are rolled back and nothing
+        is written. Nested transactions join the outermost one.
+
+        Example:
+            with config_manager.transaction():
+                config_manager.remove_items_from_group("Blocks", ["DIRT", "STONE"])
+                config_manager.delete_group("Unused")
+        """
+        lock = DocumentCache().lock
+        lock.acquire()
+        if not self._transaction_depth:
+            self._journal_mark = len(self._journal_buffer)
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self._rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self._commit()
+        finally:
+            lock.release()
+
+    def in_transaction(self):
+        """
+        Returns True while a transaction() block is open.
+        """
+        return self._transaction_depth > 0
+
+    def _commit(self):
+        """
+        Write the file once if the finished transaction changed anything.
+        """
+        pending_write = self._pending_write
+        self._clear_transaction()
+        if pending_write:
+            self._write_yaml_file()
+
+    def _rollback(self):
+        """
+        Undo every mutation recorded in the current transaction.
+        """
+        for undo in reversed(self._undo_log):
+            undo()
+        self._paths().invalidate()
+        self._group_indexes.clear()
+        self._pairs = None
+        DocumentCache().forget_hashes(self.file_path)
+        del self._journal_buffer[self._journal_mark:]
+        print(f"Transaction rolled back ({len(self._undo_log)} changes undone).")
+        self._clear_transaction()
+
+    def _clear_transaction(self):
+        self._pending_write = False
+        self._undo_log.clear()
+        self._snapshotted_lists.clear()
+
+    def _log_edit(self, op, path, old_value=_MISSING, new_value=_MISSING):
+        """
+        Queue a journal entry for a mutation. Entries are written to the
+        journal when the change is committed.
+        """
+        if not self.file_path:
+            return
+        DocumentCache().mark_changed(self.file_path, path)
+        if not self.journal_enabled:
+            return
+        entry = {"op": op, "path": list(path)}
+        if old_value is not _MISSING:
+            entry["old"] = old_value
+        if new_value is not _MISSING:
+            entry["new"] = new_value
+        self._journal_buffer.append(encode_entry(entry))
+
+    def _remember_key(self, container, key, path, new_value):
+        """
+        Journal container[key] = new_value and record how to restore
+        container[key] if the transaction is rolled back.
+        """
+        self._log_edit("set", path, container.get(key, _MISSING), new_value)
+        self._track_pairs(path, new_value)
+        if isinstance(container.get(key), (dict, list)):
+            self._paths().invalidate()
+        if not self._transaction_depth:
+            return
+        if key in container:
+            old_value = container[key]
+            self._undo_log.append(lambda: container.__setitem__(key, old_value))
+        else:
+            self._undo_log.append(lambda: container.pop(key, None))
+
+    def _remember_delete(self, container, key, path):
+        """
+        Journal del container[key] and record how to put the key back in its
+        original position if the transaction is rolled back.
+        """
+        old_value = container[key]
+        self._log_edit("delete", path, old_value)
+        self._track_pairs(path)
+        if isinstance(old_value, (dict, list)):
+            self._paths().invalidate()
+        if not self._transaction_depth:
+            return
+        snapshot = list(container.items())
+
+        def restore():
+            container.clear()
+            container.update(snapshot)
+
+        self._undo_log.append(restore)
+
+    def _track_pairs(self, path, value=_MISSING):
+        """
+        Update the pairing index for the key at path being set to value, or
+        deleted when no value is given.
+        """
+        pairs = self._pairs
+        path = tuple(path)
+        if pairs is None or not path or path[0] not in ("Groups", "VanillaEntity"):
+            return
+        if len(path) == 1:
+            # A whole section was replaced; rebuild on next use.
+            self._pairs = None
+        elif path[0] == "Groups":
+            if len(path) == 2:
+                if value is _MISSING:
+                    pairs.remove_group(path[1])
+                else:
+                    pairs.add_group(path[1])
+        elif len(path) == 2:
+            if value is _MISSING:
+                pairs.remove_entity(path[1])
+            else:
+                pairs.set_blocks(path[1], material_keys({path[1]: value}, path[1]))
+        elif path[2] == "Materials":
+            if len(path) == 3:
+                blocks = list(value) if isinstance(value, dict) else []
+                pairs.set_blocks(path[1], blocks)
+            elif len(path) == 4:
+                if value is _MISSING:
+                    pairs.remove_block(path[1], path[3])
+                else:
+                    pairs.add_block(path[1], path[3])
+
+    def _remember_list(self, items, op, path, value):
+        """
+        Journal an in-place list edit and record the contents of the list
+        before it is modified. Each list is only copied once per transaction.
+        """
+        if op == "add_items":
+            self._log_edit(op, path, new_value=list(value))
+        else:
+            self._log_edit(op, path, old_value=value)
+
+        if not self._transaction_depth or id(items) in self._snapshotted_lists:
+            return
+        self._snapshotted_lists.add(id(items))
+        snapshot = list(items)
+
+        def restore():
+            items[:] = snapshot
+
+        self._undo_log.append(restore)
+
+    def load_yaml(self, file_path, preloaded=None):
         """
         Loads the YAML file into memory and parses it.
+        Any journal left behind by a crash is replayed and compacted.
+
+        preloaded is an optional (data, group_pairs) pair produced by a
+        LoadWorker. The index is adopted if data is still the document
+        cached for file_path and no journal had to be replayed into it.
         """
 
         try:
-            with open(file_path, "r") as file:
-                self.yaml_data = yaml.safe_load(file)
+            same_file = self.file_path and os.path.abspath(
+                self.file_path
+            ) == os.path.abspath(file_path)
+            if self._dirty and (
+                not same_file or not DocumentCache().is_cached(file_path)
+            ):
+                # Keep pending edits before the document is replaced.
+                self.save()
+
+            data = DocumentCache().load(file_path)
+            fresh = data is not self.yaml_data
+            carried = None
+            if fresh and same_file and (self._dirty or self._journal_buffer):
+                # The file was read again (e.g. by a LoadWorker) before the
+                # edits to the copy in memory were written; they are applied
+                # to the new copy instead of being dropped with the journal.
+                carried = self._apply_pending(data)
+            if fresh:
+                self._group_indexes.clear()
+                self._pairs = None
+                if preloaded is not None and preloaded[0] is data and carried is None:
+                    self._pairs = preloaded[1]
+            self.yaml_data = data
             self.file_path = file_path
             print(f"YAML loaded from {file_path}")
+            if carried is not None:
+                if self._journal is not None:
+                    self._journal.discard()
+                self._journal_buffer[:] = carried
+                self._dirty = True
+                print(f"Kept {len(carried)} edits that were not saved yet.")
+                self._compact()
+            elif fresh:
+                self._replay_journal()
             self.parse_yaml()
         except Exception as e:
             print(f"Error loading YAML file: {e}")
@@ -109,6 +466,16 @@ class YAMLConfigManager:
 
         # print(f"Groups: {self.yaml_data.get('Groups')}")
 
+    def io_stats(self):
+        """
+        Returns the DocumentCache I/O counters: parses, group_parses, writes,
+        bytes_read and bytes_written since the last reset_io_stats().
+        """
+        return DocumentCache().stats()
+
+    def reset_io_stats(self):
+        DocumentCache().reset_stats()
+
     def get_yaml_data(self):
         """
         Returns the current YAML data in memory.
@@ -121,30 +488,50 @@ class YAMLConfigManager:
         """
         return os.path.abspath(self.file_path)
 
+    def _paths(self):
+        """
+        Returns the PathResolver shared by every backend of this document.
+        """
+        if self._resolver is None or self._resolver.root is not self.yaml_data:
+            self._resolver = DocumentCache().resolver(self.file_path, self.yaml_data)
+        return self._resolver
+
     def get_value(self, path, default=None):
         """
         Dynamically access a value by providing a path (e.g., 'Groups.aa').
-        Supports nested keys in YAML (dot notation).
+        Supports nested keys in YAML (dot notation), or a ConfigPath for keys
+        that contain dots.
 
         If the key is not found, returns the specified default value (or None if not specified).
         """
-        keys = path.split(".")
-        value = self.yaml_data
-
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
-                value = value[int(key)]
-            else:
+        value = self._paths().get(path, _MISSING)
+        if value is _MISSING:
+            print(
+                f"Key '{path}' not found in the current structure. Returning default value."
+            )
+            return default
+        return value
 
-                print(
-                    f"Key '{key}' not found in the current structure. Returning default value."
-                )
-                return default
+    def group_pairs(self):
+        """
+        Returns the GroupPairs index of the loaded config, building it on
+        first use. Entity groups that have not been loaded yet are not
+        parsed; their block groups come from the index built when the file
+        was opened.
+        """
+        if self._pairs is None:
+            data = self.yaml_data if isinstance(self.yaml_data, dict) else {}
+            self._pairs = GroupPairs(data.get("VanillaEntity"), data.get("Groups"))
+        return self._pairs
 
-        return value
+    def get_group_pairs(self):
+        """
+        Returns (entity_group, block_group) pairs, one for every block group
+        listed under VanillaEntity.<entity_group>.Materials, in file order.
+        """
+        return self.group_pairs().pairs()
 
+    @_synchronized
     def add_values(self, path, new_entries):
         """
         Adds multiple key-value pairs to a specific path in the YAML structure
@@ -152,20 +539,16 @@ class YAMLConfigManager:
 
         new_entries: A dictionary of new key-value pairs to add.
         """
-        keys = path.split(".")
-        value = self.yaml_data
-
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
-                value = value[int(key)]
-            else:
-                print(f"Key '{key}' not found in the current structure.")
-                return False
+        keys = ConfigPath.of(path)
+        value = self._paths().get(keys, _MISSING)
+        if value is _MISSING:
+            print(f"Key '{keys}' not found in the current structure.")
+            return False
 
         if isinstance(value, dict):
 
+            for key, new_value in new_entries.items():
+                self._remember_key(value, key, keys.child(key), new_value)
             value.update(new_entries)
 
             self._write_yaml_file()
@@ -173,43 +556,262 @@ class YAMLConfigManager:
             return True
         else:
             print(
-                f"Cannot add values. The final key '{keys[-1]}' should be a dictionary."
+                f"Cannot add values. The final key '{keys.key}' should be a dictionary."
             )
             return False
 
     def _write_yaml_file(self):
         """
-        Writes the updated YAML data to the file.
+        Persists the pending changes.
+
+        With journaling enabled only the new journal entries are written and
+        the full YAML file is rewritten later by compaction; otherwise the
+        whole file is written now. Inside a transaction the write is deferred
+        until it commits.
         """
+        if self._transaction_depth:
+            self._pending_write = True
+            return
+
         if self.file_path:
             try:
-                with open(self.file_path, "w") as file:
-                    yaml.dump(self.yaml_data, file, default_flow_style=False)
-                    print(f"YAML file updated and saved to {self.file_path}")
+                if self.journal_enabled:
+                    self._flush_journal()
+                    self._schedule_compaction()
+                else:
+                    self._compact()
             except Exception as e:
                 print(f"Error writing YAML file: {e}")
         else:
             print("No file path specified to write the YAML data.")
 
+    def save(self):
+        """
+        Write all pending edits into the YAML file now and clear the journal.
+        Call this outside of a transaction.
+        """
+        if self._dirty or self._journal_buffer:
+            self._compact()
+
+    def _flush_journal(self):
+        """
+        Append the queued entries to the journal with a single fsync.
+        While the config itself is being written the entries stay queued;
+        they start a fresh journal once the new file is in place.
+        """
+        if not self._journal_buffer:
+            return
+        if DocumentCache().is_writing(self.file_path):
+            self._dirty = True
+            if not self._flush_queued:
+                self._flush_queued = True
+                DocumentCache().when_idle(
+                    self.file_path,
+                    functools.partial(self._flush_deferred, self.file_path),
+                )
+            return
+        if self._journal is None or self._journal.config_path != os.path.abspath(
+            self.file_path
+        ):
+            self._journal = EditJournal(self.file_path)
+        written = self._journal.append(
+            self._journal_buffer, DocumentCache().stamp(self.file_path)
+        )
+        DocumentCache().count("writes")
+        DocumentCache().count("bytes_written", written)
+        self._journal_offset += len(self._journal_buffer)
+        self._journal_buffer.clear()
+        self._dirty = True
+
+    def _flush_deferred(self, file_path):
+        """
+        Journal the entries that were queued while file_path was written.
+        An open transaction journals them itself when it commits.
+        """
+        self._flush_queued = False
+        if self.file_path != file_path or self._transaction_depth:
+            return
+        self._flush_journal()
+
+    def _schedule_compaction(self):
+        """
+        (Re)start the debounce timer that compacts the journal.
+        """
+        if self._compaction_timer is not None:
+            self._compaction_timer.cancel()
+        self._compaction_timer = threading.Timer(self.compact_delay, self._compact)
+        self._compaction_timer.daemon = False
+        self._compaction_timer.start()
+
+    def _compact(self):
+        """
+        Atomically rewrite the YAML file from memory and drop the journal.
+
+        The document lock is only held while the snapshot is taken and while
+        the new file is moved into place, so edits can go on while a large
+        config is serialized and written.
+        """
+        cache = DocumentCache()
+        with cache.lock:
+            if self._compaction_timer is not None:
+                self._compaction_timer.cancel()
+                self._compaction_timer = None
+            if not self.file_path or self.yaml_data is None:
+                return
+            # Never write over changes another program made in the meantime.
+            self._merge_disk_changes()
+            snapshot = cache.snapshot(self.file_path, self.yaml_data)
+            included = self._journal_offset + len(self._journal_buffer)
+
+        def written():
+            # Entries queued after the snapshot stay queued and go into a
+            # fresh journal once no other write of the file is in flight.
+            # The journal only ever holds entries from before the oldest
+            # snapshot still in flight, so dropping it here loses nothing.
+            done = included - self._journal_offset
+            if done > 0:
+                del self._journal_buffer[:done]
+                self._journal_offset = included
+            if self._journal is not None:
+                self._journal.discard()
+            self._dirty = bool(self._journal_buffer)
+
+        try:
+            cache.write_snapshot(snapshot, written)
+            print(f"YAML file updated and saved to {self.file_path}")
+        except Exception as e:
+            print(f"Error writing YAML file: {e}")
+
+    @_synchronized
+    def reload_from_disk(self):
+        """
+        Bring the loaded config up to date after another program changed the
+        file. Returns the changes to the document since the last call ([] if
+        there are none, see ConfigDiff.diff), or None while the file is being
+        written, in which case the caller should try again later.
+        """
+        if not self.file_path or self.yaml_data is None:
+            return []
+        if DocumentCache().is_writing(self.file_path):
+            return None
+        self._merge_disk_changes()
+        if self._dirty:
+            self._schedule_compaction()
+        changes, self._unseen_changes = self._unseen_changes, []
+        return changes
+
+    def diff_against(self, file_path=None, sets=True):
+        """
+        Returns the changes (see ConfigDiff.Change) that turn the config at
+        file_path, e.g. a backup or another server's copy, into the document
+        in memory. By default file_path is the open file as it is on disk,
+        so the result is what saving would change. With sets False, group
+        lists are compared in order.
+        """
+        other = read_document(file_path or self.file_path)
+        cache = DocumentCache()
+        with cache.lock:
+            hashes = cache.hashes(self.file_path, self.yaml_data)
+            return diff(other, self.yaml_data, sets=sets, new_hashes=hashes)
+
+    def _merge_disk_changes(self):
+        """
+        Adopt the file on disk if it changed behind our back. Edits that are
+        not in the file yet (the journal and the queued entries) are applied
+        again on top of it, so they win where both sides changed the same
+        value; an edit that no longer applies, e.g. to a deleted group, is
+        dropped. The document is updated in place (see DocumentCache.reload),
+        so only the sections and groups that really changed are replaced.
+        The changes seen are kept for reload_from_disk().
+        """
+        cache = DocumentCache()
+        if self._transaction_depth or cache.is_cached(self.file_path):
+            return
+        kept = []
+
+        def apply_pending(data):
+            kept.extend(self._apply_pending(data))
+
+        try:
+            changes = cache.reload(self.file_path, self.yaml_data, prepare=apply_pending)
+            if changes is None:
+                # Not the cached document (e.g. the cache was cleared).
+                data = cache.load(self.file_path)
+                apply_pending(data)
+                changes = diff(self.yaml_data, data, sets=False)
+                self.yaml_data = data
+        except FileNotFoundError:
+            print(f"{self.file_path} was removed; the next save writes it again.")
+            return
+        except codec.YAMLError as e:
+            print(f"Ignoring unreadable change to {self.file_path}: {e}")
+            return
+
+        self._unseen_changes.extend(changes)
+        if changes:
+            self._paths().invalidate()
+            self._group_indexes.clear()
+            self._pairs = None
+        if self._journal is not None:
+            self._journal.discard()
+        self._journal_buffer[:] = kept
+        self._dirty = False
+        print(
+            f"Merged changes made to {self.file_path} by another program "
+            f"({len(kept)} pending edits kept)."
+        )
+        self._flush_journal()
+
+    def _apply_pending(self, data):
+        """
+        Apply the edits that are not in the file yet (the journal and the
+        queued entries) to data, a fresh copy of the document, and mark them
+        changed. An edit that no longer applies is dropped. Returns the
+        encoded entries that were applied.
+        """
+        pending = self._journal.entries() if self._journal is not None else []
+        pending += [decode_entry(line) for line in self._journal_buffer]
+        kept = []
+        for entry in pending:
+            try:
+                apply_entry(data, entry)
+            except (KeyError, IndexError, TypeError, AttributeError) as e:
+                print(f"Dropping edit of {entry['path']}, which no longer applies: {e}")
+                continue
+            DocumentCache().mark_changed(self.file_path, entry["path"])
+            kept.append(encode_entry(entry))
+        return kept
+
+    def _replay_journal(self):
+        """
+        Apply a journal left over from a previous session, then compact it.
+        """
+        self._journal = EditJournal(self.file_path)
+        replayed = self._journal.replay(
+            self.yaml_data, DocumentCache().stamp(self.file_path)
+        )
+        for path in replayed:
+            DocumentCache().mark_changed(self.file_path, path)
+        if replayed:
+            self._paths().invalidate()
+            self._group_indexes.clear()
+            self._pairs = None
+            self._compact()
+
+    @_synchronized
     def set_value(self, path, new_value):
         """
         Dynamically set a value by providing a path (e.g., 'Groups.aa')
-        and the new value.
+        or a ConfigPath, and the new value.
         """
-        keys = path.split(".")
-        value = self.yaml_data
-
-        for key in keys[:-1]:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
-                value = value[int(key)]
-            else:
-                print(f"Key '{key}' not found in the current structure.")
-                return False
+        keys = ConfigPath.of(path)
+        value, final_key = self._paths().parent(keys)
+        if value is None:
+            print(f"Key '{keys.parent}' not found in the current structure.")
+            return False
 
-        final_key = keys[-1]
         if isinstance(value, dict):
+            self._remember_key(value, final_key, keys, new_value)
             value[final_key] = new_value
             return True
         else:
@@ -220,9 +822,53 @@ class YAMLConfigManager:
 
 
 
+    def _group_index(self, group_name, items):
+        """
+        Returns the GroupIndex of the list Groups.<group_name>, rebuilding it
+        if the list was changed without it, or None if the items cannot be
+        indexed (unhashable values).
+        """
+        index = self._group_indexes.get(group_name)
+        if index is None or not index.matches(items):
+            try:
+                index = GroupIndex(items)
+            except TypeError:
+                return None
+            self._group_indexes[group_name] = index
+        return index
+
+    def group_contains(self, group_name, item):
+        """
+        Returns True if item is listed in Groups.<group_name>.
+        """
+        items = ((self.yaml_data or {}).get("Groups") or {}).get(group_name)
+        if not isinstance(items, list):
+            return False
+        index = self._group_index(group_name, items)
+        return item in index if index is not None else item in items
+
+    def new_group_items(self, group_name, items):
+        """
+        Returns the items add_items_to_group() would append to the group:
+        all of them, or only the ones not listed yet when dedupe_group_items
+        is enabled.
+        """
+        if not self.dedupe_group_items:
+            return list(items)
+        existing = ((self.yaml_data or {}).get("Groups") or {}).get(group_name)
+        if not isinstance(existing, list):
+            return list(dict.fromkeys(items))
+        index = self._group_index(group_name, existing)
+        if index is None:
+            return [item for item in dict.fromkeys(items) if item not in existing]
+        return index.new_items(items)
+
+    @_synchronized
     def remove_item_from_group(self, group_name, item):
         """
         Removes a specific item from a group in the 'Groups' section.
+        This scans the group's list; to remove several items, call
+        remove_items_from_group(), which removes them in a single pass.
 
         Args:
             group_name (str): The name of the group to remove the item from.
@@ -235,15 +881,18 @@ class YAMLConfigManager:
                 group_items = groups[group_name]
                 
                 if isinstance(group_items, list):
-                    if item in group_items:
-                        group_items.remove(item)
+                    index = self._group_index(group_name, group_items)
+                    if item in (index if index is not None else group_items):
+                        self._remember_list(
+                            group_items, "remove_item", ["Groups", group_name], item
+                        )
+                        if index is not None:
+                            index.remove(item)
+                        else:
+                            group_items.remove(item)
                         print(f"Item '{item}' removed from group '{group_name}'.")
 
-                        # If the list is empty, convert it to an empty dictionary
-                        if not group_items:
-                            groups[group_name] = {}
-                            print(f"Group '{group_name}' is now an empty dictionary.")
-                        
+                        self._drop_empty_group(groups, group_name)
                         self._write_yaml_file()
                         return True
                     else:
@@ -259,47 +908,263 @@ class YAMLConfigManager:
             print("No 'Groups' section found in YAML data.")
             return False
 
+    @_synchronized
+    def remove_items_from_group(self, group_name, items):
+        """
+        Removes several items from a group in a single pass over its list and
+        writes the file once. Used for multi-selection removal.
+
+        Args:
+            group_name (str): The name of the group to remove the items from.
+            items (list): The items to remove; each removes one occurrence.
 
-    def add_items_to_group(self, group_name, items):
+        Returns:
+            list: The items that were actually removed.
+        """
+        groups = (self.yaml_data or {}).get("Groups")
+        group_items = groups.get(group_name) if isinstance(groups, dict) else None
+        if not isinstance(group_items, list):
+            print(f"Group '{group_name}' is not a list. Cannot remove items.")
+            return []
+
+        index = self._group_index(group_name, group_items)
+        if index is None:
+            print(f"Group '{group_name}' cannot be indexed. Cannot remove items.")
+            return []
+
+        present = [item for item in items if item in index]
+        if not present:
+            print(f"None of {items} found in group '{group_name}'.")
+            return []
+
+        self._remember_list(group_items, "remove_items", ["Groups", group_name], present)
+        removed = index.remove_many(present)
+        print(f"Items {removed} removed from group '{group_name}'.")
+
+        self._drop_empty_group(groups, group_name)
+        self._write_yaml_file()
+        return removed
+
+    def _drop_empty_group(self, groups, group_name):
+        # An emptied list is stored as an empty dictionary.
+        if not groups[group_name]:
+            self._remember_key(groups, group_name, ["Groups", group_name], {})
+            groups[group_name] = {}
+            print(f"Group '{group_name}' is now an empty dictionary.")
+
+    @_synchronized
+    def add_items_to_group(self, group_name, items, dedupe=None):
+        """
+        Appends items to a group in the 'Groups' section.
+
+        Args:
+            group_name (str): The name of the group to add the items to.
+            items (list): The items to append.
+            dedupe (bool): Skip items already in the group (and repeats within
+                items). Defaults to dedupe_group_items.
+        """
+        if dedupe is None:
+            dedupe = self.dedupe_group_items
+
+        added = self._append_group_items(group_name, items, dedupe)
+        if added is None:
+            return False
+        if not added:
+            print(f"All items are already in group '{group_name}'.")
+            return True
+
+        # After adding items, write to the YAML file
+        self._write_yaml_file()
+        print(f"Items {added} added to group '{group_name}'.")
+        return True
+
+    def _append_group_items(self, group_name, items, dedupe):
+        """
+        Appends items to Groups.<group_name> in memory without writing.
+        Returns the items that were appended, or None if the group cannot
+        take items.
+        """
         if self.yaml_data and "Groups" in self.yaml_data:
             groups = self.yaml_data["Groups"]
 
             if group_name in groups:
                 existing_items = groups[group_name]
 
-                if isinstance(existing_items, list):
-                    # If the group is already a list, add items directly, even if they are the same
-                    for item in items:
-                        existing_items.append(item)  # Just append without checking for duplicates
-                elif isinstance(existing_items, dict):
+                if isinstance(existing_items, dict):
                     # If the group is a dictionary, convert it to a list and add items
                     print(f"Group '{group_name}' is a dictionary. Converting it to a list and adding items.")
-                    groups[group_name] = []  # Convert dictionary to an empty list
-
-                    # Append the items, even if they are the same as others
-                    for item in items:
-                        groups[group_name].append(item)
-
-                else:
+                    self._remember_key(groups, group_name, ["Groups", group_name], [])
+                    existing_items = groups[group_name] = []  # Convert dictionary to an empty list
+                elif not isinstance(existing_items, list):
                     print(
                         f"Group '{group_name}' exists, but it is not a list or dictionary. It is a {type(existing_items)}."
                     )
-                    return False
+                    return None
+
+                index = self._group_index(group_name, existing_items)
+                if dedupe:
+                    items = (
+                        index.new_items(items)
+                        if index is not None
+                        else [i for i in dict.fromkeys(items) if i not in existing_items]
+                    )
+                else:
+                    items = list(items)
+                if not items:
+                    return []
 
-                # After adding items, write to the YAML file
-                self._write_yaml_file()
-                print(f"Items {items} added to group '{group_name}'.")
-                return True
+                self._remember_list(
+                    existing_items, "add_items", ["Groups", group_name], items
+                )
+                if index is not None:
+                    index.add(items)
+                else:
+                    existing_items.extend(items)
+                return items
             else:
                 print(f"Group '{group_name}' does not exist. No items were added.")
-                return False
+                return None
         else:
             print("No 'Groups' structure found in the YAML data.")
-            return False
+            return None
+
+    def import_group_items(self, file_path, default_group=None):
+        """
+        Adds the group items listed in a text or CSV file (see
+        read_group_items) in one transaction, so the config is written once.
+        Items already in their group are skipped.
+
+        Args:
+            file_path (str): The file to import.
+            default_group (str): Group for rows that only name a material.
+
+        Returns:
+            dict: {"added": {group: count}, "duplicates": int,
+            "unknown_groups": [names], "skipped_rows": int}, or None if no
+            config with a 'Groups' section is loaded.
+        """
+        imported, skipped_rows = read_group_items(file_path, default_group)
+
+        summary = {
+            "added": {},
+            "duplicates": 0,
+            "unknown_groups": [],
+            "skipped_rows": skipped_rows,
+        }
+        with self.transaction():
+            groups = (self.yaml_data or {}).get("Groups")
+            if not isinstance(groups, dict):
+                print("No 'Groups' structure found in the YAML data.")
+                return None
+
+            for group_name, items in imported.items():
+                added = (
+                    self._append_group_items(group_name, items, True)
+                    if group_name in groups
+                    else None
+                )
+                if added is None:
+                    summary["unknown_groups"].append(group_name)
+                    continue
+                summary["added"][group_name] = len(added)
+                summary["duplicates"] += len(items) - len(added)
+
+            if any(summary["added"].values()):
+                self._write_yaml_file()
+
+        print(
+            f"Imported {sum(summary['added'].values())} items into "
+            f"{len(summary['added'])} groups from {file_path}."
+        )
+        return summary
+
+    def delete_group(self, group_name):
+        """
+        Deletes a group from 'Groups' together with its pairing: the
+        VanillaEntity entry of an entity group, or the Materials entry of a
+        block group under every entity group that lists it. The file is
+        written once.
+
+        Returns:
+            bool: True if anything was deleted.
+        """
+        with self.transaction():
+            data = self.yaml_data if isinstance(self.yaml_data, dict) else {}
+            deleted = False
+            for entity_group in self.group_pairs().entities_listing(group_name):
+                path = ConfigPath(("VanillaEntity", entity_group, "Materials", group_name))
+                self._delete_key(self._paths().container(path.parent), path)
+                deleted = True
+            for section in ("VanillaEntity", "Groups"):
+                container = data.get(section)
+                if isinstance(container, dict) and group_name in container:
+                    self._delete_key(container, ConfigPath((section, group_name)))
+                    deleted = True
+            self._group_indexes.pop(group_name, None)
+
+            if not deleted:
+                print(f"Group '{group_name}' does not exist.")
+                return False
+            self._write_yaml_file()
+
+        print(f"Group '{group_name}' deleted.")
+        return True
+
+    def rename_group(self, old_name, new_name):
+        """
+        Renames a group in 'Groups' and wherever it is paired: the
+        VanillaEntity entry of an entity group, or its key under the
+        Materials of every entity group that lists it. Renamed keys move to
+        the end of their mapping. The file is written once.
 
+        Returns:
+            bool: True if the group was renamed.
+        """
+        with self.transaction():
+            data = self.yaml_data if isinstance(self.yaml_data, dict) else {}
+            groups = data.get("Groups")
+            if not isinstance(groups, dict) or old_name not in groups:
+                print(f"Group '{old_name}' does not exist.")
+                return False
+            vanilla_entity = data.get("VanillaEntity")
+            if not isinstance(vanilla_entity, dict):
+                vanilla_entity = {}
+            pairs = self.group_pairs()
+            if (
+                not new_name
+                or new_name in groups
+                or new_name in vanilla_entity
+                or pairs.is_block(new_name)
+            ):
+                print(f"Cannot rename group '{old_name}' to '{new_name}'; the name is taken.")
+                return False
+
+            for entity_group in pairs.entities_listing(old_name):
+                path = ConfigPath(("VanillaEntity", entity_group, "Materials"))
+                self._move_key(self._paths().container(path), path, old_name, new_name)
+            if old_name in vanilla_entity:
+                self._move_key(vanilla_entity, ConfigPath(("VanillaEntity",)), old_name, new_name)
+            self._move_key(groups, ConfigPath(("Groups",)), old_name, new_name)
+
+            index = self._group_indexes.pop(old_name, None)
+            if index is not None:
+                self._group_indexes[new_name] = index
+            self._write_yaml_file()
+
+        print(f"Group '{old_name}' renamed to '{new_name}'.")
+        return True
 
+    def _delete_key(self, container, path):
+        self._remember_delete(container, path.key, path)
+        del container[path.key]
 
+    def _move_key(self, container, path, old_key, new_key):
+        value = resolve(container[old_key])
+        self._delete_key(container, path.child(old_key))
+        self._remember_key(container, new_key, path.child(new_key), value)
+        container[new_key] = value
 
+    @_synchronized
     def set_nested_value(
         self, entity_group_name, group_name, section, property_name, new_value
     ):
@@ -319,13 +1184,17 @@ class YAMLConfigManager:
         try:
             if section == "Properties":
 
-                path = f"VanillaEntity.{entity_group_name}.{section}.{property_name}"
+                path = ConfigPath(
+                    ("VanillaEntity", entity_group_name, section, property_name)
+                )
             elif section == "Materials":
 
                 if not group_name:
                     print("group_name must be specified for Materials.")
                     return False
-                path = f"VanillaEntity.{entity_group_name}.{section}.{group_name}.{property_name}"
+                path = ConfigPath(
+                    ("VanillaEntity", entity_group_name, section, group_name, property_name)
+                )
             else:
                 print(
                     f"Invalid section: {section}. Only 'Properties' or 'Materials' allowed."
@@ -348,7 +1217,7 @@ class YAMLConfigManager:
 
 def retrieve_group_items(config_manager, group_name):
     """Retrieve and return items for a specific group."""
-    group_items = config_manager.get_value(f"Groups.{group_name}")
+    group_items = config_manager.get_value(ConfigPath(("Groups", group_name)))
 
     if group_items is not None:
         print(f"Items in {group_name}: {group_items}")
@@ -358,13 +1227,58 @@ def retrieve_group_items(config_manager, group_name):
         return {}
 
 
+def _normalize_material(name):
+    """
+    Normalize a material or entity name to the config spelling, e.g.
+    ' minecraft:oak-log ' -> 'OAK_LOG'.
+    """
+    name = name.strip()
+    if ":" in name:
+        name = name.split(":", 1)[1]
+    return name.strip().upper().replace(" ", "_").replace("-", "_")
+
+
+def read_group_items(file_path, default_group=None):
+    """
+    Read group items from a text or CSV file in a single streaming pass.
+
+    Each row is either 'group,material' or just 'material', which goes to
+    default_group. Blank lines, '#' comments and a 'group,material' header
+    are ignored. Materials are normalized and repeats are dropped.
+
+    Returns:
+        tuple: ({group: [materials]} in file order, number of skipped rows)
+    """
+    groups = {}
+    skipped_rows = 0
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        for row in csv.reader(file):
+            cells = [cell.strip() for cell in row]
+            if not any(cells) or cells[0].startswith("#"):
+                continue
+            if len(cells) >= 2 and cells[1]:
+                group_name, material = cells[0], cells[1]
+                if (group_name.lower(), material.lower()) == ("group", "material"):
+                    continue
+            else:
+                group_name, material = default_group, cells[0]
+
+            material = _normalize_material(material)
+            if not group_name or not material:
+                skipped_rows += 1
+                continue
+            groups.setdefault(group_name, {})[material] = None
+
+    return {name: list(items) for name, items in groups.items()}, skipped_rows
+
+
 def get_parent_key(self, section_path):
     """
     Retrieve the immediate parent key of the specified section path.
     For example, if section_path is "VanillaEntity.Apple.Properties",
     it will return "Apple".
     """
-    keys = section_path.split(".")
+    keys = ConfigPath.of(section_path)
     if len(keys) > 1:
         return keys[-2]
     return None
@@ -382,8 +1296,6 @@ def Add_Group_Pairs(
 
     new_entries = {"Groups": {f"{EntityGroupName}": {}, f"{BlockGroupName}": {}}}
 
-    config_manager.add_values("Groups", new_entries["Groups"])
-
     vanilla_entity_entries = {
         "VanillaEntity": {
             f"{EntityGroupName}": {
@@ -399,12 +1311,79 @@ def Add_Group_Pairs(
         }
     }
 
-    config_manager.add_values("VanillaEntity", vanilla_entity_entries["VanillaEntity"])
+    with config_manager.transaction():
+        config_manager.add_values("Groups", new_entries["Groups"])
+        config_manager.add_values(
+            "VanillaEntity", vanilla_entity_entries["VanillaEntity"]
+        )
 
     Output_Groups = config_manager.get_value("Groups")
     Output_VanillaEntity = config_manager.get_value("VanillaEntity")
 
 
+# Entity types the plugin can handle, offered when adding entities to a group.
+ENTITY_TYPES = (
+    "PRIMED_TNT", "ENDER_CRYSTAL", "WITHER", "MINECART_TNT", "CREEPER",
+    "CHARGED_CREEPER", "FIREBALL", "DRAGON_FIREBALL", "SMALL_FIREBALL",
+    "WITHER_SKULL", "CHARGED_WITHER_SKULL", "BED", "RESPAWN_ANCHOR",
+)
+
+
+def default_config():
+    """
+    Returns the content of a new, empty config: the plugin's default
+    settings and messages, with no groups.
+    """
+    return {
+        "UseBlockDatabase": False,
+        "CheckBlockDatabaseAtStartup": False,
+        "BlockDurability": 100.0,
+        "EnableMetrics": True,
+        "Checktool": {
+            "AlwaysEnabled": False,
+            "EnabledByDefault": False,
+            "PreventActionWhenCheckingHandledBlocks": True,
+            "PreventActionWhenCheckingNonHandledBlocks": True,
+            "SilentWhenCheckingOnDisabledWorlds": False,
+            "SilentWhenCheckingWithoutPermissions": False,
+            "SilentWhenCheckingNonHandledBlocks": False,
+            "SilentWhenCheckingHandledBlocks": False,
+            "ShowBossBar": False,
+            "BossBarColor": "PURPLE",
+            "BossBarStyle": "SOLID",
+            "BossBarDuration": 30
+        },
+        "Groups": {},
+        "VanillaEntity": {},
+        "Locale": {
+            "NotAllowed": "You are not allowed to perform this action!",
+            "Usage": "Usage: %DESCRIPTION%",
+            "OnlyPlayerAllowed": "Only players can perform this action!",
+            "PlayerDoesntExist": "Player %NAME% doesn't exist in the server!",
+            "PlayerIsOffline": "Player %NAME% must be online to perform that",
+            "EnterChecktoolMode": "You can now right-click a block with %PRETTY_ITEM% to display block durability",
+            "LeaveChecktoolMode": "You can no longer check for a block durability",
+            "ChecktoolToggledOn": "Checktool mode toggled on for player %NAME%",
+            "ChecktoolToggledOff": "Checktool mode toggled off for player %NAME%",
+            "ChecktoolUse": "Block health: %DURABILITY_PERCENTAGE%% (%PRETTY_MATERIAL%)",
+            "ChecktoolUseBossBar": "%PRETTY_MATERIAL%: %DURABILITY_PERCENTAGE%%",
+            "ChecktoolSet": "Checktool successfully set to %PRETTY_ITEM%!",
+            "ChecktoolNotPersisted": "Checktool item was set to %PRETTY_ITEM%, but it couldn't be persisted",
+            "ChecktoolGiven": "A checktool (%PRETTY_ITEM%) was given to player %NAME%",
+            "ChecktoolReset": "Checktool successfully reset to bare hand (Air)",
+            "ChecktoolNotHandled": "%PRETTY_MATERIAL% is not handled by the current configuration",
+            "ChecktoolInfo": "Current checktool item: %PRETTY_ITEM%",
+            "ChecktoolAlwaysEnabled": "Checktool can't be toggled off",
+            "DisabledInThisWorld": "This functionality is disabled in this world",
+            "Reloaded": "Reloaded successfully!",
+            "DebugEnabled": "Debug mode has been enabled",
+            "DebugDisabled": "Debug mode has been disabled"
+        },
+        "LocalePrefix": "[ExplodeAny]",
+        "DisabledWorlds": []
+    }
+
+
 def _generate_properties(entity_particles_checked, entity_sounds_checked):
     properties = {
         "ExplosionRadius": 0.0,
@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+import threading
+
+# PyYAML is imported the first time something is parsed or serialized (see
+# _yaml()), not when this module is, so it stays out of application
+# startup. Until then the names below are provided by __getattr__.
+_LAZY_NAMES = ("YAMLError", "HAS_LIBYAML", "MappingNode", "ScalarNode")
+_module = None
+_import_lock = threading.Lock()
+_deferred_types = []
+
+# Options shared by every writer so the C and pure-Python emitters produce
+# identical bytes. The emitters only disagree on where they fold long quoted
+# strings, so folding is disabled by giving them an unlimited line width.
+DUMP_OPTIONS = {
+    "default_flow_style": False,
+    "sort_keys": True,
+    "allow_unicode": True,
+    "width": 2**31 - 1,
+}
+
+
+def _yaml():
+    """
+    Returns the yaml module, importing it and setting up the loaders and
+    dumpers on first use.
+    """
+    global _module, _FastLoader, _FastDumper, _PyDumper
+    if _module is not None:
+        return _module
+    with _import_lock:
+        if _module is not None:
+            return _module
+        import yaml
+
+        try:
+            # libyaml bindings, roughly an order of magnitude faster than pure Python
+            from yaml import CSafeLoader as fast_loader, CSafeDumper as c_dumper
+
+            has_libyaml = True
+        except ImportError:
+            fast_loader, c_dumper = yaml.SafeLoader, yaml.SafeDumper
+            has_libyaml = False
+
+        # Private dumper subclasses, so registering extra types does not leak
+        # into other users of PyYAML in the same process.
+        class _FastDumper(c_dumper):
+            pass
+
+        class _PyDumper(yaml.SafeDumper):
+            pass
+
+        _FastLoader = fast_loader
+        for cls in _deferred_types:
+            _add_representer(cls)
+        globals().update(
+            YAMLError=yaml.YAMLError,
+            HAS_LIBYAML=has_libyaml,
+            MappingNode=yaml.nodes.MappingNode,
+            ScalarNode=yaml.nodes.ScalarNode,
+        )
+        _module = yaml
+    return _module
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        _yaml()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _loader(fast):
+    yaml = _yaml()
+    return _FastLoader if fast else yaml.SafeLoader
+
+
+def _dumper(fast):
+    _yaml()
+    return _FastDumper if fast else _PyDumper
+
+
+def register_deferred(cls):
+    """
+    Let both writers serialize instances of cls, a placeholder for a value
+    that has not been parsed yet, by dumping the result of its resolve().
+    """
+    _deferred_types.append(cls)
+    if _module is not None:
+        _add_representer(cls)
+
+
+def _add_representer(cls):
+    def represent(dumper, value):
+        return dumper.represent_data(value.resolve())
+
+    for dumper in (_FastDumper, _PyDumper):
+        dumper.add_representer(cls, represent)
+
+
+def load(source, fast=True):
+    """
+    Parse YAML from a string, bytes or open file.
+
+    Uses libyaml when it is available; pass fast=False to force the
+    pure-Python loader (used by the benchmark for comparison).
+    """
+    return _yaml().load(source, Loader=_loader(fast))
+
+
+def load_node(source, fast=True):
+    """
+    Parse YAML and return (data, root_node). The node tree keeps the source
+    marks of every key and value, which SourceMap uses for splice saving.
+    """
+    loader = _loader(fast)(source)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    return data, node
+
+
+def dump(data, stream=None, fast=True):
+    """
+    Serialize data to YAML. Returns a string when no stream is given.
+
+    Output is byte-identical whether libyaml is used or not.
+    """
+    return _yaml().dump(data, stream, Dumper=_dumper(fast), **DUMP_OPTIONS)
+
+
+def read_file(file_path, fast=True):
+    """
+    Read and parse a YAML file. Raises FileNotFoundError if it does not exist.
+    """
+    with open(file_path, "rb") as file:
+        return load(file.read(), fast=fast)
+
+
+def write_file(file_path, data, fast=True):
+    """
+    Serialize data and write it to file_path as UTF-8.
+
+    The text is written to a temporary file in the same directory, synced to
+    disk and then moved over file_path, so a crash mid-write never leaves a
+    truncated config behind.
+    """
+    atomic_write(file_path, dump(data, fast=fast).encode("utf-8"))
+
+
+def atomic_write(file_path, payload):
+    """
+    Atomically replace file_path with the given bytes.
+    """
+    replace_file(write_temp(file_path, payload), file_path)
+
+
+def write_temp(file_path, payload):
+    """
+    Write payload to a synced temporary file next to file_path and return
+    its path. replace_file() moves it into place; the two steps are split so
+    the slow part can run without holding a lock.
+    """
+    file_path = os.path.abspath(file_path)
+    directory, name = os.path.split(file_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        discard_temp(temp_path)
+        raise
+    return temp_path
+
+
+def replace_file(temp_path, file_path):
+    """
+    Move a file written by write_temp() over file_path.
+    """
+    file_path = os.path.abspath(file_path)
+    try:
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        discard_temp(temp_path)
+        raise
+    _fsync_directory(os.path.dirname(file_path))
+
+
+def discard_temp(temp_path):
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+
+def _fsync_directory(directory):
+    """
+    Persist a rename on POSIX systems. Windows does not support this.
+    """
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
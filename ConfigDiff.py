@@ -0,0 +1,377 @@
+"""
+Structural diff between two versions of a config.
+
+Compares the open document with the file on disk, a backup or another
+server's copy, and reports what was added, removed or changed by path.
+Run it on two files from the command line:
+
+    python ConfigDiff.py old.yml new.yml [--section Groups] [--ordered] [--json]
+
+The exit status is 0 if the configs are the same, 1 if they differ and 2
+on errors, like diff(1).
+"""
+import argparse
+import hashlib
+import json
+import sys
+
+from ConfigPath import ConfigPath
+from LazyLoader import LazySubtree, parse, read_text, resolve, source_text
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Lists whose order and repeats carry no meaning; None matches any key.
+SET_LISTS = (("Groups", None), ("DisabledWorlds",))
+
+
+class Change:
+    """
+    One difference between two versions of a config: a key that was added
+    or removed, or a value that changed. Lists are compared as a whole, so
+    a change inside a list is reported at the list's path. For lists that
+    are compared as sets (see SET_LISTS), added and removed hold the items
+    that differ.
+    """
+
+    __slots__ = ("kind", "path", "old", "new", "added", "removed")
+
+    def __init__(self, kind, path, old=None, new=None, added=None, removed=None):
+        self.kind = kind
+        self.path = ConfigPath(path)
+        self.old = old
+        self.new = new
+        self.added = added
+        self.removed = removed
+
+    def touches(self, path):
+        """
+        Returns True if the change is at path, inside it or above it.
+        """
+        size = min(len(self.path), len(path))
+        return self.path[:size] == tuple(path[:size])
+
+    def to_dict(self):
+        entry = {"kind": self.kind, "path": list(self.path)}
+        if self.added is not None:
+            entry["added"] = self.added
+            entry["removed"] = self.removed
+        else:
+            if self.kind != ADDED:
+                entry["old"] = self.old
+            if self.kind != REMOVED:
+                entry["new"] = self.new
+        return entry
+
+    def __str__(self):
+        if self.kind == ADDED:
+            return f"+ {self.path}: {_short(self.new)}"
+        if self.kind == REMOVED:
+            return f"- {self.path}: {_short(self.old)}"
+        if self.added is not None:
+            parts = []
+            if self.added:
+                parts.append(f"+{_short(self.added)}")
+            if self.removed:
+                parts.append(f"-{_short(self.removed)}")
+            return f"~ {self.path}: {' '.join(parts)}"
+        return f"~ {self.path}: {_short(self.old)} -> {_short(self.new)}"
+
+    def __repr__(self):
+        return f"<Change {self.kind} {str(self.path)!r}>"
+
+
+def is_set_list(path):
+    """
+    Returns True if the list at path is compared as a set.
+    """
+    for pattern in SET_LISTS:
+        if len(path) == len(pattern) and all(
+            want is None or want == key for want, key in zip(pattern, path)
+        ):
+            return True
+    return False
+
+
+class SubtreeHashes:
+    """
+    Content hashes of the subtrees of one document, kept Merkle style: the
+    hash of a mapping or list is built from the hashes of its children, and
+    each is remembered until invalidate() is told that something at or
+    below it changed. Unchanged subtrees are therefore hashed once, however
+    often the document is compared. An entity group that was never parsed
+    is hashed by its source text, so hashing does not parse it.
+
+    Hashes follow order, so equal hashes mean equal content, key order
+    included. They are BLAKE2 digests of the repr() of the keys and values
+    (with the digests of containers in place of their content), which
+    tells values of different types apart. Unlike Python's hash(), where
+    hash(-1) == hash(-2), different content does not share a hash in
+    practice.
+    """
+
+    def __init__(self):
+        self._memo = {}
+
+    def of(self, value):
+        if type(value) is LazySubtree:
+            text = source_text(value)
+            if text is not None:
+                return _digest(("text", text))
+            value = resolve(value)
+        if type(value) is not dict and type(value) is not list:
+            return _digest(("value", value))
+
+        memo = self._memo.get(id(value))
+        if memo is not None and memo[0] is value:
+            return memo[1]
+        if type(value) is dict:
+            result = _digest(
+                ("dict", [(key, self._item(item)) for key, item in value.items()])
+            )
+        elif all(type(item) is str for item in value):
+            # Materials and entity names: hash the strings themselves.
+            result = _digest(("list", value))
+        else:
+            result = _digest(("list", [self._item(item) for item in value]))
+        # Keep the value so its id cannot be reused while it is remembered.
+        self._memo[id(value)] = (value, result)
+        return result
+
+    def _item(self, item):
+        if type(item) is dict or type(item) is list or type(item) is LazySubtree:
+            return self.of(item)
+        return item
+
+    def invalidate(self, root, path):
+        """
+        Forget the hashes of the containers on the way from root down to
+        path, whose value changed.
+        """
+        value = root
+        self.forget(value)
+        for key in path:
+            if type(value) is LazySubtree:
+                if source_text(value) is not None:
+                    return
+                value = resolve(value)
+            if type(value) is dict:
+                value = value.get(key)
+            elif type(value) is list and isinstance(key, int) and 0 <= key < len(value):
+                value = value[key]
+            else:
+                return
+            self.forget(value)
+
+    def forget(self, value):
+        self._memo.pop(id(value), None)
+
+    def clear(self):
+        self._memo.clear()
+
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def diff(old, new, path=(), sets=True, old_hashes=None, new_hashes=None):
+    """
+    Returns the changes that turn the document old into new, in document
+    order. Subtrees with equal hashes are skipped, and entity groups that
+    were never parsed are compared by their source text, so only what
+    really differs is walked or parsed. Pass the SubtreeHashes kept for a
+    document (see DocumentCache.hashes) to reuse its hashes. With sets
+    False, every list is compared in order.
+    """
+    changes = []
+    _diff(
+        old,
+        new,
+        ConfigPath(path),
+        changes,
+        old_hashes or SubtreeHashes(),
+        new_hashes or SubtreeHashes(),
+        sets,
+    )
+    return changes
+
+
+def _diff(old, new, path, changes, old_hashes, new_hashes, sets):
+    old_text = source_text(old)
+    if old_text is not None and old_text == source_text(new):
+        return
+    old = resolve(old)
+    new = resolve(new)
+    if (
+        isinstance(old, (dict, list))
+        and type(old) is type(new)
+        and old_hashes.of(old) == new_hashes.of(new)
+    ):
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                changes.append(Change(REMOVED, path.child(key), old=resolve(value)))
+            else:
+                _diff(value, new[key], path.child(key), changes, old_hashes, new_hashes, sets)
+        for key, value in new.items():
+            if key not in old:
+                changes.append(Change(ADDED, path.child(key), new=resolve(value)))
+    elif sets and isinstance(old, list) and isinstance(new, list) and is_set_list(path):
+        change = _set_change(path, old, new)
+        if change.added or change.removed:
+            changes.append(change)
+    elif type(old) is not type(new) or old != new:
+        changes.append(Change(CHANGED, path, old=old, new=new))
+
+
+def _set_change(path, old, new):
+    old_items = set(map(_item_key, old))
+    new_items = set(map(_item_key, new))
+    added = [item for item in new if _item_key(item) not in old_items]
+    removed = [item for item in old if _item_key(item) not in new_items]
+    return Change(CHANGED, path, old=old, new=new, added=added, removed=removed)
+
+
+def rebind(target, source, target_hashes=None, path=()):
+    """
+    Make the mapping target equal to source in place, replacing only the
+    subtrees that differ. Containers of target whose content did not
+    change are kept, so references to them and whatever is cached about
+    them stay valid. Unparsed entity groups of source are adopted as they
+    are. Returns the changes made, like diff() with sets False, except that
+    a reordered set list is reported too (with no items added or removed).
+
+    target_hashes are the SubtreeHashes kept for target; the entries of the
+    containers that were changed are dropped from it.
+    """
+    changes = []
+    _rebind(
+        target, source, ConfigPath(path), changes, target_hashes or SubtreeHashes(), SubtreeHashes()
+    )
+    return changes
+
+
+def _rebind(target, source, path, changes, target_hashes, source_hashes):
+    count = len(changes)
+    for value in source.values():
+        if type(value) is LazySubtree:
+            # Parsing the placeholder must now fill in target.
+            value.document.section = target
+
+    for key in [key for key in target if key not in source]:
+        changes.append(Change(REMOVED, path.child(key), old=resolve(target.pop(key))))
+
+    for key, value in source.items():
+        child = path.child(key)
+        if key not in target:
+            target[key] = value
+            changes.append(Change(ADDED, child, new=resolve(value)))
+            continue
+
+        current = target[key]
+        current_text = source_text(current)
+        if current_text is not None and current_text == source_text(value):
+            target[key] = value
+            continue
+        old = resolve(current)
+        new = resolve(value)
+        if type(old) is dict and type(new) is dict:
+            target[key] = old
+            if target_hashes.of(old) != source_hashes.of(new):
+                _rebind(old, new, child, changes, target_hashes, source_hashes)
+        elif type(old) is not type(new) or old != new:
+            target[key] = new
+            if type(old) is list and type(new) is list and is_set_list(child):
+                change = _set_change(child, old, new)
+                changes.append(change)
+            else:
+                changes.append(Change(CHANGED, child, old=old, new=new))
+
+    if list(target) != list(source):
+        items = [(key, target[key]) for key in source]
+        target.clear()
+        target.update(items)
+    if len(changes) > count or list(target) != list(source):
+        target_hashes.forget(target)
+
+
+def _item_key(item):
+    return (type(item), item) if not isinstance(item, (dict, list)) else repr(item)
+
+
+def _short(value, limit=8):
+    if isinstance(value, dict):
+        return f"{{{len(value)} keys}}"
+    if isinstance(value, list):
+        shown = ", ".join(map(str, value[:limit]))
+        if len(value) > limit:
+            shown += f", ... ({len(value)} items)"
+        return f"[{shown}]"
+    return repr(value)
+
+
+def read_document(file_path):
+    """
+    Parse a config for comparing it. Entity groups are left unparsed (see
+    LazyLoader), so groups that did not change are never parsed.
+    """
+    with open(file_path, "rb") as file:
+        data, _ = parse(read_text(file), with_source=False)
+    return data
+
+
+def summarize(changes):
+    counts = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+    for change in changes:
+        counts[change.kind] += 1
+    return (
+        f"{len(changes)} changes ({counts[ADDED]} added, "
+        f"{counts[REMOVED]} removed, {counts[CHANGED]} changed)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what changed between two configs.")
+    parser.add_argument("old", help="config to compare from, e.g. a backup")
+    parser.add_argument("new", help="config to compare to")
+    parser.add_argument(
+        "--section",
+        action="append",
+        help="only compare this top-level section (may be repeated)",
+    )
+    parser.add_argument(
+        "--ordered", action="store_true", help="compare group lists in order"
+    )
+    parser.add_argument("--json", action="store_true", help="print the changes as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        old = read_document(args.old)
+        new = read_document(args.new)
+    except Exception as e:
+        print(f"Error reading configs: {e}", file=sys.stderr)
+        return 2
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        print("Error: both configs must be YAML mappings.", file=sys.stderr)
+        return 2
+
+    if args.section:
+        old = {key: old[key] for key in args.section if key in old}
+        new = {key: new[key] for key in args.section if key in new}
+    changes = diff(old, new, sets=not args.ordered)
+
+    if args.json:
+        json.dump([change.to_dict() for change in changes], sys.stdout, indent=1, default=str)
+        print()
+    else:
+        for change in changes:
+            print(change)
+        print(summarize(changes))
+    return 1 if changes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
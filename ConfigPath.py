@@ -0,0 +1,181 @@
+from functools import lru_cache
+
+from LazyLoader import LazySubtree, resolve
+
+_MISSING = object()
+
+
+class ConfigPath(tuple):
+    """
+    Key path into a config document, e.g. ("VanillaEntity", "E1", "Materials").
+
+    The dotted strings used throughout the UI are parsed once and memoized,
+    so passing the same string again costs a dictionary lookup. A literal dot
+    inside a key is written as '\\.' in the string form; building the path
+    from a tuple of keys avoids escaping altogether:
+
+        ConfigPath.of("Groups.my\\.group") == ConfigPath(("Groups", "my.group"))
+
+    Paths compare and hash like plain tuples.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, path):
+        """
+        Returns path as a ConfigPath. Accepts a ConfigPath, a dotted string or
+        any sequence of keys.
+        """
+        if isinstance(path, cls):
+            return path
+        if isinstance(path, str):
+            return _parse(path)
+        return cls(path)
+
+    @property
+    def parent(self):
+        return ConfigPath(self[:-1])
+
+    @property
+    def key(self):
+        return self[-1] if self else None
+
+    def child(self, *keys):
+        return ConfigPath(self + keys)
+
+    def __str__(self):
+        return ".".join(
+            str(key).replace("\\", "\\\\").replace(".", "\\.") for key in self
+        )
+
+    def __repr__(self):
+        return f"ConfigPath({str(self)!r})"
+
+
+@lru_cache(maxsize=4096)
+def _parse(text):
+    if not text:
+        return ConfigPath()
+    if "\\" not in text:
+        return ConfigPath(text.split("."))
+
+    keys, key, escaped = [], [], False
+    for char in text:
+        if escaped:
+            key.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ".":
+            keys.append("".join(key))
+            key = []
+        else:
+            key.append(char)
+    keys.append("".join(key))
+    return ConfigPath(keys)
+
+
+class PathResolver:
+    """
+    Looks up paths in one document.
+
+    The container holding each path is cached under the path exactly as the
+    caller passed it, string or ConfigPath, so repeating a lookup is a single
+    dictionary hit with no parsing or walking. Containers reached on the way
+    are cached too, so the first lookup below a visited section is short.
+    Anything that replaces or removes a container must call invalidate();
+    editing a scalar or a list in place does not.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.invalidate()
+
+    def get(self, path, default=None):
+        """
+        Returns the value at path, or default if it does not exist.
+        """
+        entry = self._parents.get(path)
+        if entry is None:
+            entry = self.parent(path)
+            if entry[0] is None:
+                return default if ConfigPath.of(path) else self.root
+        container, key = entry
+        if isinstance(container, dict):
+            value = container.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+        elif key < len(container):
+            value = container[key]
+        else:
+            return default
+        return value.resolve() if isinstance(value, LazySubtree) else value
+
+    def parent(self, path, create=False):
+        """
+        Returns (container, key) such that container[key] is the value at
+        path, or (None, key) if the container does not exist. With
+        create=True missing dicts along the path are added, like repeated
+        setdefault() calls.
+        """
+        entry = self._parents.get(path)
+        if entry is not None:
+            return entry
+        keys = ConfigPath.of(path)
+        if not keys:
+            return None, None
+
+        key = keys[-1]
+        container = self._container(keys[:-1], create)
+        if isinstance(container, list):
+            if not _is_index(key, len(container)):
+                return None, key
+            key = int(key)
+        elif not isinstance(container, dict):
+            return None, key
+
+        entry = self._parents[path] = (container, key)
+        return entry
+
+    def container(self, path, create=False):
+        """
+        Returns the dict or list at path, or None.
+        """
+        return self._container(ConfigPath.of(path), create)
+
+    def invalidate(self):
+        self._parents = {}
+        self._containers = {(): self.root}
+
+    def _container(self, keys, create):
+        cached = self._containers.get(keys)
+        if cached is not None:
+            return cached
+        if not keys:
+            return None
+
+        parent = self._container(keys[:-1], create)
+        key = keys[-1]
+        if isinstance(parent, dict):
+            if key in parent:
+                value = resolve(parent[key])
+            elif create:
+                value = parent[key] = {}
+            else:
+                return None
+        elif isinstance(parent, list) and _is_index(key, len(parent)):
+            value = parent[int(key)]
+        else:
+            return None
+
+        if not isinstance(value, (dict, list)):
+            return None
+        self._containers[keys] = value
+        return value
+
+
+def _is_index(key, length):
+    if isinstance(key, str):
+        return key.isdigit() and int(key) < length
+    return isinstance(key, int) and 0 <= key < length
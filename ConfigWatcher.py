@@ -0,0 +1,70 @@
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+class ConfigWatcher(QObject):
+    """
+    Watches the open config for changes made by other programs, such as ops
+    scripts or the plugin's own commands.
+
+    QFileSystemWatcher (inotify on Linux) reports every write, so bursts are
+    debounced: changed(file_path) is emitted once the file has been quiet
+    for `debounce` milliseconds. The directory is watched as well, because
+    a file replaced by a rename (as every atomic save does, ours included)
+    drops out of the watcher and has to be added again. Our own saves are
+    reported too; YAMLConfigManager.reload_from_disk() recognizes them by
+    their stamp and returns no changes.
+    """
+
+    changed = pyqtSignal(str)
+
+    debounce = 300
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_path = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._emit)
+
+    def watch(self, file_path):
+        """
+        Watch file_path instead of the file watched so far.
+        """
+        self.stop()
+        self.file_path = os.path.abspath(file_path)
+        self._watcher.addPath(os.path.dirname(self.file_path))
+        self._rewatch()
+
+    def stop(self):
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self.file_path = None
+
+    def retry(self):
+        """
+        Report the file again after the debounce delay, e.g. because it was
+        still being written when changed was emitted.
+        """
+        if self.file_path:
+            self._timer.start(self.debounce)
+
+    def _rewatch(self):
+        if self.file_path not in self._watcher.files() and os.path.exists(self.file_path):
+            self._watcher.addPath(self.file_path)
+
+    def _on_changed(self, path):
+        if self.file_path is None:
+            return
+        self._rewatch()
+        self._timer.start(self.debounce)
+
+    def _emit(self):
+        if self.file_path and os.path.exists(self.file_path):
+            self.changed.emit(self.file_path)
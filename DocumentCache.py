@@ -0,0 +1,439 @@
+import os
+import threading
+
+import ConfigCodec as codec
+import LazyLoader
+from ConfigDiff import SubtreeHashes, rebind
+from ConfigPath import PathResolver
+from SourceMap import SourceMap
+
+# Counters kept by DocumentCache.stats().
+STAT_KEYS = (
+    "parses",
+    "group_parses",
+    "writes",
+    "skipped_writes",
+    "bytes_read",
+    "bytes_written",
+)
+
+
+class DocumentCache:
+    """
+    Parsed YAML documents shared by every backend, keyed by path, mtime and size.
+
+    A document is only re-read when the file on disk has a different
+    modification time or size than the copy in memory, so repeated lookups
+    of the same file cost a single stat call.
+
+    The lock must be held by anything that mutates or serializes a cached
+    document from more than one thread (for example background compaction).
+
+    With splice_saves enabled, the source text of each document is kept with
+    a SourceMap. Writers report what they touched through mark_changed(), and
+    write() re-emits only those subtrees into the original text. Comments and
+    key order survive, and the diff stays small. write() falls back to a full
+    dump when a change cannot be spliced.
+
+    With lazy_loading enabled, files are read through a memory map and the
+    entity groups of VanillaEntity are only parsed when something first looks
+    inside them (see LazyLoader); the rest of the document is parsed up front.
+
+    stats() counts whole-document parses, entity groups parsed on demand,
+    file writes (config and journal) and the bytes read and written, so a
+    regression check can assert how often a file is really touched.
+
+    Writes happen in two steps so they can run off the GUI thread:
+    snapshot() captures the document under the lock, and write_snapshot()
+    serializes and syncs it without the lock, which is only taken again to
+    move the finished file into place. While a snapshot is being written
+    the cached copy counts as current, even though the file on disk is
+    about to change. A save whose output is byte for byte the file on disk
+    is not written at all (counted as a skipped write).
+
+    hashes() keeps content hashes of each cached document's subtrees, which
+    mark_changed() invalidates along the changed path. reload() uses them to
+    rebind only the subtrees that another program changed.
+    """
+
+    _instance = None
+    splice_saves = True
+    lazy_loading = True
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls, *args, **kwargs)
+            cls._instance._entries = {}
+            cls._instance._changed = {}
+            cls._instance._resolvers = {}
+            cls._instance._hashes = {}
+            cls._instance._stats = dict.fromkeys(STAT_KEYS, 0)
+            cls._instance._writing = {}
+            cls._instance._written = {}
+            cls._instance._idle_callbacks = {}
+            cls._instance._sequence = 0
+            cls._instance.lock = threading.RLock()
+        return cls._instance
+
+    @staticmethod
+    def _key(file_path):
+        if not file_path:
+            raise FileNotFoundError("No configuration file path given.")
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _stamp(stat_result):
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def load(self, file_path, progress=None):
+        """
+        Return the parsed document for file_path, parsing it only if it changed.
+        Raises FileNotFoundError if the file does not exist.
+
+        progress is passed on to LazyLoader.parse(); an exception it raises
+        aborts the load and leaves the cache as it was.
+
+        Safe to call from a worker thread: the cache is only looked at and
+        updated under the lock. The parse itself runs without it, so a
+        large file does not block edits on other threads; if the cached
+        copy became current in the meantime, e.g. because a write started,
+        that copy is returned instead.
+        """
+        key = self._key(file_path)
+        with self.lock:
+            stamp = self._stamp(os.stat(key))
+            entry = self._entries.get(key)
+            if entry and (entry[0] == stamp or self._writing.get(key)):
+                return entry[1]
+
+        stamp, data, source_map = self._parse(key, progress)
+
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry and (entry[0] == stamp or self._writing.get(key)):
+                return entry[1]
+            self._entries[key] = (stamp, data, source_map)
+            self._changed.pop(key, None)
+            self._resolvers.pop(key, None)
+            self._hashes.pop(key, None)
+        return data
+
+    def reload(self, file_path, data, prepare=None):
+        """
+        Re-read file_path after another program changed it and update data,
+        the cached document, in place: only the subtrees that differ are replaced
+        (see ConfigDiff.rebind), so the document and its unchanged sections
+        and groups keep their identity. prepare(data), if given, is called
+        on the fresh copy first, e.g. to apply edits that are not in the file
+        yet; what it reports through mark_changed() is written by the next
+        save. Returns the changes made to data, or None if data is not the
+        cached document, in which case nothing is read.
+        """
+        key = self._key(file_path)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not data or not isinstance(data, dict):
+                return None
+            stamp, fresh, source_map = self._parse(key)
+            if not isinstance(fresh, dict):
+                raise codec.YAMLError(f"{key} does not hold a mapping.")
+
+            self._changed.pop(key, None)
+            if prepare is not None:
+                prepare(fresh)
+            changes = rebind(data, fresh, self.hashes(key, data))
+            self._entries[key] = (stamp, data, source_map)
+            if changes:
+                self._resolvers.pop(key, None)
+            return changes
+
+    def _parse(self, key, progress=None):
+        with open(key, "rb") as file:
+            stamp = self._stamp(os.fstat(file.fileno()))
+            self.count("parses")
+            self.count("bytes_read", stamp[1])
+            if self.lazy_loading:
+                data, source_map = LazyLoader.parse(
+                    LazyLoader.read_text(file),
+                    self.splice_saves,
+                    self.lock,
+                    self._stats,
+                    progress,
+                )
+            elif self.splice_saves:
+                data, source_map = SourceMap.parse(file.read())
+            else:
+                data, source_map = codec.load(file.read()), None
+        return stamp, data, source_map
+
+    def resolver(self, file_path, data):
+        """
+        Returns the PathResolver for data. Every backend editing the cached
+        document at file_path gets the same resolver, so a container replaced
+        through one backend is invalidated for all of them.
+        """
+        try:
+            key = self._key(file_path)
+        except FileNotFoundError:
+            return PathResolver(data)
+
+        resolver = self._resolvers.get(key)
+        if resolver is None or resolver.root is not data:
+            resolver = PathResolver(data)
+            entry = self._entries.get(key)
+            if entry and entry[1] is data:
+                self._resolvers[key] = resolver
+        return resolver
+
+    def hashes(self, file_path, data):
+        """
+        Returns the SubtreeHashes of data. The cached document at file_path
+        keeps its hashes between calls, so only the subtrees changed since
+        (see mark_changed) are hashed again.
+        """
+        try:
+            key = self._key(file_path)
+        except FileNotFoundError:
+            return SubtreeHashes()
+
+        entry = self._entries.get(key)
+        if not entry or entry[1] is not data:
+            return SubtreeHashes()
+        hashes = self._hashes.get(key)
+        if hashes is None:
+            hashes = self._hashes[key] = SubtreeHashes()
+        return hashes
+
+    def mark_changed(self, file_path, keys):
+        """
+        Record that the value at the key path of the cached document changed,
+        so the next write() re-emits it and its hash is computed again.
+        """
+        if not file_path:
+            return
+        key = self._key(file_path)
+        self._changed.setdefault(key, set()).add(tuple(keys))
+        hashes = self._hashes.get(key)
+        if hashes is not None:
+            hashes.invalidate(self._entries[key][1], keys)
+
+    def forget_hashes(self, file_path):
+        """
+        Drop the subtree hashes of file_path, e.g. after changes were undone
+        without going through mark_changed().
+        """
+        if file_path:
+            self._hashes.pop(self._key(file_path), None)
+
+    def write(self, file_path, data):
+        """
+        Write data to file_path and remember it as the current document.
+        Only the changed subtrees are re-serialized when possible.
+        """
+        return self.write_snapshot(self.snapshot(file_path, data))
+
+    def snapshot(self, file_path, data):
+        """
+        Capture what write() would write for data, so the file can be written
+        on another thread while data keeps changing. A spliced save renders
+        its text right away, which only serializes the changed subtrees; a
+        full dump copies the document instead (see LazyLoader.snapshot) and
+        serializes the copy in write_snapshot().
+
+        Every snapshot must be passed to write_snapshot().
+        """
+        key = self._key(file_path)
+        with self.lock:
+            entry = self._entries.get(key)
+            source_map = entry[2] if entry and entry[1] is data else None
+
+            text = None
+            if source_map is not None and self.splice_saves:
+                text = source_map.splice(data, self._changed.get(key, ()))
+                if text is None:
+                    # Later snapshots of this document are full dumps too.
+                    self._entries[key] = (entry[0], data, None)
+            self._changed.pop(key, None)
+
+            self._sequence += 1
+            self._writing[key] = self._writing.get(key, 0) + 1
+            copy = LazyLoader.snapshot(data) if text is None else None
+            return WriteSnapshot(key, self._sequence, data, text, copy)
+
+    def write_snapshot(self, snapshot, written=None):
+        """
+        Serialize and write a snapshot taken by snapshot(). The document lock
+        is only held to move the synced file into place, and a snapshot
+        older than one already written is dropped instead. written(), if
+        given, is called with the lock held once the file is current, before
+        the callbacks queued by when_idle() run.
+        Returns the number of bytes written, 0 if the file already held
+        exactly the snapshot's text and was left alone.
+        """
+        key = snapshot.key
+        temp_path = None
+        released = False
+        try:
+            text = snapshot.text
+            if text is None:
+                text = codec.dump(snapshot.copy)
+            payload = text.encode("utf-8")
+            same_stamp = self._same_on_disk(key, payload)
+            if same_stamp is None:
+                temp_path = codec.write_temp(key, payload)
+
+            with self.lock:
+                if snapshot.sequence < self._written.get(key, 0):
+                    payload = b""
+                else:
+                    if temp_path is None and not self._has_stamp(key, same_stamp):
+                        # Changed on disk since it was compared.
+                        temp_path = codec.write_temp(key, payload)
+                    if temp_path is not None:
+                        codec.replace_file(temp_path, key)
+                        temp_path = None
+                        self.count("writes")
+                        self.count("bytes_written", len(payload))
+                    else:
+                        self.count("skipped_writes")
+                        payload = b""
+                    self._written[key] = snapshot.sequence
+                    entry = self._entries.get(key)
+                    source_map = entry[2] if entry and entry[1] is snapshot.data else None
+                    self._entries[key] = (
+                        self._stamp(os.stat(key)),
+                        snapshot.data,
+                        source_map,
+                    )
+                released = True
+                try:
+                    if written is not None:
+                        written()
+                finally:
+                    self._release(key)
+            return len(payload)
+        finally:
+            if temp_path is not None:
+                codec.discard_temp(temp_path)
+            if not released:
+                with self.lock:
+                    self._release(key)
+
+    def _same_on_disk(self, key, payload):
+        """
+        Returns the stamp of the file at key if it holds exactly payload,
+        otherwise None. Only a file of the same size is read.
+        """
+        try:
+            if os.stat(key).st_size != len(payload):
+                return None
+            with open(key, "rb") as file:
+                stamp = self._stamp(os.fstat(file.fileno()))
+                self.count("bytes_read", stamp[1])
+                return stamp if file.read() == payload else None
+        except FileNotFoundError:
+            return None
+
+    def _has_stamp(self, key, stamp):
+        try:
+            return self._stamp(os.stat(key)) == stamp
+        except FileNotFoundError:
+            return False
+
+    def is_writing(self, file_path):
+        """
+        Returns True while a snapshot of file_path is waiting to be written
+        or being written.
+        """
+        return bool(self._writing.get(self._key(file_path)))
+
+    def when_idle(self, file_path, callback):
+        """
+        Call callback() with the lock held once no snapshot of file_path is
+        being written; right away if none is.
+        """
+        key = self._key(file_path)
+        with self.lock:
+            if self._writing.get(key):
+                self._idle_callbacks.setdefault(key, []).append(callback)
+                return
+        callback()
+
+    def _release(self, key):
+        count = self._writing.get(key, 0) - 1
+        if count > 0:
+            self._writing[key] = count
+            return
+        self._writing.pop(key, None)
+        for callback in self._idle_callbacks.pop(key, ()):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error after writing {key}: {e}")
+
+    def count(self, name, amount=1):
+        """
+        Add amount to one of the STAT_KEYS counters.
+        """
+        self._stats[name] += amount
+
+    def stats(self):
+        """
+        Returns a copy of the I/O counters, e.g. {"parses": 1, ...}.
+        """
+        return dict(self._stats)
+
+    def reset_stats(self):
+        self._stats.update(dict.fromkeys(STAT_KEYS, 0))
+
+    def stamp(self, file_path):
+        """
+        Returns the (mtime_ns, size) stamp recorded for file_path, or None.
+        Does not touch the disk.
+        """
+        entry = self._entries.get(self._key(file_path))
+        return entry[0] if entry else None
+
+    def is_cached(self, file_path):
+        """
+        Returns True if file_path is cached and unchanged on disk.
+        """
+        try:
+            key = self._key(file_path)
+            entry = self._entries.get(key)
+            if entry and self._writing.get(key):
+                return True
+            return bool(entry) and entry[0] == self._stamp(os.stat(key))
+        except FileNotFoundError:
+            return False
+
+    def invalidate(self, file_path=None):
+        """
+        Drop the cached document for file_path, or every document if None.
+        """
+        if file_path is None:
+            self._entries.clear()
+            self._changed.clear()
+            self._resolvers.clear()
+            self._hashes.clear()
+        elif file_path:
+            self._entries.pop(self._key(file_path), None)
+            self._changed.pop(self._key(file_path), None)
+            self._resolvers.pop(self._key(file_path), None)
+            self._hashes.pop(self._key(file_path), None)
+
+
+class WriteSnapshot:
+    """
+    A pending write of one document: the rendered text, or a copy of the
+    document to dump when the changes could not be spliced.
+    """
+
+    __slots__ = ("key", "sequence", "data", "text", "copy")
+
+    def __init__(self, key, sequence, data, text, copy):
+        self.key = key
+        self.sequence = sequence
+        self.data = data
+        self.text = text
+        self.copy = copy
@@ -0,0 +1,173 @@
+import json
+import os
+
+from GroupIndex import GroupIndex
+from LazyLoader import resolve
+
+
+class EditJournal:
+    """
+    Append-only sidecar log of config edits, stored next to the config as
+    '<config>.journal'.
+
+    The first line records the (mtime_ns, size) stamp of the config file the
+    edits apply to. Every following line is one JSON-encoded mutation:
+
+        {"op": "set", "path": [...], "old": ..., "new": ...}
+        {"op": "delete", "path": [...], "old": ...}
+        {"op": "add_items", "path": [...], "new": [...]}
+        {"op": "remove_item", "path": [...], "old": ...}
+        {"op": "remove_items", "path": [...], "old": [...]}
+
+    A journal whose stamp does not match the config on disk was already
+    compacted into it (or the file was replaced), so it is never replayed.
+    """
+
+    SUFFIX = ".journal"
+
+    def __init__(self, config_path):
+        self.config_path = os.path.abspath(config_path)
+        self.path = self.config_path + self.SUFFIX
+        self._file = None
+        self._base_stamp = None
+
+    def append(self, lines, base_stamp):
+        """
+        Append lines produced by encode_entry() and fsync them. Starts a fresh
+        journal if the config file was rewritten since the last append.
+        Returns the number of bytes written.
+        """
+        if not lines:
+            return 0
+        written = 0
+        if self._file is None or self._base_stamp != base_stamp:
+            written = self._start(base_stamp)
+
+        payload = "".join(lines).encode("utf-8")
+        self._file.write(payload)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return written + len(payload)
+
+    def _start(self, base_stamp):
+        self.close()
+        self._file = open(self.path, "wb")
+        self._base_stamp = base_stamp
+        return self._file.write(
+            encode_entry({"base": list(base_stamp or ())}).encode("utf-8")
+        )
+
+    def replay(self, data, base_stamp):
+        """
+        Apply a leftover journal to data if it belongs to the config version
+        identified by base_stamp. Returns the paths of the applied entries.
+        A stale journal is deleted.
+        """
+        header, entries = self._read()
+        if header is None:
+            return []
+
+        applied = []
+        if header.get("base") == list(base_stamp or ()):
+            for entry in entries:
+                apply_entry(data, entry)
+                applied.append(entry["path"])
+            print(f"Replayed {len(applied)} journal entries from {self.path}")
+        else:
+            print(f"Discarding stale journal {self.path}")
+            self.discard()
+
+        return applied
+
+    def entries(self):
+        """
+        Returns the entries in the journal, whatever config version they
+        were recorded against.
+        """
+        return self._read()[1]
+
+    def _read(self):
+        """
+        Returns (header, entries), or (None, []) if there is no journal.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                lines = file.read().decode("utf-8").splitlines()
+        except FileNotFoundError:
+            return None, []
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+
+        entries = []
+        for line in lines[1:]:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A crash while appending leaves at most one partial line.
+                print(f"Ignoring truncated journal entry in {self.path}")
+                break
+        return header, entries
+
+    def discard(self):
+        """
+        Close and delete the journal file.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._base_stamp = None
+
+
+def encode_entry(entry):
+    """
+    Encode one journal entry as a JSON line. Entries are encoded as soon as
+    they are recorded so later in-place changes cannot alter them.
+    """
+    return json.dumps(entry, separators=(",", ":"), default=_encode_default) + "\n"
+
+
+def decode_entry(line):
+    """
+    Decode a line produced by encode_entry().
+    """
+    return json.loads(line)
+
+
+def _encode_default(value):
+    resolved = resolve(value)
+    return str(value) if resolved is value else resolved
+
+
+def apply_entry(data, entry):
+    """
+    Apply a single journal entry to a document in place.
+    """
+    *parents, key = entry["path"]
+    container = data
+    for parent in parents:
+        container = resolve(container[parent])
+
+    op = entry["op"]
+    if op == "set":
+        container[key] = entry["new"]
+    elif op == "delete":
+        container.pop(key, None)
+    elif op == "add_items":
+        container[key].extend(entry["new"])
+    elif op == "remove_item":
+        if entry["old"] in container[key]:
+            container[key].remove(entry["old"])
+    elif op == "remove_items":
+        GroupIndex(container[key]).remove_many(entry["old"])
+    else:
+        raise ValueError(f"Unknown journal operation: {op}")
@@ -0,0 +1,333 @@
+"""
+Apply the same edits to many server configs at once.
+
+Each config is opened with YAMLConfigManager, edited in one transaction
+and written once, so a file is either fully edited or left alone. Files
+are processed in parallel by a pool of worker processes:
+
+    python FleetEdit.py "servers/*/plugins/ExplodeAny/config.yml" \\
+        --set "VanillaEntity.*.Properties.ExplosionRadius=4.0" \\
+        --add "Blocks=OBSIDIAN,CRYING_OBSIDIAN" --pair Creepers:Blocks --dry-run
+
+Edits run in the order given. A '*' (or any fnmatch pattern) in a --set
+path matches every existing key at that level. With --dry-run nothing is
+written; the changes each file would get are reported instead.
+
+The exit status is 0 if every file was processed and 2 if any failed.
+"""
+import argparse
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Backend import Add_Group_Pairs, YAMLConfigManager, convert_value, same_value
+from ConfigDiff import diff
+from ConfigPath import ConfigPath
+from DocumentCache import DocumentCache
+from LazyLoader import resolve, snapshot
+
+_MISSING = object()
+
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+WOULD_CHANGE = "would change"
+FAILED = "failed"
+
+
+class FleetEditError(Exception):
+    """
+    An edit that cannot be applied to one config; the file is left alone.
+    """
+
+
+class _DryRun(Exception):
+    """
+    Raised to roll back the edits of a dry run.
+    """
+
+
+def expand_paths(patterns):
+    """
+    Returns the config files matched by patterns (paths or globs, '**'
+    included), without repeats, in the order given.
+    """
+    files = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for match in matches:
+            files.setdefault(os.path.abspath(match), None)
+    return list(files)
+
+
+def _is_pattern(key):
+    return isinstance(key, str) and any(char in key for char in "*?[")
+
+
+def _match_paths(data, keys):
+    """
+    Yields the concrete paths that keys matches in data. Pattern keys are
+    matched against the keys present; the last plain key may be new.
+    """
+    paths = [ConfigPath()]
+    for depth, key in enumerate(keys):
+        matched = []
+        for path in paths:
+            value = data
+            for step in path:
+                value = resolve(value[step])
+            if not isinstance(value, dict):
+                continue
+            if _is_pattern(key):
+                matched.extend(
+                    path.child(name) for name in value if fnmatch.fnmatchcase(str(name), key)
+                )
+            elif key in value or depth == len(keys) - 1:
+                matched.append(path.child(key))
+        paths = matched
+    return paths
+
+
+def _set(manager, path, text):
+    keys = ConfigPath.of(path)
+    targets = _match_paths(manager.get_yaml_data(), keys)
+    if not targets:
+        raise FleetEditError(f"No key matches '{path}'.")
+    # An empty value sets an empty string; YAML would read it as null.
+    value = convert_value(text) if text.strip() else text
+    for target in targets:
+        old = resolve(manager.get_value(target, _MISSING))
+        if same_value(old, value):
+            continue
+        if not manager.add_values(target.parent, {target.key: value}):
+            raise FleetEditError(f"Cannot set '{target}'.")
+
+
+def _add(manager, group_name, items):
+    if not manager.add_items_to_group(group_name, items):
+        raise FleetEditError(f"Cannot add items to group '{group_name}'.")
+
+
+def _remove(manager, group_name, items):
+    groups = manager.get_yaml_data().get("Groups") or {}
+    if not isinstance(groups.get(group_name), list):
+        raise FleetEditError(f"Group '{group_name}' does not exist.")
+    manager.remove_items_from_group(group_name, items)
+
+
+def _pair(manager, entity_group, block_group, particles, sounds):
+    groups = manager.get_yaml_data().get("Groups") or {}
+    for name in (entity_group, block_group):
+        if name in groups:
+            raise FleetEditError(f"Group '{name}' already exists.")
+    Add_Group_Pairs(manager, entity_group, block_group, particles, particles, sounds, sounds)
+
+
+@contextlib.contextmanager
+def _whole_file_edits():
+    """
+    Parse files whole and write them directly, without a journal, for the
+    duration of the block. The previous settings are restored afterwards so
+    an application calling run() in-process keeps its own.
+    """
+    settings = YAMLConfigManager.journal_enabled, DocumentCache.lazy_loading
+    YAMLConfigManager.journal_enabled = False
+    DocumentCache.lazy_loading = False
+    try:
+        yield
+    finally:
+        YAMLConfigManager.journal_enabled, DocumentCache.lazy_loading = settings
+
+
+def edit_file(file_path, operations, dry_run=False):
+    """
+    Apply operations to one config and write it once, unless dry_run.
+    operations are (name, *args) tuples as built by main(). Returns a
+    result dict with the file, status, changes and seconds taken.
+
+    Edits tend to touch most entity groups of a file, so the file is
+    parsed whole rather than lazily, and the changes are found by comparing
+    with a copy taken before editing instead of reading the file again.
+    Whether the file changed is decided by comparing the values themselves;
+    the write happens when the transaction commits.
+    """
+    start = time.perf_counter()
+    result = {"file": file_path, "status": FAILED, "changes": [], "error": None}
+    manager = YAMLConfigManager()
+    cache = DocumentCache()
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output), _whole_file_edits():
+            try:
+                if not os.path.isfile(file_path):
+                    raise FleetEditError("File not found.")
+                manager.load_yaml(file_path)
+                if manager.file_path != file_path or not isinstance(
+                    manager.get_yaml_data(), dict
+                ):
+                    raise FleetEditError("Not a readable YAML mapping.")
+
+                before = snapshot(manager.get_yaml_data())
+                with manager.transaction():
+                    for name, *args in operations:
+                        EDITS[name](manager, *args)
+                    after = snapshot(manager.get_yaml_data())
+                    changed = not same_value(before, after)
+                    if changed:
+                        result["changes"] = [str(change) for change in diff(before, after)]
+                    if dry_run:
+                        raise _DryRun()
+                result["status"] = CHANGED if changed else UNCHANGED
+            except _DryRun:
+                result["status"] = WOULD_CHANGE if changed else UNCHANGED
+            finally:
+                cache.invalidate(file_path)
+    except FleetEditError as e:
+        result["error"] = str(e)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+EDITS = {"set": _set, "add": _add, "remove": _remove, "pair": _pair}
+
+
+def run(files, operations, dry_run=False, jobs=None):
+    """
+    Edit every file, in parallel when jobs (default: one per CPU) is more
+    than one. Yields the results in the order of files.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    if jobs <= 1:
+        for file_path in files:
+            yield edit_file(file_path, operations, dry_run)
+        return
+    chunk = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(
+            edit_file,
+            files,
+            [operations] * len(files),
+            [dry_run] * len(files),
+            chunksize=chunk,
+        )
+
+
+def _assignment(text):
+    path, sep, value = text.partition("=")
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(f"expected PATH=VALUE, got '{text}'")
+    return ("set", path, value)
+
+
+def _items(name):
+    def parse(text):
+        group, sep, items = text.partition("=")
+        items = [item.strip() for item in items.split(",") if item.strip()]
+        if not sep or not group or not items:
+            raise argparse.ArgumentTypeError(f"expected GROUP=ITEM[,ITEM...], got '{text}'")
+        return (name, group, items)
+
+    return parse
+
+
+def _pairing(text):
+    entity_group, sep, block_group = text.partition(":")
+    if not sep or not entity_group or not block_group or entity_group == block_group:
+        raise argparse.ArgumentTypeError(
+            f"expected ENTITY_GROUP:BLOCK_GROUP with two different names, got '{text}'"
+        )
+    return ("pair", entity_group, block_group)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the same edits to many configs.")
+    parser.add_argument("configs", nargs="+", help="config files or glob patterns")
+    parser.add_argument(
+        "--set",
+        dest="operations",
+        action="append",
+        type=_assignment,
+        metavar="PATH=VALUE",
+        help="set a value; '*' in PATH matches every key at that level",
+    )
+    parser.add_argument(
+        "--add",
+        dest="operations",
+        action="append",
+        type=_items("add"),
+        metavar="GROUP=ITEMS",
+        help="append comma-separated items to a group",
+    )
+    parser.add_argument(
+        "--remove",
+        dest="operations",
+        action="append",
+        type=_items("remove"),
+        metavar="GROUP=ITEMS",
+        help="remove comma-separated items from a group",
+    )
+    parser.add_argument(
+        "--pair",
+        dest="operations",
+        action="append",
+        type=_pairing,
+        metavar="ENTITY:BLOCK",
+        help="add an entity group paired with a new block group",
+    )
+    parser.add_argument(
+        "--particles", action="store_true", help="give new pairs particle settings"
+    )
+    parser.add_argument("--sounds", action="store_true", help="give new pairs sound settings")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report the changes without writing"
+    )
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list the changes made to each file"
+    )
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+    if not args.operations:
+        parser.error("give at least one of --set, --add, --remove or --pair")
+
+    operations = [
+        op + (args.particles, args.sounds) if op[0] == "pair" else op
+        for op in args.operations
+    ]
+    files = expand_paths(args.configs)
+
+    start = time.perf_counter()
+    results = []
+    for result in run(files, operations, args.dry_run, args.jobs):
+        results.append(result)
+        if args.json:
+            continue
+        detail = result["error"] or f"{len(result['changes'])} changes"
+        print(f"{result['status']:<12} {result['file']} ({detail}, {result['seconds']:.3f}s)")
+        if args.verbose:
+            for change in result["changes"]:
+                print(f"    {change}")
+    elapsed = time.perf_counter() - start
+
+    failed = sum(result["status"] == FAILED for result in results)
+    if args.json:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    else:
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+        print(f"{len(results)} files ({summary}) in {elapsed:.2f}s")
+    return 2 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
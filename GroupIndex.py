@@ -0,0 +1,95 @@
+class GroupIndex:
+    """
+    Insertion-ordered multiset mirroring one list under 'Groups'.
+
+    The YAML list stays the source of truth (it is what gets saved and what
+    the UI reads); the index only answers membership and duplicate checks in
+    constant time instead of scanning thousands of materials. Removal is not
+    constant time: the list keeps its order, so taking an item out of it
+    shifts the items after it. Removing k items therefore goes through
+    remove_many(), one pass for all of them, which is what the editor's
+    multi-selection and FleetEdit --remove use. Every change
+    made through the index is applied to the list as well, and matches()
+    detects a list that was edited or replaced behind its back.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self._counts = {}
+        for item in items:
+            self._counts[item] = self._counts.get(item, 0) + 1
+        self._size = len(items)
+
+    def matches(self, items):
+        """
+        Returns True if the index still describes items.
+        """
+        return items is self.items and len(items) == self._size
+
+    def __contains__(self, item):
+        return item in self._counts
+
+    def __len__(self):
+        return self._size
+
+    def new_items(self, items):
+        """
+        Returns the items that are not in the group yet, each only once.
+        """
+        return [item for item in dict.fromkeys(items) if item not in self._counts]
+
+    def add(self, items):
+        """
+        Append items to the list.
+        """
+        for item in items:
+            self._counts[item] = self._counts.get(item, 0) + 1
+        self.items.extend(items)
+        self._size = len(self.items)
+
+    def remove(self, item):
+        """
+        Remove the first occurrence of item. Returns False if it is absent,
+        without scanning the list. A present item costs one list.remove(),
+        O(n) but done in C; swapping the last item into its place would be
+        O(1), but would reorder the group in the saved file.
+        """
+        count = self._counts.get(item)
+        if not count:
+            return False
+        self.items.remove(item)
+        self._release(item, count)
+        self._size -= 1
+        return True
+
+    def remove_many(self, items):
+        """
+        Remove the first occurrence of each of items in a single pass over
+        the list, O(n + len(items)) rather than a list.remove() per item.
+        Returns the items that were removed.
+        """
+        wanted = {}
+        for item in items:
+            if item in self._counts and wanted.get(item, 0) < self._counts[item]:
+                wanted[item] = wanted.get(item, 0) + 1
+        if not wanted:
+            return []
+
+        removed = []
+        kept = []
+        for item in self.items:
+            if wanted.get(item):
+                wanted[item] -= 1
+                removed.append(item)
+                self._release(item, self._counts[item])
+            else:
+                kept.append(item)
+        self.items[:] = kept
+        self._size = len(kept)
+        return removed
+
+    def _release(self, item, count):
+        if count == 1:
+            del self._counts[item]
+        else:
+            self._counts[item] = count - 1
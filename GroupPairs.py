@@ -0,0 +1,153 @@
+from LazyLoader import material_keys
+
+
+class GroupPairs:
+    """
+    Pairing of entity groups and block groups in one config.
+
+    A block group listed under VanillaEntity.<entity_group>.Materials is
+    paired with that entity group. The index is built once when a config is
+    opened and then kept in step by YAMLConfigManager as groups are added,
+    deleted and renamed, so the group selector never has to rescan
+    VanillaEntity and Groups. Building it does not parse entity groups that
+    have not been loaded yet.
+
+    A block group listed by several entity groups is paired with the last
+    one to list it.
+    """
+
+    def __init__(self, vanilla_entity=None, groups=None):
+        self.entity_to_blocks = {}
+        self.block_to_entity = {}
+        self._groups = dict.fromkeys(groups) if isinstance(groups, dict) else {}
+        self._ordered = None
+        if isinstance(vanilla_entity, dict):
+            for entity_group in vanilla_entity:
+                self.set_blocks(entity_group, material_keys(vanilla_entity, entity_group))
+
+    def is_entity(self, group_name):
+        """
+        Returns True if group_name is an entity group with a block group.
+        """
+        return bool(self.entity_to_blocks.get(group_name))
+
+    def is_block(self, group_name):
+        return group_name in self.block_to_entity
+
+    def paired_group(self, group_name):
+        """
+        Returns the entity group of a block group, the first block group of
+        an entity group, or None if group_name is not paired.
+        """
+        entity_group = self.block_to_entity.get(group_name)
+        if entity_group is not None:
+            return entity_group
+        blocks = self.entity_to_blocks.get(group_name)
+        return blocks[0] if blocks else None
+
+    def blocks_of(self, entity_group):
+        return list(self.entity_to_blocks.get(entity_group, ()))
+
+    def entities_listing(self, block_group):
+        """
+        Returns every entity group whose Materials list block_group.
+        """
+        return [
+            entity_group
+            for entity_group, blocks in self.entity_to_blocks.items()
+            if block_group in blocks
+        ]
+
+    def pairs(self):
+        """
+        Returns (entity_group, block_group) pairs in file order.
+        """
+        return [
+            (entity_group, block_group)
+            for entity_group, blocks in self.entity_to_blocks.items()
+            for block_group in blocks
+        ]
+
+    def ordered_groups(self):
+        """
+        Returns the names under Groups in display order: each entity group
+        followed by its block groups, then every group that is not paired.
+        """
+        if self._ordered is None:
+            ordered = {}
+            for entity_group, blocks in self.entity_to_blocks.items():
+                if not blocks:
+                    continue
+                if entity_group in self._groups:
+                    ordered.setdefault(entity_group)
+                for block_group in blocks:
+                    if block_group in self._groups:
+                        ordered.setdefault(block_group)
+            for group_name in self._groups:
+                ordered.setdefault(group_name)
+            self._ordered = list(ordered)
+        return list(self._ordered)
+
+    def orphans(self):
+        """
+        Returns the names under Groups that are neither an entity group with
+        a block group nor a block group of an entity group.
+        """
+        return [
+            group_name
+            for group_name in self._groups
+            if not self.is_entity(group_name) and group_name not in self.block_to_entity
+        ]
+
+    def add_group(self, group_name):
+        if group_name not in self._groups:
+            self._groups[group_name] = None
+            self._ordered = None
+
+    def remove_group(self, group_name):
+        if group_name in self._groups:
+            del self._groups[group_name]
+            self._ordered = None
+
+    def set_blocks(self, entity_group, blocks):
+        """
+        Replace the block groups of entity_group.
+        """
+        for block_group in self.entity_to_blocks.get(entity_group, ()):
+            self._unpair(entity_group, block_group)
+        self.entity_to_blocks[entity_group] = list(blocks)
+        for block_group in blocks:
+            self.block_to_entity[block_group] = entity_group
+        self._ordered = None
+
+    def add_block(self, entity_group, block_group):
+        blocks = self.entity_to_blocks.setdefault(entity_group, [])
+        if block_group not in blocks:
+            blocks.append(block_group)
+        self.block_to_entity[block_group] = entity_group
+        self._ordered = None
+
+    def remove_block(self, entity_group, block_group):
+        blocks = self.entity_to_blocks.get(entity_group)
+        if blocks and block_group in blocks:
+            blocks.remove(block_group)
+            self._unpair(entity_group, block_group)
+            self._ordered = None
+
+    def remove_entity(self, entity_group):
+        if entity_group in self.entity_to_blocks:
+            self.set_blocks(entity_group, [])
+            del self.entity_to_blocks[entity_group]
+
+    def _unpair(self, entity_group, block_group):
+        if self.block_to_entity.get(block_group) != entity_group:
+            return
+        del self.block_to_entity[block_group]
+        others = [
+            other
+            for other in self.entities_listing(block_group)
+            if other != entity_group
+        ]
+        if others:
+            self.block_to_entity[block_group] = others[-1]
+
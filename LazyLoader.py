@@ -0,0 +1,429 @@
+import mmap
+import os
+import re
+import threading
+from functools import lru_cache
+
+import ConfigCodec as codec
+from SourceMap import SourceMap
+
+# Top-level section whose groups are only parsed when they are first used.
+LAZY_SECTION = "VanillaEntity"
+
+# Column-0 lines that start a top-level key: not blank, not a comment and not
+# an item of an indentless sequence.
+_TOP_LEVEL_LINE = re.compile(r"^(?![\s#]|-(?:[ \t]|\r?$))(?=.)", re.M)
+
+# First line with content, capturing its indentation.
+_FIRST_CONTENT = re.compile(r"^([ \t]*)(?=[^\s#])", re.M)
+
+# Text the line scanner does not understand; such files are parsed whole.
+_UNSUPPORTED = re.compile(r"^(?: *\t|---|\.\.\.|%)", re.M)
+
+# Anchors, aliases and merge keys ('<<'): a group using them can get keys
+# that are not in its own lines, so the section is not indexed by line.
+_ANCHORS = re.compile(r"(?:^|[\s\[{,])(?:[&*][^\s,\[\]{}]|<<[ \t]*:)", re.M)
+
+# A plain key at the start of a line, optionally followed by a value.
+_KEY = re.compile(r" *([A-Za-z_][A-Za-z0-9_.\- ]*?)[ \t]*:(?=[ \t]|\r?$)")
+
+# What may follow the colon of a key whose value is a nested block.
+_BLOCK_REST = re.compile(r"[ \t]*(?:#[^\n]*)?\r?$")
+
+# Plain scalars that YAML would not read back as the same string.
+_RESERVED = {"yes", "no", "true", "false", "on", "off", "null"}
+
+_UNSET = object()
+
+
+@lru_cache(maxsize=None)
+def _lines_at(column):
+    """Content lines indented by exactly column spaces."""
+    return re.compile(r"^ {%d}(?=[^\s#])[^\n]*" % column, re.M)
+
+
+@lru_cache(maxsize=None)
+def _lines_within(column):
+    """Content lines indented by at most column spaces."""
+    return re.compile(r"^ {0,%d}(?=[^\s#])" % column, re.M)
+
+
+class LazySubtree:
+    """
+    Placeholder for one entity group of VanillaEntity that has not been
+    parsed yet. It covers the lines start:end of the source text and already
+    knows the block groups listed under its Materials, which is all the
+    group selector needs.
+    """
+
+    __slots__ = ("document", "key", "start", "end", "material_keys", "value")
+
+    def __init__(self, document, key, start, end, material_keys):
+        self.document = document
+        self.key = key
+        self.start = start
+        self.end = end
+        self.material_keys = material_keys
+        self.value = _UNSET
+
+    def resolve(self):
+        """
+        Parse the subtree (once) and put it in place of the placeholder.
+        """
+        return self.document.resolve(self)
+
+    def __repr__(self):
+        return f"<LazySubtree {self.key!r} [{self.start}:{self.end}]>"
+
+
+class LazyDocument:
+    """
+    Source text and SourceMap shared by the placeholders of one document.
+    """
+
+    def __init__(self, text, source_map, section, lock=None, stats=None):
+        self.text = text
+        self.source_map = source_map
+        self.section = section
+        self.lock = lock or threading.RLock()
+        self.stats = stats
+
+    def resolve(self, placeholder):
+        with self.lock:
+            if placeholder.value is _UNSET:
+                try:
+                    placeholder.value = self._parse_group(placeholder)
+                except (codec.YAMLError, ValueError):
+                    # e.g. an alias to an anchor outside the group
+                    self._parse_whole()
+            if self.section.get(placeholder.key) is placeholder:
+                self.section[placeholder.key] = placeholder.value
+            return placeholder.value
+
+    def _parse_group(self, placeholder):
+        self._count("group_parses")
+        data, node = codec.load_node(self.text[placeholder.start : placeholder.end])
+        if not isinstance(data, dict) or list(data) != [placeholder.key]:
+            raise ValueError(f"Entity group {placeholder.key!r} moved on disk.")
+        value = data[placeholder.key]
+        value_node = node.value[0][1]
+        if (
+            self.source_map is not None
+            and isinstance(value, dict)
+            and isinstance(value_node, codec.MappingNode)
+        ):
+            self.source_map.index(
+                value_node, value, (LAZY_SECTION, placeholder.key), placeholder.start
+            )
+        return value
+
+    def _parse_whole(self):
+        """
+        Resolve every remaining placeholder from a parse of the whole text.
+        """
+        print(f"Parsing {LAZY_SECTION} in full; a group could not be read alone.")
+        self._count("parses")
+        data, source_map = SourceMap.parse(self.text)
+        full = data.get(LAZY_SECTION) if isinstance(data, dict) else None
+        if not isinstance(full, dict):
+            raise ValueError(f"{LAZY_SECTION} could not be parsed.")
+
+        placeholders = [
+            value
+            for value in self.section.values()
+            if isinstance(value, LazySubtree) and value.value is _UNSET
+        ]
+        for placeholder in placeholders:
+            placeholder.value = full.get(placeholder.key)
+
+        if self.source_map is not None and source_map is not None:
+            keys = {placeholder.key for placeholder in placeholders}
+            for table, own in (
+                (source_map.entries, self.source_map.entries),
+                (source_map.mappings, self.source_map.mappings),
+            ):
+                for path, span in table.items():
+                    if len(path) > 1 and path[0] == LAZY_SECTION and path[1] in keys:
+                        if len(path) > 2 or table is source_map.mappings:
+                            own[path] = span
+
+    def _count(self, name):
+        if self.stats is not None:
+            self.stats[name] += 1
+
+
+class FrozenSubtree:
+    """
+    Stand-in for an unparsed LazySubtree in a snapshot(). Its text cannot
+    change, so the snapshot parses a private copy from it when dumped,
+    whatever happens to the live placeholder meanwhile.
+    """
+
+    __slots__ = ("text", "start", "end", "key")
+
+    def __init__(self, placeholder):
+        self.text = placeholder.document.text
+        self.start = placeholder.start
+        self.end = placeholder.end
+        self.key = placeholder.key
+
+    def resolve(self):
+        return codec.load(self.text[self.start : self.end])[self.key]
+
+
+def snapshot(value):
+    """
+    Copy the dicts and lists of a document so the copy can be serialized on
+    another thread while the original is edited. Scalars are shared, and
+    groups that were never parsed are not parsed now.
+    """
+    if isinstance(value, dict):
+        return {key: snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [snapshot(item) for item in value]
+    if isinstance(value, LazySubtree):
+        if value.value is _UNSET:
+            return FrozenSubtree(value)
+        return snapshot(value.value)
+    return value
+
+
+def resolve(value):
+    """
+    Return value, parsing it first if it is a LazySubtree placeholder.
+    """
+    return value.resolve() if isinstance(value, LazySubtree) else value
+
+
+def source_text(value):
+    """
+    Returns the source lines of a placeholder that has not been parsed, or
+    None. Two unparsed groups with the same text hold the same value, so
+    they can be compared without parsing either.
+    """
+    if isinstance(value, LazySubtree) and value.value is _UNSET:
+        return value.document.text[value.start : value.end]
+    return None
+
+
+def material_keys(section, key):
+    """
+    Returns the block groups under section[key]['Materials'] without parsing
+    an entity group that has not been loaded yet.
+    """
+    value = section.get(key) if isinstance(section, dict) else None
+    if isinstance(value, LazySubtree):
+        if value.value is _UNSET:
+            return list(value.material_keys)
+        value = value.value
+    materials = value.get("Materials") if isinstance(value, dict) else None
+    return list(materials) if isinstance(materials, dict) else []
+
+
+def read_text(file):
+    """
+    Decode an open binary file through a read-only memory map, which avoids
+    holding a second copy of a large config as bytes.
+    """
+    if not os.fstat(file.fileno()).st_size:
+        return ""
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        try:
+            return str(mapped, "utf-8")
+        except UnicodeDecodeError:
+            # parse() lets the YAML reader report where the bad bytes are.
+            return mapped[:]
+
+
+def parse(source, with_source=True, lock=None, stats=None, progress=None):
+    """
+    Parse a config, leaving the entity groups of VanillaEntity as LazySubtree
+    placeholders. Everything else is parsed up front, one top-level section
+    at a time, from an index of line offsets built in a single pass.
+
+    Returns (data, source_map) like SourceMap.parse(); source_map is None
+    when with_source is False or the text cannot be mapped. Files the
+    scanner does not understand are parsed whole. Groups parsed later, and
+    any full parse they fall back to, are counted in the stats dict.
+
+    progress(done, total) is called with character offsets as sections and
+    entity groups are indexed. It may raise to abort the parse.
+    """
+    if isinstance(source, bytes):
+        try:
+            text = source.decode("utf-8")
+        except UnicodeDecodeError:
+            return codec.load(source), None
+    else:
+        text = source
+
+    if text.startswith("\ufeff") or _UNSUPPORTED.search(text):
+        return _parse_whole(text, with_source)
+
+    starts = [match.start() for match in _TOP_LEVEL_LINE.finditer(text)]
+    if not starts or _FIRST_CONTENT.search(text, 0, starts[0]):
+        return _parse_whole(text, with_source)
+    ends = starts[1:] + [len(text)]
+
+    data = {}
+    source_map = SourceMap(text) if with_source else None
+    try:
+        for start, end in zip(starts, ends):
+            if progress is not None:
+                progress(start, len(text))
+            line_end = _line_end(text, start, end)
+            key = _block_key(text, start, line_end)
+            if key == LAZY_SECTION and key not in data and not _ANCHORS.search(text, start, end):
+                section = _index_section(
+                    text, start, line_end, end, source_map, lock, stats, progress
+                )
+                if section is not None:
+                    data[key] = section
+                    continue
+            part, node = codec.load_node(text[start:end])
+            if (
+                not isinstance(part, dict)
+                or len(part) != 1
+                or not isinstance(node, codec.MappingNode)
+                or next(iter(part)) in data
+            ):
+                return _parse_whole(text, with_source)
+            data.update(part)
+            if source_map is not None:
+                source_map.index(node, part, (), start)
+    except codec.YAMLError:
+        # Let the full parse report the error with its real position.
+        return _parse_whole(text, with_source)
+
+    if progress is not None:
+        progress(len(text), len(text))
+    if source_map is not None:
+        source_map.mappings[()] = (False, 0, (list(data)[-1],))
+    return data, source_map
+
+
+def _parse_whole(text, with_source):
+    if with_source:
+        return SourceMap.parse(text)
+    return codec.load(text), None
+
+
+def _line_end(text, start, end):
+    line_end = text.find("\n", start, end)
+    return end if line_end == -1 else line_end
+
+
+def _block_key(text, start, line_end):
+    """
+    Returns the key of a line that opens a nested block, or None.
+    """
+    match = _KEY.match(text, start, line_end)
+    if not match or not _BLOCK_REST.match(text, match.end(), line_end):
+        return None
+    return _plain(match.group(1))
+
+
+def _plain(key):
+    return None if key.lower() in _RESERVED else key
+
+
+def _index_section(text, start, line_end, end, source_map, lock, stats, progress):
+    """
+    Build the VanillaEntity mapping with one placeholder per entity group.
+    Returns None when the section is not a plain block mapping.
+    """
+    body = line_end + 1
+    first = _FIRST_CONTENT.search(text, body, end)
+    if first is None or not first.group(1):
+        return None
+    column = len(first.group(1))
+    if _lines_within(column - 1).search(text, body, end):
+        return None
+    group_starts = [match.start() for match in _lines_at(column).finditer(text, body, end)]
+    if not group_starts or group_starts[0] != first.start():
+        return None
+
+    section = {}
+    document = LazyDocument(text, source_map, section, lock, stats)
+    for group_start, group_end in zip(group_starts, group_starts[1:] + [end]):
+        if progress is not None:
+            progress(group_start, len(text))
+        group_line_end = _line_end(text, group_start, group_end)
+        key = _block_key(text, group_start, group_line_end)
+        materials = None
+        if key is not None and key not in section:
+            materials = _scan_materials(text, group_line_end + 1, group_end, column)
+
+        if materials is not None:
+            section[key] = LazySubtree(document, key, group_start, group_end, materials)
+            if source_map is not None:
+                source_map.entries[(LAZY_SECTION, key)] = (
+                    group_start + column,
+                    group_line_end + 1,
+                    group_end,
+                    False,
+                )
+            continue
+
+        # Small or unusual groups are parsed right away.
+        part, node = codec.load_node(text[group_start:group_end])
+        if not isinstance(part, dict) or len(part) != 1 or next(iter(part)) in section:
+            return None
+        section.update(part)
+        if source_map is not None:
+            source_map.index(node, part, (LAZY_SECTION,), group_start)
+
+    if source_map is not None:
+        source_map.entries[(LAZY_SECTION,)] = (start, body, end, False)
+        source_map.mappings[(LAZY_SECTION,)] = (
+            False,
+            column,
+            (LAZY_SECTION, list(section)[-1]),
+        )
+    return section
+
+
+def _scan_materials(text, body, end, column):
+    """
+    Returns the block group names under the Materials key of an entity group
+    body, [] if it has none, or None if the body is not a simple block mapping.
+    """
+    first = _FIRST_CONTENT.search(text, body, end)
+    if first is None:
+        return None
+    child = len(first.group(1))
+    if child <= column or _lines_within(child - 1).search(text, body, end):
+        return None
+
+    lines = list(_lines_at(child).finditer(text, body, end))
+    for index, line in enumerate(lines):
+        if not text.startswith("Materials", line.start() + child):
+            continue
+        if _block_key(text, line.start(), line.end()) != "Materials":
+            return None
+        block_start = line.end() + 1
+        block_end = lines[index + 1].start() if index + 1 < len(lines) else end
+        return _scan_keys(text, block_start, block_end, child)
+    return []
+
+
+def _scan_keys(text, body, end, column):
+    first = _FIRST_CONTENT.search(text, body, end)
+    if first is None:
+        return []
+    child = len(first.group(1))
+    if child <= column or _lines_within(child - 1).search(text, body, end):
+        return None
+
+    keys = []
+    for line in _lines_at(child).finditer(text, body, end):
+        match = _KEY.match(text, line.start(), line.end())
+        key = _plain(match.group(1)) if match else None
+        if key is None:
+            return None
+        keys.append(key)
+    return keys
+
+
+codec.register_deferred(LazySubtree)
+codec.register_deferred(FrozenSubtree)
@@ -0,0 +1,90 @@
+import os
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from DocumentCache import DocumentCache
+from GroupPairs import GroupPairs
+
+
+class LoadCancelled(Exception):
+    """
+    Raised inside a LoadWorker to stop a load that was cancelled.
+    """
+
+
+class LoadSignals(QObject):
+    """
+    Signals of one LoadWorker. QRunnable is not a QObject, so they live here.
+
+    progress(percent, message) is emitted while the file is parsed,
+    loaded(file_path, data, group_pairs) once the document is in the
+    DocumentCache, failed(file_path, message) on errors and
+    cancelled(file_path) when the load was stopped by cancel().
+    """
+
+    progress = pyqtSignal(int, str)
+    loaded = pyqtSignal(str, object, object)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+
+
+class LoadWorker(QRunnable):
+    """
+    Parses a config and builds its GroupPairs index on a QThreadPool thread.
+
+    The parsed document goes into the shared DocumentCache, so the
+    load_yaml() that follows on the GUI thread only has to stat the file
+    and can adopt the index (see its preloaded argument).
+    Cancellation is cooperative: cancel() sets a flag that is checked
+    between the top-level sections and entity groups being parsed.
+    """
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = LoadSignals()
+        self._cancelled = threading.Event()
+        self._percent = -1
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            self._report(0, f"Reading {os.path.basename(self.file_path)}...")
+            data = DocumentCache().load(self.file_path, progress=self._parse_progress)
+            self._check()
+
+            self._report(95, "Indexing groups...")
+            if isinstance(data, dict):
+                group_pairs = GroupPairs(data.get("VanillaEntity"), data.get("Groups"))
+            else:
+                group_pairs = GroupPairs()
+            self._check()
+
+            self._report(100, "Done")
+            self.signals.loaded.emit(self.file_path, data, group_pairs)
+        except LoadCancelled:
+            print(f"Loading {self.file_path} cancelled.")
+            self.signals.cancelled.emit(self.file_path)
+        except Exception as e:
+            print(f"Error loading YAML file in background: {e}")
+            self.signals.failed.emit(self.file_path, str(e))
+
+    def _parse_progress(self, done, total):
+        self._check()
+        self._report(done * 95 // max(total, 1), "Parsing...")
+
+    def _report(self, percent, message):
+        # Only emit when the number changes; entity groups come in thousands.
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(percent, message)
+
+    def _check(self):
+        if self._cancelled.is_set():
+            raise LoadCancelled(self.file_path)
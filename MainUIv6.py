@@ -1,15 +1,14 @@
 import sys
 import os
-import yaml
 from PyQt6.QtCore import Qt,QSize,QTimer
 from PyQt6.QtGui import QAction,QColor,QBrush
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QCheckBox, QPushButton, QComboBox, QTabWidget, QSplitter, QFrame, QListWidget, 
-    QInputDialog, QAbstractItemView, QFileDialog,QMessageBox,QListWidgetItem,QScrollArea,QFormLayout,QToolButton
+    QInputDialog, QAbstractItemView, QFileDialog,QMessageBox,QListWidgetItem,QScrollArea,QFormLayout,QToolButton,
+    QGroupBox
 )
-import Backend as backend
-from Right_PropEditor import RightSection_Editor,RightSection_BackEnd
+import Theme
 
 from PyQt6.QtGui import QColor, QFont, QIcon, QLinearGradient, QBrush
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect, QListWidgetItem
@@ -60,24 +59,12 @@ class GroupSelector(QWidget):
         """Set up the group selector with a label and group list."""
 
         self.main_frame = QFrame(self)
-        self.main_frame.setStyleSheet(
-            """
-            border: 1px solid black;
-            border-radius: 5px;
-        """
-        )
+        self.main_frame.setObjectName("groupSelectorFrame")
         self.main_layout = QVBoxLayout(self.main_frame)
 
         self.key_label = QLabel("Purple = Entity Group | Green = Block Group")
         self.key_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.key_label.setStyleSheet(
-            """
-            font-size: 14px;
-            font-weight: bold;
-            color: #444;
-            margin-bottom: 5px;
-        """
-        )
+        self.key_label.setObjectName("groupKeyLabel")
         self.main_layout.addWidget(self.key_label)
 
         self.group_list = QListWidget()
@@ -130,28 +117,66 @@ class GroupSelector(QWidget):
         self.group_list.setIconSize(self.item_size)
 
         for group in group_names:
-            item = QListWidgetItem(group)
-            item.setSizeHint(self.item_size)
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.group_list.addItem(self._create_item(group, group_statuses))
 
-            if group_statuses and group in group_statuses:
-                status = group_statuses[group]
-                if status == "red":
-                    pass
+    def update_groups(self, group_names, group_statuses=None):
+        """
+        Bring the group list in line with group_names by adding, removing and
+        moving only the tiles that differ. Tiles that stay keep their
+        selection, and a tile whose kind changed gets its new icon.
+        """
+        wanted = set(group_names)
+        for row in reversed(range(self.group_list.count())):
+            if self.group_list.item(row).text() not in wanted:
+                self.group_list.takeItem(row)
+
+        present = {
+            self.group_list.item(row).text() for row in range(self.group_list.count())
+        }
+        for row, group in enumerate(group_names):
+            item = self.group_list.item(row)
+            if item is None or item.text() != group:
+                if group in present:
+                    # Rows are only ever moved up, so the old row is below.
+                    old_row = next(
+                        index
+                        for index in range(row + 1, self.group_list.count())
+                        if self.group_list.item(index).text() == group
+                    )
+                    self.group_list.insertItem(row, self.group_list.takeItem(old_row))
                 else:
-
-                    item.setBackground(QColor("#FFFFFF"))
-                    icon_path = resource_path("Icons/GroupBlockIcon.svg")
-                    icon = QIcon(icon_path)
-                    
-                    item.setIcon(icon)
-            else:
-
-                icon_path = resource_path("Icons/GroupEntityIcon.svg")
-                icon = QIcon(icon_path)
-                item.setIcon(icon)
-
-            self.group_list.addItem(item)
+                    self.group_list.insertItem(row, self._create_item(group, group_statuses))
+                item = self.group_list.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) != self._status(group, group_statuses):
+                selected = item.isSelected()
+                self.group_list.takeItem(row)
+                self.group_list.insertItem(row, self._create_item(group, group_statuses))
+                self.group_list.item(row).setSelected(selected)
+
+    @staticmethod
+    def _status(group, group_statuses):
+        if group_statuses and group in group_statuses:
+            return "red" if group_statuses[group] == "red" else "block"
+        return "entity"
+
+    def _create_item(self, group, group_statuses):
+        item = QListWidgetItem(group)
+        item.setSizeHint(self.item_size)
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        status = self._status(group, group_statuses)
+        item.setData(Qt.ItemDataRole.UserRole, status)
+        if status == "block":
+            item.setBackground(QColor("#FFFFFF"))
+            icon_path = resource_path("Icons/GroupBlockIcon.svg")
+            icon = QIcon(icon_path)
+
+            item.setIcon(icon)
+        elif status == "entity":
+            icon_path = resource_path("Icons/GroupEntityIcon.svg")
+            icon = QIcon(icon_path)
+            item.setIcon(icon)
+        return item
 
 
 def resource_path(relative_path):
@@ -172,7 +197,7 @@ class ConfigSection(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.setStyleSheet("background-color: lightblue; border: 1px solid black;")
+        self.setObjectName("configSection")
 
         self.layout = QVBoxLayout()
         self.setup_ui()
@@ -220,13 +245,13 @@ class ConfigSection(QWidget):
         entity_frame.setLayout(QHBoxLayout())
         entity_frame.layout().addWidget(self.entity_particles_checkbox)
         entity_frame.layout().addWidget(self.entity_sounds_checkbox)
-        entity_frame.setStyleSheet("border: 1px solid black;")
+        entity_frame.setObjectName("entityFrame")
 
         block_frame = QFrame()
         block_frame.setLayout(QHBoxLayout())
         block_frame.layout().addWidget(self.block_particles_checkbox)
         block_frame.layout().addWidget(self.block_sounds_checkbox)
-        block_frame.setStyleSheet("border: 1px solid black;")
+        block_frame.setObjectName("blockFrame")
 
         checkbox_layout.addWidget(entity_frame)
         checkbox_layout.addWidget(block_frame)
@@ -241,103 +266,35 @@ class ConfigSection(QWidget):
         self.setLayout(self.layout)
 
     def _apply_styles(self):
+        """Name the widgets the application stylesheet (Theme.py) styles."""
 
-        self.entity_group_label.setStyleSheet(
-            """
-            font-size: 16px;
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 5px;
-        """
-        )
-        self.block_group_label.setStyleSheet(
-            """
-            font-size: 16px;
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 5px;
-        """
-        )
+        self.entity_group_label.setObjectName("entityGroupLabel")
+        self.block_group_label.setObjectName("blockGroupLabel")
 
         self.entity_group_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.block_group_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.entity_group_entry.setStyleSheet(
-            """
-            padding: 5px;
-            border-radius: 4px;
-            border: 1px solid #ccc;
-            background-color: #fff;
-            font-size: 14px;
-        """
-        )
-        self.block_group_entry.setStyleSheet(
-            """
-            padding: 5px;
-            border-radius: 4px;
-            border: 1px solid #ccc;
-            background-color: #fff;
-            font-size: 14px;
-        """
-        )
+        self.entity_group_entry.setObjectName("entityGroupEntry")
+        self.block_group_entry.setObjectName("blockGroupEntry")
 
-        self.entity_particles_checkbox.setStyleSheet(
-            """
-            border: none; 
-            font-size: 14px;
-            color: #333;
-            margin-right: 15px;
-        """
-        )
-        self.block_particles_checkbox.setStyleSheet(
-            """
-            border: none; 
-            font-size: 14px;
-            color: #333;
-        """
-        )
-        self.entity_sounds_checkbox.setStyleSheet(
-            """
-            border: none; 
-            font-size: 14px;
-            color: #333;
-            margin-right: 15px;
-        """
-        )
-        self.block_sounds_checkbox.setStyleSheet(
-            """
-            border: none; 
-            font-size: 14px;
-            color: #333;
-        """
-        )
+        self.entity_particles_checkbox.setObjectName("entityParticlesCheckbox")
+        self.block_particles_checkbox.setObjectName("blockParticlesCheckbox")
+        self.entity_sounds_checkbox.setObjectName("entitySoundsCheckbox")
+        self.block_sounds_checkbox.setObjectName("blockSoundsCheckbox")
 
-        self.add_group_button.setStyleSheet(
-            """
-            font-size: 16px;
-            background-color: #4CAF50;
-            color: white;
-            border: none;
-            border-radius: 5px;
-        """
-        )
+        self.add_group_button.setObjectName("addGroupButton")
 
     def highlight_entry(self, entry):
-        original_stylesheet = entry.styleSheet()
+
+        def set_highlighted(highlighted):
+            entry.setProperty("highlighted", highlighted)
+            Theme.repolish(entry)
 
         def flash():
-            entry.setStyleSheet(
-                """
-                background-color: lightyellow;
-                padding: 5px;
-                border-radius: 4px;
-                border: 1px solid #ccc;
-                font-size: 14px;
-            """
-            )
-            QTimer.singleShot(500, lambda: entry.setStyleSheet(original_stylesheet))
+            set_highlighted(True)
+            QTimer.singleShot(500, lambda: set_highlighted(False))
 
         flash()
         QTimer.singleShot(1000, flash)
@@ -358,7 +315,7 @@ class EntityBlockSection(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.setStyleSheet("background-color: lightblue; border: 1px solid black;")
+        self.setObjectName("entityBlockSection")
 
         self.layout = QVBoxLayout()
 
@@ -428,7 +385,7 @@ class EntityBlockSection(QWidget):
 class MiddleSection(QWidget):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("background-color: lightgray; border: 1px solid black;")
+        self.setObjectName("middleSection")
         self.layout = QVBoxLayout()
 
         self.config_section = ConfigSection()
@@ -452,25 +409,17 @@ class RightSection(QWidget):
         self.layout.setSpacing(12)
         self.setLayout(self.layout)
 
-        self.backend = RightSection_BackEnd("")
-        self.config_editor = RightSection_Editor(self.backend, section="")
-        self.layout.addWidget(self.config_editor)
+        # The editor is built when it is first needed (see get_config_editor),
+        # so startup does not pay for it; an empty box stands in until then.
+        self.backend = None
+        self.config_editor = None
+        self.placeholder = QGroupBox("Configuration Settings")
+        self.placeholder.setObjectName("editorGroupBox")
+        self.placeholder.setMinimumWidth(400)
+        self.layout.addWidget(self.placeholder)
 
         self.switch_button = QPushButton("Save Changes")
-        self.switch_button.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            """
-        )
+        self.switch_button.setObjectName("saveButton")
         self.switch_button.clicked.connect(self.trigger_save)
         self.layout.addWidget(self.switch_button)
 
@@ -480,14 +429,24 @@ class RightSection(QWidget):
             self.config_editor.save_changes()
 
     def get_config_editor(self):
-        """Expose the config_editor instance."""
+        """Expose the config_editor instance, building it on first use."""
+        if self.config_editor is None:
+            from Right_PropEditor import RightSection_BackEnd, RightSection_Editor
+
+            self.backend = RightSection_BackEnd("")
+            self.config_editor = RightSection_Editor(self.backend, section="")
+            self.layout.replaceWidget(self.placeholder, self.config_editor)
+            self.config_editor.show()
+            self.placeholder.deleteLater()
+            self.placeholder = None
         return self.config_editor
 
     def PassToReload(self, groupName, File_Path):
+        from ConfigPath import ConfigPath
 
-        section_path = f"VanillaEntity.{groupName}.Materials"
+        section_path = ConfigPath(("VanillaEntity", groupName, "Materials"))
         print(section_path)
-        self.config_editor.reload_config(File_Path, section=section_path)
+        self.get_config_editor().reload_config(File_Path, section=section_path)
 
 
 class MainWindow(QMainWindow):
@@ -521,6 +480,7 @@ class MainWindow(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    Theme.apply(app)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,249 @@
+"""
+Tree view of a property page, for sections too large to show as one form
+(see RightSection_Editor.tree_view_fields). Rows are painted by the view;
+an editor widget only exists for the row being edited, so a Materials page
+with hundreds of block groups costs the same to open as a small one.
+"""
+from PyQt6.QtCore import QAbstractItemModel, QEvent, QModelIndex, Qt
+from PyQt6.QtWidgets import QAbstractItemView, QLineEdit, QStyledItemDelegate, QTreeView
+
+from Backend import convert_value
+from ConfigPath import ConfigPath
+from Right_PropEditor import ScrollableLineEdit
+from Tooltips import TOOLTIPS
+
+KEY, VALUE = 0, 1
+
+
+class _Node:
+    __slots__ = ("parent", "row", "key", "path", "kind", "text", "children")
+
+    def __init__(self, parent, row, key, path, kind=None, text=""):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.path = path
+        self.kind = kind  # "bool", "int", "float" or "string"; None for groups
+        self.text = text
+        self.children = []
+
+
+def field_kind(value):
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "string"
+
+
+def field_text(value):
+    """The text a field shows for value, as on the form pages."""
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    return str(value)
+
+
+class PropertyTreeModel(QAbstractItemModel):
+    """
+    Two columns, property and value, over a section of the config. Groups
+    are ordered like the form pages: plain fields first, then Particles,
+    Sound and the other groups. The values are kept as the text the user
+    typed; the editor converts them when saving, as it does for the form.
+    """
+
+    def __init__(self, data, section, parent=None):
+        super().__init__(parent)
+        self.root = _Node(None, 0, None, ConfigPath.of(section))
+        self.fields = {}
+        self.groups = []
+        self.keys = set()  # Names of the fields, to size the first column
+        self.depth = 0
+        self._add_children(self.root, data)
+
+    def _add_children(self, node, data, depth=0):
+        self.depth = max(self.depth, depth)
+        if not isinstance(data, dict):
+            return
+        groups = [(key, value) for key, value in data.items() if isinstance(value, dict)]
+        groups.sort(key=lambda group: {"Particles": 0, "Sound": 1}.get(group[0], 2))
+        fields = [(key, value) for key, value in data.items() if not isinstance(value, dict)]
+
+        for key, value in fields + groups:
+            path = node.path.child(key)
+            if isinstance(value, dict):
+                child = _Node(node, len(node.children), key, path)
+                self.groups.append(child)
+                self._add_children(child, value, depth + 1)
+            else:
+                child = _Node(node, len(node.children), key, path, field_kind(value), field_text(value))
+                self.fields[path] = child
+                self.keys.add(str(key))
+            node.children.append(child)
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if parent.column() > KEY or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.parent_index(index.internalPointer())
+
+    def parent_index(self, node):
+        parent = node.parent
+        if parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, KEY, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > KEY:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return ("Property", "Value")[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return node.key if index.column() == KEY else node.text
+        if role == Qt.ItemDataRole.ToolTipRole and node.kind is not None:
+            return TOOLTIPS.get(node.key, f"No tooltip available for {node.key}.")
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        node = index.internalPointer()
+        if index.column() == VALUE and node.kind not in (None, "bool"):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() != VALUE:
+            return False
+        node = index.internalPointer()
+        if node.kind is None:
+            return False
+        node.text = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def value_index(self, path):
+        """The index of the value of the field at path, or an invalid index."""
+        node = self.fields.get(ConfigPath.of(path))
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(node.row, VALUE, node)
+
+    def texts(self):
+        """Returns {ConfigPath: text} of every field."""
+        return {path: node.text for path, node in self.fields.items()}
+
+    def shows(self, path, value):
+        """Returns True if the field at path still shows value unedited."""
+        node = self.fields[ConfigPath.of(path)]
+        if node.kind in ("int", "float") and not isinstance(value, bool):
+            return node.text in (str(value), f"{value:.1f}")
+        return node.text == field_text(value)
+
+    def show(self, path, value):
+        """Show value in the field at path."""
+        self.setData(self.value_index(path), field_text(value))
+
+
+class FieldDelegate(QStyledItemDelegate):
+    """
+    Edits values the way the form pages do: a click toggles a bool, numbers
+    get a ScrollableLineEdit (the mouse wheel steps them) and anything else
+    a line edit.
+    """
+
+    def createEditor(self, parent, option, index):
+        kind = index.internalPointer().kind
+        if kind == "int":
+            return ScrollableLineEdit(0, -1000000, 1000000, 1, parent)
+        if kind == "float":
+            return ScrollableLineEdit(0.0, -1000000.0, 1000000.0, 0.1, parent)
+        line_edit = QLineEdit(parent)
+        line_edit.setProperty("role", "field")
+        return line_edit
+
+    def setEditorData(self, editor, index):
+        text = index.data(Qt.ItemDataRole.EditRole)
+        value = convert_value(text)
+        if isinstance(editor, ScrollableLineEdit) and isinstance(value, (int, float)):
+            editor.replace_value(value)
+        else:
+            editor.setText(text)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
+
+    def editorEvent(self, event, model, option, index):
+        node = index.internalPointer()
+        if index.column() == VALUE and node.kind == "bool":
+            toggle = (
+                event.type() == QEvent.Type.MouseButtonPress
+                and event.button() == Qt.MouseButton.LeftButton
+            ) or (event.type() == QEvent.Type.KeyPress and event.key() == Qt.Key.Key_Space)
+            if toggle:
+                model.setData(index, "False" if node.text == "True" else "True")
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PropertyTreeView(QTreeView):
+    """QTreeView set up for PropertyTreeModel and FieldDelegate."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(FieldDelegate(self))
+        self.setUniformRowHeights(True)
+        self.setAlternatingRowColors(True)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.CurrentChanged
+            | QAbstractItemView.EditTrigger.SelectedClicked
+            | QAbstractItemView.EditTrigger.AnyKeyPressed
+        )
+        self.setMinimumHeight(400)
+        self.setProperty("role", "propertyTree")
+
+    def show_model(self, model):
+        """
+        Show model with its top-level groups expanded (their Particles and
+        Sound stay folded) and drop the old model. The first column is sized
+        from the field names, without measuring every row.
+        """
+        old = self.model()
+        self.setModel(model)
+        if old is not None:
+            old.deleteLater()
+        for node in model.groups:
+            self.setFirstColumnSpanned(node.row, model.parent_index(node), True)
+        self.expandToDepth(0)
+
+        metrics = self.fontMetrics()
+        width = max((metrics.horizontalAdvance(key) for key in model.keys), default=0)
+        self.setColumnWidth(KEY, width + self.indentation() * (model.depth + 1) + 16)
+
+    def commit_edit(self):
+        """Write the value of an open editor to the model."""
+        editor = self.indexWidget(self.currentIndex())
+        if editor is not None:
+            self.commitData(editor)
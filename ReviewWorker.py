@@ -0,0 +1,39 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class ReviewSignals(QObject):
+    """
+    Signals of one ReviewWorker. QRunnable is not a QObject, so they live here.
+
+    reviewed(changes) delivers the list of changes, or None when the file
+    does not exist yet and the save would create it; failed(message) is
+    emitted on errors.
+    """
+
+    reviewed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class ReviewWorker(QRunnable):
+    """
+    Works out what saving values would change in the file (see
+    RightSection_BackEnd.pending_changes) on a QThreadPool thread, so
+    reading the file on disk does not block the GUI.
+    """
+
+    def __init__(self, backend, values):
+        super().__init__()
+        self.backend = backend
+        self.values = values
+        self.signals = ReviewSignals()
+
+    def run(self):
+        try:
+            changes = self.backend.pending_changes(self.values)
+        except FileNotFoundError:
+            changes = None
+        except Exception as e:
+            print(f"Error reviewing changes in the background: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.reviewed.emit(changes)
@@ -1,96 +1,24 @@
 import sys  
 import os
-from PyQt6.QtCore import Qt  
+from collections import OrderedDict, deque
+from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QIcon  
 from PyQt6.QtWidgets import (  
     QApplication, QWidget, QVBoxLayout,QHBoxLayout, QLineEdit, QPushButton,
-    QLabel, QFormLayout, QScrollArea, QGroupBox,QMessageBox
+    QLabel, QFormLayout, QScrollArea, QGroupBox,QMessageBox,QMainWindow,
+    QDialog, QDialogButtonBox, QListWidget, QListWidgetItem, QStackedWidget
 )
-from PyQt6.QtGui import QIntValidator, QDoubleValidator
+from PyQt6.QtGui import QIntValidator, QDoubleValidator, QColor
 
 
-import yaml
-import yaml
-
-class RightSection_BackEnd:
-    def __init__(self, file_path):
-        """
-        Initialize the backend with the path to the YAML file.
-        """
-        self.file_path = file_path
-        self.config_data = self.load_config()
-
-    def load_config(self):
-        """
-        Load the configuration data from the YAML file.
-        """
-        try:
-            with open(self.file_path, "r") as file:
-                return yaml.safe_load(file) or {}
-        except FileNotFoundError:
-            return {}
-
-    def save_config(self):
-        """
-        Save the current configuration data back to the YAML file.
-        The 'Groups' section will be preserved from the real config file.
-        """
-        # Load the real config file to preserve the 'Groups' section
-        real_config_data = self.load_config()
-        groups_data = real_config_data.get('Groups', {})
-
-        # Create a copy of the current config data (without the 'Groups' section)
-        config_data_to_save = self.config_data.copy()
-        
-        # Remove 'Groups' from the current config data to avoid overwriting it
-        if 'Groups' in config_data_to_save:
-            del config_data_to_save['Groups']
-
-        # Add the preserved 'Groups' data back to the config data to save
-        config_data_to_save['Groups'] = groups_data
-
-        # Save the merged configuration to the YAML file
-        with open(self.file_path, "w") as file:
-            yaml.safe_dump(config_data_to_save, file)
-
-    def get_section(self, section=None):
-        """
-        Retrieve a specific section of the configuration data.
-        If no section is specified, return the entire configuration.
-        """
-        if not section:
-            return self.config_data
-
-        keys = section.split(".")
-        data = self.config_data
-        for key in keys:
-            data = data.get(key, {})
-        return data
-
-    def update_value(self, path, value):
-        """
-        Update a value in the configuration data given a dot-separated path.
-        """
-        keys = path.split(".")
-        self._set_nested_value(self.config_data, keys, value)
-
-    def _set_nested_value(self, data, keys, value):
-        """
-        Helper function to set a value in a nested dictionary.
-        """
-        for key in keys[:-1]:
-            data = data.setdefault(key, {})
-        data[keys[-1]] = value
-
-    def convert_to_type(self, value):
-        """
-        Convert a string value to its appropriate data type (e.g., int, float, bool).
-        """
-        try:
-            return yaml.safe_load(value)
-        except ValueError:
-            return value
-
+import Theme
+from Backend import RightSection_BackEnd
+from ConfigDiff import ADDED, CHANGED, REMOVED, summarize
+from ConfigPath import ConfigPath
+from DocumentCache import DocumentCache
+from ReviewWorker import ReviewWorker
+from SaveWorker import SaveWorker
+from Tooltips import TOOLTIPS
 
 class ScrollableLineEdit(QLineEdit):
     def __init__(
@@ -117,19 +45,7 @@ class ScrollableLineEdit(QLineEdit):
 
             self.setValidator(QDoubleValidator(self._min_value, self._max_value, 16))
 
-        self.setStyleSheet(
-            """
-                    QLineEdit {
-                        padding: 4px;
-                        font-size: 14px;
-                        border: 1px solid #ccc;
-                        border-radius: 5px;
-                    }
-                    QLineEdit:focus {
-                        border-color: #4CAF50;
-                    }
-                """
-        )
+        self.setProperty("role", "field")
 
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self._can_scroll = False
@@ -174,6 +90,93 @@ class ScrollableLineEdit(QLineEdit):
         """
         return self._value
 
+    def replace_value(self, value):
+        """
+        Replace the value and show it the way a new widget would.
+        """
+        self._value = value
+        self.setText(str(value))
+
+    def shows(self, value):
+        """
+        Returns True if the widget still shows value unedited.
+        """
+        return self.text() in (str(value), f"{value:.1f}")
+
+class WidgetPool:
+    """
+    Keeps the widgets of a cleared editor page, hidden, for the next section
+    shown on it, so switching groups rebinds values, labels and tooltips
+    instead of building every widget with its stylesheet and validator again.
+    Each EditorPage has its own, so widgets stay under the page they were
+    styled for.
+
+    Widgets are pooled by kind ("label", "bool", "int", "float", "string",
+    and "group1", "group2"... for group boxes by nesting depth) and handed
+    out in the order they were released: a page of the same shape gets each
+    widget back in the same place, under the same parent. Keeping group
+    boxes to their depth means one is never put inside its own fields.
+    """
+
+    def __init__(self):
+        self._free = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, kind, create):
+        """
+        Returns a free widget of kind, or a new one made by create().
+        """
+        free = self._free.get(kind)
+        if free:
+            self.reused += 1
+            return free.popleft()
+        self.created += 1
+        widget = create()
+        widget.pool_kind = kind
+        return widget
+
+    def release(self, widget):
+        """
+        Hide widget and keep it for reuse. Returns False for widgets that
+        did not come from the pool; those are deleted.
+        """
+        kind = getattr(widget, "pool_kind", None)
+        if kind is None:
+            widget.deleteLater()
+            return False
+        widget.hide()
+        self._free.setdefault(kind, deque()).append(widget)
+        return True
+
+
+class EditorPage(QScrollArea):
+    """
+    One page of the editor: a scrollable group box with the fields of a
+    section. RightSection_Editor keeps the recently shown pages, with their
+    edits and scroll position, and the digest (a SubtreeHashes hash) of the
+    section each was built from, to tell when it is out of date.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.widget_pool = WidgetPool()
+        self.setMinimumWidth(400)
+        self.setWidgetResizable(True)
+        self.group_box = QGroupBox("Configuration Settings")
+        self.group_box.setObjectName("editorGroupBox")
+        self.group_layout = QFormLayout()
+        self.group_box.setLayout(self.group_layout)
+        self.setWidget(self.group_box)
+
+        self.section = None  # None while the page is not cached
+        self.digest = None
+        self.fields = 0
+        self.line_edits = {}
+        self.tree_model = None
+        self.tree_view = None
+
+
 def resource_path(relative_path):
     """Get the absolute path to a resource, works for development and PyInstaller bundle."""
     try:
@@ -183,11 +186,69 @@ def resource_path(relative_path):
         base_path = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(base_path, relative_path)
 
+class ReviewChangesDialog(QDialog):
+    """
+    Lists the changes a save is about to write to the config and asks
+    whether to go ahead.
+    """
+
+    COLORS = {ADDED: "#2E7D32", REMOVED: "#C62828", CHANGED: "#333333"}
+
+    def __init__(self, changes, file_path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Review Changes")
+        self.resize(640, 400)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(
+            QLabel(f"Saving writes {summarize(changes)} to {os.path.basename(file_path)}:")
+        )
+
+        change_list = QListWidget(self)
+        change_list.setUpdatesEnabled(False)
+        for change in changes:
+            item = QListWidgetItem(str(change))
+            item.setForeground(QColor(self.COLORS[change.kind]))
+            change_list.addItem(item)
+        change_list.setUpdatesEnabled(True)
+        layout.addWidget(change_list)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel, self
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+
 class RightSection_Editor(QWidget):
+    # Show the changes a save would write and ask before writing them. Off
+    # by default: working them out reads the whole file on disk (on the
+    # thread pool, see ReviewWorker) and adds a step to every save.
+    review_before_save = False
+    # Sections with more fields than this are shown as a tree that only
+    # builds a widget for the row being edited (see PropertyTree); None
+    # shows every section as a form.
+    tree_view_fields = 300
+    # Built pages kept for revisits, least recently shown dropped first: at
+    # most page_cache_size pages with page_cache_field_budget fields between
+    # them. The budget counts fields, not bytes: a field on a form page
+    # costs about 38 KB (its label, editor and layout item), a row on a
+    # tree page about 1 KB, so 5000 form fields come to roughly 190 MB.
+    # The open page is always kept; a size of 1 keeps only that one.
+    page_cache_size = 8
+    page_cache_field_budget = 5000
+
     def __init__(self, backend, section=None):
         super().__init__()
         self.backend = backend
-        self.section = section
+        self.section = ConfigPath.of(section or ())
+        self.save_worker = SaveWorker.instance()
+        self.save_worker.saved.connect(self.on_saved)
+        self.save_worker.failed.connect(self.on_save_failed)
+        self.page_cache = OrderedDict()  # {ConfigPath: EditorPage}, oldest first
+        self.page = None
+        self._review = None
         self.init_ui()
 
     def init_ui(self):
@@ -198,96 +259,270 @@ class RightSection_Editor(QWidget):
 
         self.layout = QHBoxLayout()
 
-        self.group_box = QGroupBox("Configuration Settings")
-        self.group_box.setStyleSheet(
-            """
-            QGroupBox {
-                font-family: 'Arial', sans-serif;  /* Set the font family */
-                font-size: 16px;  /* Set the font size */
-                color: #333;  /* Set the title color */
-                border: 1px solid #ccc;  /* Optional: add border */
-                border-radius: 5px;  /* Optional: rounded corners */
-                margin-top: 10px;  /* Add some margin at the top */
-                padding: 5px;  /* Add padding around the title */
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;  /* Position the title in the center */
-                padding-left: 10px;  /* Add padding to the left of the title */
-            }
-        """
-        )
-
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setMinimumWidth(400)
+        self.pages = QStackedWidget()
         self.save_button = QPushButton("Save Changes")
 
         if __name__ == "__main__":
             self.edit_materials_button = QPushButton("Edit Materials")
             self.edit_properties_button = QPushButton("Edit Properties")
 
-        self.group_layout = QFormLayout()
-
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.group_box)
-
-        self.layout.addWidget(self.scroll_area)
+        self.layout.addWidget(self.pages)
         # self.layout.addWidget(self.save_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.setLayout(self.layout)
-        self.show()
 
-        self.update_ui(self.section)
+        self.show_page(self.section)
+
+    # The open page's parts, for the code that fills and titles it.
+    @property
+    def widget_pool(self):
+        return self.page.widget_pool
+
+    @property
+    def group_box(self):
+        return self.page.group_box
+
+    @property
+    def group_layout(self):
+        return self.page.group_layout
+
+    @property
+    def line_edits(self):
+        return self.page.line_edits
+
+    @property
+    def tree_model(self):
+        return self.page.tree_model
+
+    @property
+    def tree_view(self):
+        return self.page.tree_view
 
     def update_ui(self, section):
         """
         Updates the UI to display the correct section data.
-        Clears the layout before creating the new section.
-        """
-
-        self.clear_layout(self.group_layout)
+        Rebuilds the page of the section, dropping its edits.
+        """
+        self.show_page(section, rebuild=True)
+
+    def show_page(self, section, rebuild=False):
+        """
+        Show the page of section. A cached page is shown as it was left,
+        with its unsaved edits and scroll position, unless the section
+        changed in the document since the page was built; then, or if
+        rebuild is True, the page is built again.
+        """
+        section = ConfigPath.of(section)
+        page = self.page_cache.get(section)
+        if page is None:
+            if self.page is not None and self.page.section is None:
+                page = self.page  # Left empty by clear_pages()
+            elif self.page_cache and len(self.page_cache) >= self.page_cache_size:
+                # Rebuild the least recently shown page, so its widgets are
+                # reused under the parents they were styled for.
+                _, page = self.page_cache.popitem(last=False)
+            else:
+                page = EditorPage()
+                self.pages.addWidget(page)
+            page.section = section
+            self.page_cache[section] = page
+            rebuild = True
+        self.page_cache.move_to_end(section)
+        self.page = page
 
         section_data = self.backend.get_section(section)
-
-        self.line_edits = {}
-        self.create_line_edits(section_data, self.group_layout, section)
-
-        self.group_box.setLayout(self.group_layout)
+        if rebuild or page.digest != self._digest(section_data):
+            self._build_page(page, section_data)
+        self.pages.setCurrentWidget(page)
+        self._evict_pages()
+
+    def _build_page(self, page, section_data):
+        self.clear_layout(page.group_layout)
+        page.line_edits = {}
+        page.tree_model = page.tree_view = None
+        page.fields = self._count_fields(section_data)
+        if self.tree_view_fields is not None and page.fields > self.tree_view_fields:
+            self.create_tree_view(section_data, page.group_layout, page.section)
+        else:
+            self.create_line_edits(section_data, page.group_layout, page.section)
+        page.digest = self._digest(section_data)
+
+    def _digest(self, section_data):
+        """
+        Returns the hash of section_data. The hashes of the cached document
+        are kept until it changes (see DocumentCache.mark_changed), so an
+        unchanged section is not hashed again.
+        """
+        cache = DocumentCache()
+        with cache.lock:
+            return cache.hashes(self.backend.file_path, self.backend.config_data).of(section_data)
+
+    def _evict_pages(self):
+        fields = sum(page.fields for page in self.page_cache.values())
+        while len(self.page_cache) > 1 and (
+            len(self.page_cache) > self.page_cache_size or fields > self.page_cache_field_budget
+        ):
+            _, page = self.page_cache.popitem(last=False)
+            fields -= page.fields
+            self._drop_page(page)
+
+    def _drop_page(self, page):
+        """Delete page and its widgets, pooled ones included."""
+        self.pages.removeWidget(page)
+        page.deleteLater()
+
+    def clear_pages(self):
+        """
+        Drop every cached page, with its unsaved edits, and leave the open
+        one empty.
+        """
+        for page in self.page_cache.values():
+            if page is not self.page:
+                self._drop_page(page)
+        self.page_cache.clear()
+        self.clear_layout(self.page.group_layout)
+        self.page.section = self.page.digest = self.page.tree_model = self.page.tree_view = None
+        self.page.line_edits = {}
+        self.page.fields = 0
 
     def reload_config(self, new_file_path, section=None):
         """
         Reload the configuration from a new file path and update the UI.
+        Pages cached for another file are dropped.
         """
+        if new_file_path != self.backend.file_path:
+            self.clear_pages()
 
         self.backend = RightSection_BackEnd(new_file_path)
 
-        self.section = section or self.section
+        self.section = ConfigPath.of(section) if section else self.section
+
+        self.show_page(self.section)
+
+    def apply_external_changes(self, changes):
+        """
+        Update the open and cached pages after the config was changed by
+        another program (see YAMLConfigManager.reload_from_disk). Changed
+        fields are updated in place, except the ones edited here and not
+        saved yet. A page is only rebuilt when fields were added or removed,
+        or changed type; a cached page is dropped instead.
+        """
+        touched = [
+            (page, [change for change in changes if change.touches(page.section)])
+            for page in self.page_cache.values()
+        ]
+        touched = [(page, page_changes) for page, page_changes in touched if page_changes]
+        if not touched or not self.backend.file_path:
+            return
 
-        self.update_ui(self.section)
+        # The merged document replaced the one these pages were built from.
+        self.backend = RightSection_BackEnd(self.backend.file_path)
+        rebuild = False
+        for page, page_changes in touched:
+            if self._patch_page(page, page_changes):
+                page.digest = self._digest(self.backend.get_section(page.section))
+            elif page is self.page:
+                rebuild = True
+            else:
+                del self.page_cache[page.section]
+                self._drop_page(page)
+        if rebuild:
+            self.update_ui(self.page.section)
+
+    def _patch_page(self, page, changes):
+        """
+        Show changes on page. Returns False if they add or remove fields, or
+        change their type, and the page has to be rebuilt.
+        """
+        for change in changes:
+            if change.kind != CHANGED or type(change.old) is not type(change.new):
+                return False
+            if page.tree_model is not None:
+                if change.path not in page.tree_model.fields:
+                    return False
+                if page.tree_model.shows(change.path, change.old):
+                    page.tree_model.show(change.path, change.new)
+                continue
+            line_edit = page.line_edits.get(change.path)
+            if line_edit is None:
+                return False
+            if self._shows(line_edit, change.old):
+                self._show(line_edit, change.new)
+        return True
+
+    @staticmethod
+    def _shows(line_edit, value):
+        if isinstance(line_edit, ScrollableLineEdit):
+            return line_edit.shows(value)
+        if isinstance(value, bool):
+            return line_edit.text() == ("True" if value else "False")
+        return line_edit.text() == str(value)
+
+    @staticmethod
+    def _show(line_edit, value):
+        if isinstance(line_edit, ScrollableLineEdit):
+            line_edit.replace_value(value)
+        elif isinstance(value, bool):
+            line_edit.setText("True" if value else "False")
+        else:
+            line_edit.setText(str(value))
 
     def clear_layout(self, layout):
         """
-        Clears all widgets from a given layout, including child layouts.
+        Clears all widgets from a given layout, including child layouts, and
+        hands them to the widget pool. Group boxes are released before their
+        fields, in the order create_line_edits takes them.
         """
         while layout.count():
             item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            widget = item.widget()
+            if widget:
+                if self.widget_pool.release(widget) and widget.layout() is not None:
+                    self.clear_layout(widget.layout())
             elif item.layout():
                 self.clear_layout(item.layout())
 
-    def create_line_edits(self, data, parent_layout, path=""):
+    @staticmethod
+    def _count_fields(data):
+        if not isinstance(data, dict):
+            return 1
+        return sum(RightSection_Editor._count_fields(value) for value in data.values())
+
+    def create_tree_view(self, data, parent_layout, section):
+        """
+        Show a large section as a PropertyTreeView instead of a form.
+        """
+        from PropertyTree import PropertyTreeModel, PropertyTreeView  # Loaded with the first large page
+
+        self.page.tree_view = self.widget_pool.acquire("tree", PropertyTreeView)
+        self.page.tree_model = PropertyTreeModel(data, section)
+        self.tree_view.show_model(self.tree_model)
+        parent_layout.addRow(self.tree_view)
+        self.tree_view.show()
+
+    def field_texts(self):
+        """
+        Returns {ConfigPath: text} of every field on the page, as edited.
+        """
+        if self.tree_model is not None:
+            self.tree_view.commit_edit()
+            return self.tree_model.texts()
+        return {path: line_edit.text() for path, line_edit in self.line_edits.items()}
+
+    def create_line_edits(self, data, parent_layout, path=ConfigPath()):
         """
         Recursive function that creates ScrollableLineEdits for each field in the data.
         Handles special sections like "Particles", "Sound", and dynamically detected sections like "DIRT", etc.
+        Fields are keyed by ConfigPath, so group names containing dots are safe.
         """
+        path = ConfigPath.of(path)
         if isinstance(data, dict):
             particles_data = None
             sound_data = None
             dynamic_groups = []
 
             for key, value in data.items():
-                new_path = f"{path}.{key}" if path else key
+                new_path = path.child(key)
 
                 if key == "Particles":
                     particles_data = value
@@ -300,17 +535,17 @@ class RightSection_Editor(QWidget):
 
             if particles_data is not None:
                 self.create_groupbox_section(
-                    "Particles", particles_data, parent_layout, f"{path}.Particles"
+                    "Particles", particles_data, parent_layout, path.child("Particles")
                 )
 
             if sound_data is not None:
                 self.create_groupbox_section(
-                    "Sound", sound_data, parent_layout, f"{path}.Sound"
+                    "Sound", sound_data, parent_layout, path.child("Sound")
                 )
 
             for group_name, group_data in dynamic_groups:
                 self.create_groupbox_section(
-                    group_name, group_data, parent_layout, f"{path}.{group_name}"
+                    group_name, group_data, parent_layout, path.child(group_name)
                 )
 
         else:
@@ -318,29 +553,10 @@ class RightSection_Editor(QWidget):
             is_properties_section = "Properties" in self.section
             is_materials_section = "Materials" in self.section
 
-            label = QLabel(path.split(".")[-1])
-            label.setStyleSheet(
-                """
-                QLabel {
-                    padding: 4px;
-                    font-size: 14px;
-                    border: 2px solid #000000; /* Green hollow outline */
-                    background-color: #ADD8E6; /* Grey background color */
-                    border-radius: 8px;       /* Rounded corners */
-                    margin: 0px;
-                    color: black;             /* Text color */
-                    text-align: center;       /* Center the text */
-                }
-                QToolTip {
-                    background-color: #333;
-                    color: white;
-                    border: 1px solid #888;
-                    border-radius: 3px;
-                }
-            """
-            )
+            label = self.widget_pool.acquire("label", self._new_label)
+            label.setText(str(path.key))
 
-            tooltip_key = path.split(".")[-1]
+            tooltip_key = path.key
 
             tooltip = TOOLTIPS.get(tooltip_key, None)
 
@@ -363,70 +579,33 @@ class RightSection_Editor(QWidget):
                 label.setFixedWidth(10)
 
             if isinstance(data, bool):
-
-                line_edit = QLineEdit()
+                line_edit = self.widget_pool.acquire("bool", self._new_bool_edit)
                 line_edit.setText("True" if data else "False")
-                line_edit.setStyleSheet(
-                    """
-                    QLineEdit {
-                        padding: 4px;
-                        font-size: 14px;
-                        border: 1px solid #ccc;
-                        border-radius: 5px;
-                        background-color: #f0f0f0;  /* Light grey */
-                    }
-                """
-                )
-                line_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                line_edit.setReadOnly(True)
-
-                line_edit.setMouseTracking(False)
-
-                def toggle_boolean(event):
-                    current_value = line_edit.text()
-                    if current_value == "True":
-                        line_edit.setText("False")
-                    else:
-                        line_edit.setText("True")
-
-                line_edit.mousePressEvent = toggle_boolean
-
-                def prevent_double_click(event):
-                    event.ignore()
-
-                line_edit.mouseDoubleClickEvent = prevent_double_click
-            else:
-
-                if isinstance(data, int):
-                    line_edit = ScrollableLineEdit(
-                        initial_value=data,
+            elif isinstance(data, int):
+                line_edit = self.widget_pool.acquire(
+                    "int",
+                    lambda: ScrollableLineEdit(
+                        initial_value=0,
                         min_value=-1000000,
                         max_value=1000000,
                         step=1,
-                    )
-                elif isinstance(data, float):
-                    line_edit = ScrollableLineEdit(
-                        initial_value=data,
+                    ),
+                )
+                line_edit.replace_value(data)
+            elif isinstance(data, float):
+                line_edit = self.widget_pool.acquire(
+                    "float",
+                    lambda: ScrollableLineEdit(
+                        initial_value=0.0,
                         min_value=-1000000.0,
                         max_value=1000000.0,
                         step=0.1,
-                    )
-                else:
-
-                    line_edit = QLineEdit(str(data))
-                    line_edit.setStyleSheet(
-                        """
-                        QLineEdit {
-                            padding: 4px;
-                            font-size: 14px;
-                            border: 1px solid #ccc;
-                            border-radius: 5px;
-                        }
-                        QLineEdit:focus {
-                            border-color: #4CAF50;
-                        }
-                    """
-                    )
+                    ),
+                )
+                line_edit.replace_value(data)
+            else:
+                line_edit = self.widget_pool.acquire("string", self._new_string_edit)
+                line_edit.setText(str(data))
 
             if "Particles" in path or "Sound" in path:
                 line_edit.setFixedWidth(300)
@@ -439,6 +618,8 @@ class RightSection_Editor(QWidget):
                     line_edit.setFixedWidth(10)
 
             parent_layout.addRow(label, line_edit)
+            label.show()
+            line_edit.show()
 
             self.line_edits[path] = line_edit
 
@@ -446,17 +627,64 @@ class RightSection_Editor(QWidget):
         """
         This function creates a QGroupBox for special sections like "Particles", "Sound", or dynamically detected groups.
         """
-        group_box = QGroupBox(section_name)
-        group_layout = QFormLayout()
+        depth = len(section_path) - len(self.section)
+        group_box = self.widget_pool.acquire(f"group{depth}", self._new_group_box)
+        group_box.setTitle(section_name)
 
-        self.create_line_edits(data, group_layout, section_path)
+        self.create_line_edits(data, group_box.layout(), section_path)
 
-        group_box.setLayout(group_layout)
         parent_layout.addRow(group_box)
+        group_box.show()
+
+    # Widgets are styled by their "role" in the application stylesheet (Theme.py).
+
+    @staticmethod
+    def _new_label():
+        label = QLabel()
+        label.setProperty("role", "fieldLabel")
+        return label
+
+    @staticmethod
+    def _new_bool_edit():
+        line_edit = QLineEdit()
+        line_edit.setProperty("role", "boolField")
+        line_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        line_edit.setReadOnly(True)
+
+        line_edit.setMouseTracking(False)
+
+        def toggle_boolean(event):
+            current_value = line_edit.text()
+            if current_value == "True":
+                line_edit.setText("False")
+            else:
+                line_edit.setText("True")
+
+        line_edit.mousePressEvent = toggle_boolean
+
+        def prevent_double_click(event):
+            event.ignore()
+
+        line_edit.mouseDoubleClickEvent = prevent_double_click
+        return line_edit
+
+    @staticmethod
+    def _new_string_edit():
+        line_edit = QLineEdit()
+        line_edit.setProperty("role", "field")
+        return line_edit
+
+    @staticmethod
+    def _new_group_box():
+        group_box = QGroupBox()
+        group_box.setLayout(QFormLayout())
+        return group_box
 
     def save_changes(self):
         """
-        Save the current changes.
+        Save the current changes. The values are applied right away; the file
+        is written by the SaveWorker thread, which reports back through
+        on_saved() or on_save_failed().
         """
         if not self.backend.file_path:
 
@@ -469,22 +697,96 @@ class RightSection_Editor(QWidget):
 
         try:
 
-            for path, line_edit in self.line_edits.items():
-                value = self.backend.convert_to_type(line_edit.text())
-                self.backend.update_value(path, value)
-                print(path)
-
-            self.backend.save_config()
-
-            QMessageBox.information(
-                self, "Success", "Properties saved to config successfully."
-            )
+            values = {
+                path: self.backend.convert_to_type(text)
+                for path, text in self.field_texts().items()
+            }
+            if self.review_before_save:
+                self.review_changes(values)
+            else:
+                self.save_values(values, self.page)
 
         except Exception as e:
 
             print(str(e))
             QMessageBox.warning(self, "Error", f"An error occurred: {str(e)}")
 
+    def save_values(self, values, page):
+        """
+        Apply values, the fields of page, and queue the document for the
+        SaveWorker.
+        """
+        self.backend.apply_values(values)
+        if page.section is not None and self.page_cache.get(page.section) is page:
+            page.digest = self._digest(self.backend.get_section(page.section))
+
+        self.save_worker.request_save(self.backend.file_path, self.backend.config_data)
+        self.show_status("Saving properties...")
+
+    def review_changes(self, values):
+        """
+        Work out what saving values would change in the file on the thread
+        pool, then show it and save if the user agrees (see _on_reviewed).
+        A review still running is superseded and its result ignored.
+        """
+        worker = self._review = ReviewWorker(self.backend, values)
+        page, file_path = self.page, self.backend.file_path
+        worker.signals.reviewed.connect(
+            lambda changes: self._on_reviewed(worker, page, file_path, changes)
+        )
+        worker.signals.failed.connect(
+            lambda message: self._on_review_failed(worker, message)
+        )
+        self.show_status("Checking what the save would change...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_reviewed(self, worker, page, file_path, changes):
+        if worker is not self._review:
+            return
+        self._review = None
+        if file_path != self.backend.file_path:
+            return  # Another config was opened in the meantime
+        if changes is not None:  # None: the save creates the file
+            if not changes:
+                self.show_status("No changes to save.", 3000)
+                return
+            dialog = ReviewChangesDialog(changes, file_path, self)
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                self.show_status("Save cancelled.", 3000)
+                return
+        self.save_values(worker.values, page)
+
+    def _on_review_failed(self, worker, message):
+        if worker is not self._review:
+            return
+        self._review = None
+        self.show_status("Saving failed.", 3000)
+        QMessageBox.warning(self, "Error", f"Could not review the changes: {message}")
+
+    def pending_changes(self, values):
+        """
+        Returns the changes saving would write to the file, with values (the
+        fields of this page) in place of the values in memory.
+        """
+        return self.backend.pending_changes(values)
+
+    def on_saved(self, file_path, bytes_written):
+        self.show_status("Properties saved to config successfully.", 3000)
+
+    def on_save_failed(self, file_path, message):
+        self.show_status("Saving failed.", 3000)
+        QMessageBox.warning(self, "Error", f"Could not save {file_path}: {message}")
+
+    def show_status(self, message, timeout=0):
+        """
+        Show a message in the main window's status bar without blocking.
+        """
+        window = self.window()
+        if isinstance(window, QMainWindow):
+            window.statusBar().showMessage(message, timeout)
+        else:
+            print(message)
+
     def resizeEvent(self, event):
         """
         Override the resizeEvent method to print the window size
@@ -499,199 +801,18 @@ class RightSection_Editor(QWidget):
         Can be called externally to switch sections.
         """
         self.section = section
-        self.update_ui(self.section)
-
-
-TOOLTIPS = {
-    "ExplosionRadius": (
-        "Overrides the original explosion radius.\n\n"
-        "- **Default**: 0.0 (keeps original radius).\n"
-        "- **Range**: [0.0, ∞)\n"
-        "- **>0.0**: Custom explosion radius."
-    ),
-    "ExplosionFactor": (
-        "Multiplies the original explosion radius.\n\n"
-        "- **Default**: 1.0 (keeps original radius).\n"
-        "- **0.0**: Nullifies the explosion.\n"
-        "- **>1.0**: Magnifies the explosion radius."
-    ),
-    "ReplaceOriginalExplosion": (
-        "Determines whether the original explosion is replaced with a custom one.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: Replaces the original explosion (some properties may be lost).\n"
-        "- **False**: Only affects ExplodeAny calculations."
-    ),
-    "UnderwaterExplosionFactor": (
-        "Adjusts the explosion radius underwater.\n\n"
-        "- **Default**: 0.5 (reduces radius to half).\n"
-        "- **Range**: [0.0, ∞)\n"
-        "- **1.0**: No change underwater.\n"
-        "- **>1.0**: Magnifies the underwater radius."
-    ),
-    "ExplosionDamageBlocksUnderwater": (
-        "Determines whether explosions damage unmanaged vanilla blocks underwater.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: Custom explosion damages blocks like stone and dirt."
-    ),
-    "ReplaceOriginalExplosionWhenUnderwater": (
-        "Specifies whether the original explosion is replaced when underwater.\n\n"
-        "- **Default**: true.\n"
-        "- **True**: Replaces the explosion with a custom one.\n"
-        "- **False**: Both original and custom explosions occur."
-    ),
-    "ExplosionRemoveWaterloggedStateFromNearbyBlocks": (
-        "Allows explosions to remove the waterlogged state from nearby blocks.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: Waterlogged blocks lose their waterlogged state."
-    ),
-    "ExplosionRemoveWaterloggedStateFromNearbyBlocksOnSurface": (
-        "Applies ExplosionRemoveWaterloggedStateFromNearbyBlocks on surface explosions.\n\n"
-        "- **Default**: true."
-    ),
-    "ExplosionRemoveWaterloggedStateFromNearbyBlocksUnderwater": (
-        "Applies ExplosionRemoveWaterloggedStateFromNearbyBlocks to underwater explosions.\n\n"
-        "- **Default**: true."
-    ),
-    "ExplosionRemoveNearbyWaterloggedBlocks": (
-        "Removes nearby waterlogged blocks before the explosion.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: Prioritizes this over waterlogged state removal."
-    ),
-    "ExplosionRemoveNearbyLiquids": (
-        "Allows explosions to remove nearby liquids before detonating.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: Liquids in the explosion area are removed."
-    ),
-    "PackDroppedItems": (
-        "Packs dropped items into a single entity to reduce lag.\n\n"
-        "- **Default**: false.\n"
-        "- **True**: All dropped items spawn as one entity."
-    ),
-    "Particles": (
-        "Specifies particle effects during explosions.\n\n"
-        "- **Name**: Particle type (see Spigot Particle documentation).\n"
-        "- **DeltaX/Y/Z**: Size of the particle cube.\n"
-        "- **Amount**: Number of particles (higher values may reduce performance).\n"
-        "- **Speed**: Particle speed (must be ≥0).\n"
-        "- **Force**: Ensures particles are visible up to 256 blocks away.\n"
-        "- **Color**: Applies only to REDSTONE particles.\n"
-        "- **Size**: Particle size (applies to REDSTONE particles)."
-    ),
-    "Sound": (
-        "Specifies sound effects during explosions.\n\n"
-        "- **Name**: Sound type (see Spigot Sound documentation).\n"
-        "- **Volume**: Adjusts sound radius.\n"
-        "- **Pitch**: Speed of sound playback (range: 0.5–2.0)."
-    ),
-    "Damage": (
-        "Base damage used to calculate effective block damage.\n\n"
-        "- **Default**: Equal to BlockDurability.\n"
-        "- **Range**: [0.0, ∞)\n"
-        "- **0.0**: Block is unaffected by the explosion."
-    ),
-    "DropChance": (
-        "Chance of a block dropping items naturally when broken.\n\n"
-        "- **Default**: 0.0 (blocks never drop items).\n"
-        "- **Range**: [0.0, 100.0]\n"
-        "- **100.0**: Blocks always drop items."
-    ),
-    "DistanceAttenuationFactor": (
-        "Controls how damage decreases with distance from the explosion.\n\n"
-        "- **Default**: 0.0 (all blocks in range take equal damage).\n"
-        "- **Range**: [0.0, 1.0]\n"
-        "- **1.0**: Damage decreases linearly with distance."
-    ),
-    "UnderwaterDamageFactor": (
-        "Adjusts damage taken by blocks underwater.\n\n"
-        "- **Default**: 0.5 (halves underwater damage).\n"
-        "- **Range**: [0.0, ∞)\n"
-        "- **1.0**: Water has no effect.\n"
-        "- **>1.0**: Magnifies underwater damage."
-    ),
-    "FancyUnderwaterDetection": (
-        "Enables detailed water detection for underwater damage.\n\n"
-        "- **Default**: false (checks water only at the explosion center).\n"
-        "- **True**: Traces rays to detect water for each block."
-    ),
-    "Name": (
-        "Specifies the name of the particles to be spawned during the explosion.\n\n"
-        "- **Valid values**: Refer to Spigot Particle documentation for available types.\n"
-        "- **Default**: REDSTONE."
-    ),
-    "DeltaX": (
-        "Defines the size of the cube containing the particles along the X-axis.\n\n"
-        "- **Default**: 2.0\n"
-        "- **Higher values**: Larger spread of particles."
-    ),
-    "DeltaY": (
-        "Defines the size of the cube containing the particles along the Y-axis.\n\n"
-        "- **Default**: 2.0\n"
-        "- **Higher values**: Larger spread of particles."
-    ),
-    "DeltaZ": (
-        "Defines the size of the cube containing the particles along the Z-axis.\n\n"
-        "- **Default**: 2.0\n"
-        "- **Higher values**: Larger spread of particles."
-    ),
-    "Amount": (
-        "Sets the number of particles to be spawned.\n\n"
-        "- **Default**: 2000\n"
-        "- **Caution**: Large values can cause performance issues like FPS drops."
-    ),
-    "Speed": (
-        "Defines the speed of the particles.\n\n"
-        "- **Default**: 1.0\n"
-        "- **Higher values**: Faster particles."
-    ),
-    "Force": (
-        "If true, the particles can be seen up to 256 blocks away.\n\n"
-        "- **Default**: true."
-    ),
-    "Red": (
-        "Sets the red component of the particle color.\n\n"
-        "- **Default**: 255\n"
-        "- **Valid range**: [0, 255]."
-    ),
-    "Blue": (
-        "Sets the blue component of the particle color.\n\n"
-        "- **Default**: 0\n"
-        "- **Valid range**: [0, 255]."
-    ),
-    "Green": (
-        "Sets the green component of the particle color.\n\n"
-        "- **Default**: 255\n"
-        "- **Valid range**: [0, 255]."
-    ),
-    "Size": (
-        "Defines the size of the particles (only for REDSTONE particles).\n\n"
-        "- **Default**: 2.0\n"
-        "- **Higher values**: Larger particles."
-    ),
-    "Sound_Name": (
-        "Specifies the sound to be played when the entity explodes.\n\n"
-        "- **Valid values**: Refer to Spigot Sound documentation for available sounds.\n"
-        "- **Default**: ENTITY_OCELOT_HURT."
-    ),
-    "Sound_Volume": (
-        "Sets the volume of the explosion sound.\n\n"
-        "- **Default**: 1.0\n"
-        "- **Range**: [0.0, ∞). Higher values allow the sound to be heard from farther away."
-    ),
-    "Sound_Pitch": (
-        "Defines the pitch (speed) of the explosion sound.\n\n"
-        "- **Default**: 1.0\n"
-        "- **Range**: [0.5, 2.0]."
-    ),
-}
+        self.show_page(self.section)
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    Theme.apply(app)
 
     config_file_path = "config.yaml"
     backend = RightSection_BackEnd(config_file_path)
 
     section_to_display = "VanillaEntity.Pinapple.Properties"  # Properties/Materials
     editor = RightSection_Editor(backend, section=section_to_display)
+    editor.show()
 
     sys.exit(app.exec())
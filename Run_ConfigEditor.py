@@ -1,11 +1,19 @@
+import time
+
+# Taken before the Qt imports, so the startup report (see StartupTimer)
+# includes them.
+_STARTED = time.perf_counter()
+
 import sys
-from PyQt6.QtWidgets import QApplication, QMessageBox,QComboBox, QDialogButtonBox,QDialog,QLineEdit,QLabel, QWidget,QMenuBar, QVBoxLayout, QScrollArea, QListWidget, QListWidgetItem, QInputDialog, QPushButton,QFileDialog,QFormLayout
-from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtWidgets import QApplication, QMessageBox,QComboBox, QDialogButtonBox,QDialog,QLineEdit,QLabel, QWidget,QMenuBar, QVBoxLayout, QScrollArea, QListWidget, QListWidgetItem, QInputDialog, QPushButton,QFileDialog,QFormLayout,QProgressDialog
+from PyQt6.QtCore import QSize, Qt, QThreadPool, QTimer
 from PyQt6.QtGui import QAction,QIcon,QColor,QFont
 import MainUIv6 as UI
-import Backend as backend
-import yaml
-import Right_PropEditor as RightSection
+import Theme
+from ConfigWatcher import ConfigWatcher
+# Backend, ConfigPath and LoadWorker bring in the YAML machinery
+# (DocumentCache, LazyLoader, SourceMap, ...); they are imported by the
+# actions that open or create a config, so the window shows without them.
 
 import os
 import importlib.util
@@ -71,6 +79,10 @@ class MainInputOutput:
         self.selected_entity_group = None 
         self.selected_block_group = None
         self.main_window = window
+        self._loader = None
+        self._load_progress = None
+        self.watcher = ConfigWatcher(window)
+        self.watcher.changed.connect(self.on_config_changed)
         self.setup_connections()
         self.create_file_menu()
     def setup_connections(self):
@@ -95,7 +107,7 @@ class MainInputOutput:
             self.connect_button_action(entity_block_section.add_block_button, self.add_block, entity_block_section.block_list_widget)
             self.connect_button_action(entity_block_section.remove_button, self.remove_selected, entity_block_section.entity_list_widget, entity_block_section.block_list_widget)
     def create_file_menu(self):
-        """Create the file menu with 'Empty Config' and 'Load YAML' options."""
+        """Create the file menu with 'Empty Config', 'Load YAML' and 'Import Group Items' options."""
         menu_bar = self.window.menuBar()  # Access the menu bar from the window
 
         file_menu = menu_bar.addMenu("File")
@@ -103,15 +115,27 @@ class MainInputOutput:
         # Create 'Empty Config' and 'Load YAML' actions
         empty_config_action = QAction("Empty_Config...", self.window)
         load_yaml_action = QAction("Load YAML...", self.window)
+        import_items_action = QAction("Import Group Items...", self.window)
 
         file_menu.addAction(empty_config_action)
         file_menu.addAction(load_yaml_action)
+        file_menu.addSeparator()
+        file_menu.addAction(import_items_action)
 
         # Connect actions to respective slots
         empty_config_action.triggered.connect(self.on_Empty_Load)
         load_yaml_action.triggered.connect(self.on_load_yaml)
+        import_items_action.triggered.connect(self.on_import_group_items)
     
 
+    @staticmethod
+    def fill_list_widget(list_widget, items):
+        """Replace the contents of a list widget in one batch, or show 'Empty'."""
+        list_widget.setUpdatesEnabled(False)
+        list_widget.clear()
+        list_widget.addItems([str(item) for item in items] or ["Empty"])
+        list_widget.setUpdatesEnabled(True)
+
     @staticmethod
     def connect_button_action(button, action, *args):
         """Generalized function to connect a button's click signal to a slot."""
@@ -124,6 +148,7 @@ class MainInputOutput:
 
     def on_Add_Group(self, middle_section):
         """Handle the addition of a new group by calling the backend."""
+        import Backend as backend
         
         
         
@@ -177,17 +202,14 @@ class MainInputOutput:
             # Optionally, you can refresh or update the UI after this operation
             group_selector = middle_section.config_section.get_group_selector()
             if group_selector:
-                # Update the group list (optional: reload groups from config_manager)
-                groups = self.config_manager.get_value('Groups')
-                if groups:
-                    group_selector.populate_groups(list(groups.keys()))
-                    
+                # The pairing index was updated by Add_Group_Pairs; just redraw the groups
+                ordered_groups = self.populate_group_selector(group_selector)
+                if ordered_groups:
                     middle_section.config_section.block_group_entry.clear()
                     middle_section.config_section.entity_group_entry.clear()
-                    
-                    self.reload_yaml()  # This will reload the same file you previously loaded
-                                        # Manually trigger the group selection for the first two items if available
-                    if len(groups) >= 2:
+
+                    # Manually trigger the group selection for the first two items if available
+                    if len(ordered_groups) >= 2:
                         item1 = group_selector.group_list.item(0)  # First item
                         item2 = group_selector.group_list.item(1)  # Second item
 
@@ -203,8 +225,12 @@ class MainInputOutput:
 
 
 
-    def handle_group_selection(self, item, group_selector):
-        """Handle the group selection in the main program."""
+    def handle_group_selection(self, item, group_selector, show_editor=True):
+        """
+        Handle the group selection in the main program. With show_editor
+        False only the entity/block lists are filled and the editor page is
+        left as it is.
+        """
         selected_group = item.text()
 
         try:
@@ -215,13 +241,14 @@ class MainInputOutput:
                     config_editor_instance = Right_Section_Instance.get_config_editor()
 
                     # Check if the selected group is an Entity or Block
-                    if selected_group in self.entity_to_block:
+                    pairs = self.config_manager.group_pairs()
+                    if pairs.is_entity(selected_group):
                         # It's an Entity Group
-                        self._handle_entity_group(selected_group, config_editor_instance)
+                        self._handle_entity_group(selected_group, config_editor_instance, show_editor)
 
-                    elif selected_group in self.block_to_entity:
+                    elif pairs.is_block(selected_group):
                         # It's a Block Group
-                        self._handle_block_group(selected_group, config_editor_instance)
+                        self._handle_block_group(selected_group, config_editor_instance, show_editor)
 
                     else:
                         # Display an error message to the user
@@ -245,8 +272,10 @@ class MainInputOutput:
         """Retrieve the Right Section Instance."""
         return self.window.findChild(UI.RightSection)
 
-    def _handle_entity_group(self, selected_group, config_editor_instance):
+    def _handle_entity_group(self, selected_group, config_editor_instance, show_editor=True):
         """Handle entity group selection."""
+        import Backend as backend
+        from ConfigPath import ConfigPath
         entity_block_section = self.window.findChild(UI.EntityBlockSection)
         if entity_block_section:
             entity_list_widget = entity_block_section.entity_list_widget
@@ -261,20 +290,25 @@ class MainInputOutput:
 
             # Retrieve items for the entity group
             group_items = backend.retrieve_group_items(self.config_manager, selected_group)
+            self.fill_list_widget(entity_list_widget, group_items or [])
             if group_items:
-                for item in group_items:
-                    entity_list_widget.addItem(item)
                 print(f"Added {len(group_items)} items to the entity list.")
             else:
-                entity_list_widget.addItem("Empty")
                 print(f"No items found for entity group '{selected_group}'. Added 'Empty' placeholder.")
 
-        config_editor_instance.reload_config(self.file_path, section=f"VanillaEntity.{self.selected_entity_group}.Properties")
+        if not show_editor:
+            return
+        config_editor_instance.reload_config(
+            self.file_path,
+            section=ConfigPath(("VanillaEntity", self.selected_entity_group, "Properties")),
+        )
         Title = f"Editing Group: {self.selected_entity_group}"
         config_editor_instance.group_box.setTitle(Title)
 
-    def _handle_block_group(self, selected_group, config_editor_instance):
+    def _handle_block_group(self, selected_group, config_editor_instance, show_editor=True):
         """Handle block group selection."""
+        import Backend as backend
+        from ConfigPath import ConfigPath
         entity_block_section = self.window.findChild(UI.EntityBlockSection)
         if entity_block_section:
             block_list_widget = entity_block_section.block_list_widget
@@ -289,22 +323,21 @@ class MainInputOutput:
 
             # Retrieve items for the block group
             group_items = backend.retrieve_group_items(self.config_manager, selected_group)
+            self.fill_list_widget(block_list_widget, group_items or [])
             if group_items:
-                for item in group_items:
-                    block_list_widget.addItem(item)
                 print(f"Added {len(group_items)} items to the block list.")
             else:
-                block_list_widget.addItem("Empty")
                 print(f"No items found for block group '{selected_group}'. Added 'Empty' placeholder.")
 
-        if selected_group in self.block_to_entity:
+        pairs = self.config_manager.group_pairs()
+        if show_editor and pairs.is_block(selected_group):
             # Find the paired entity for the selected block group
-            paired_entity = self.block_to_entity.get(selected_group)
+            paired_entity = pairs.paired_group(selected_group)
             if not paired_entity:
                 raise ValueError(f"No paired entity found for block group: {selected_group}")
 
             # Construct the section path using the paired entity
-            section_path = f"VanillaEntity.{paired_entity}.Materials"
+            section_path = ConfigPath(("VanillaEntity", paired_entity, "Materials"))
 
             # Reload the configuration
             config_editor_instance.reload_config(self.file_path, section=section_path)
@@ -313,15 +346,12 @@ class MainInputOutput:
 
 
     def add_entity(self, entity_list_widget: QListWidget):
+        import Backend as backend
         # Check if config_manager is initialized
         if not self.config_manager or not self.config_manager.get_value('Groups'):
             QMessageBox.warning(self.main_window, "Error", "No config loaded. Cannot add entity.")
             return
-        allowed_entity_values = [
-                     "PRIMED_TNT", "ENDER_CRYSTAL","WITHER", "MINECART_TNT", "CREEPER", 
-                    "CHARGED_CREEPER", "FIREBALL", "DRAGON_FIREBALL", "SMALL_FIREBALL",
-                    "WITHER_SKULL", "CHARGED_WITHER_SKULL", "BED", "RESPAWN_ANCHOR"
-                ]
+        allowed_entity_values = list(backend.ENTITY_TYPES)
 
         # Open the custom dialog for adding an entity
         dialog = AddEntityDialog(allowed_entity_values, item_type="Entity")
@@ -329,6 +359,11 @@ class MainInputOutput:
             entity_input = dialog.get_data()
             if entity_input:
                 if isinstance(entity_input, list):
+                    # Skip entities that are already in the group
+                    entity_input = self.config_manager.new_group_items(self.selected_entity_group, entity_input)
+                    if not entity_input:
+                        return
+
                     # Remove the "Empty" placeholder if present
                     for i in range(entity_list_widget.count()):
                         if entity_list_widget.item(i).text() == "Empty":
@@ -340,13 +375,18 @@ class MainInputOutput:
                         entity_list_widget.addItem(entity_name)
                     if self.selected_entity_group:
                         
-                        self.config_manager.add_items_to_group(self.selected_entity_group, entity_input)
+                        with self.config_manager.transaction():
+                            self.config_manager.add_items_to_group(self.selected_entity_group, entity_input)
                         print(f"Added entities {', '.join(entity_input)} to the '{self.selected_entity_group}' entity group.")
                     else:
                         print("No entity group selected. Cannot add entity.")
                 else:
                     
                     entity_name = entity_input
+                    if not self.config_manager.new_group_items(self.selected_entity_group, [entity_name]):
+                        print(f"'{entity_name}' is already in the '{self.selected_entity_group}' entity group.")
+                        return
+
                     # Remove the "Empty" placeholder if present
                     for i in range(entity_list_widget.count()):
                         if entity_list_widget.item(i).text() == "Empty":
@@ -356,7 +396,8 @@ class MainInputOutput:
 
                     
                     if self.selected_entity_group:
-                        self.config_manager.add_items_to_group(self.selected_entity_group, [entity_name])
+                        with self.config_manager.transaction():
+                            self.config_manager.add_items_to_group(self.selected_entity_group, [entity_name])
                         print(f"Added '{entity_name}' to the '{self.selected_entity_group}' entity group.")
                     else:
                         print("No entity group selected. Cannot add entity.")
@@ -375,6 +416,10 @@ class MainInputOutput:
             block_input = dialog.get_data()
             if block_input:
                 block_names = [name.strip() for name in block_input.split(',')]
+                # Skip blocks that are already in the group
+                block_names = self.config_manager.new_group_items(self.selected_block_group, block_names)
+                if not block_names:
+                    return
                 for i in range(block_list_widget.count()):
                     if block_list_widget.item(i).text() == "Empty":
                         block_list_widget.takeItem(i)
@@ -387,7 +432,8 @@ class MainInputOutput:
                 # Ensure the selected block group is set
                 if self.selected_block_group:
                     # Prepare the items to be added to the group
-                    self.config_manager.add_items_to_group(self.selected_block_group, block_names)
+                    with self.config_manager.transaction():
+                        self.config_manager.add_items_to_group(self.selected_block_group, block_names)
                     print(f"Added blocks {', '.join(block_names)} to the '{self.selected_block_group}' block group.")
                 else:
                     print("No block group selected. Cannot add block.")
@@ -395,25 +441,81 @@ class MainInputOutput:
 
 
     def remove_selected(self, entity_list_widget, block_list_widget):
-        """Remove the selected entities or blocks."""
+        """Remove the selected entities or blocks and write the config once."""
+
+        if not self.config_manager:
+            return
 
-        for widget in (entity_list_widget, block_list_widget):
-            selected_items = widget.selectedItems()
+        with self.config_manager.transaction():
+            for widget in (entity_list_widget, block_list_widget):
+                selected_items = widget.selectedItems()
 
-            if widget == entity_list_widget:
-                group = self.selected_entity_group
-            elif widget == block_list_widget:
-                group = self.selected_block_group
+                if widget == entity_list_widget:
+                    group = self.selected_entity_group
+                elif widget == block_list_widget:
+                    group = self.selected_block_group
 
-            for item in selected_items:
-                widget.takeItem(widget.row(item))  
-                print(f"Removing {item.text()} from group {group}")
-                self.config_manager.remove_item_from_group(group, item.text()) 
+                if not selected_items:
+                    continue
 
+                for item in selected_items:
+                    widget.takeItem(widget.row(item))  
+                print(f"Removing {len(selected_items)} items from group {group}")
+                self.config_manager.remove_items_from_group(
+                    group, [item.text() for item in selected_items]
+                )
+
+
+
+    def on_import_group_items(self):
+        """Import 'group,material' rows from a text or CSV file into Groups."""
+        from ConfigPath import ConfigPath
+        if not self.config_manager or not self.config_manager.get_value('Groups'):
+            QMessageBox.warning(self.main_window, "Error", "No config loaded. Cannot import group items.")
+            return
 
+        file_path, _ = QFileDialog.getOpenFileName(
+            self.window,
+            "Import Group Items",
+            "",
+            "Text or CSV Files (*.txt *.csv);;All Files (*)",
+        )
+        if not file_path:
+            return
+
+        try:
+            # Rows without a group name go to the selected block group
+            summary = self.config_manager.import_group_items(file_path, default_group=self.selected_block_group)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            QMessageBox.critical(self.window, "Error", f"Could not import '{file_path}': {e}")
+            return
+        if summary is None:
+            return
+
+        # Refresh the lists of the selected groups in one batch each
+        entity_block_section = self.window.findChild(UI.EntityBlockSection)
+        if entity_block_section:
+            for group, list_widget in (
+                (self.selected_entity_group, entity_block_section.entity_list_widget),
+                (self.selected_block_group, entity_block_section.block_list_widget),
+            ):
+                if summary["added"].get(group):
+                    self.fill_list_widget(list_widget, self.config_manager.get_value(ConfigPath(("Groups", group)), default=[]))
+
+        message = (
+            f"Added {sum(summary['added'].values())} items to {len(summary['added'])} groups.\n"
+            f"Skipped {summary['duplicates']} items already in their group."
+        )
+        if summary["unknown_groups"]:
+            message += f"\nUnknown groups: {', '.join(summary['unknown_groups'])}"
+        if summary["skipped_rows"]:
+            message += f"\n{summary['skipped_rows']} rows had no group and were skipped."
+        QMessageBox.information(self.window, "Import Group Items", message)
 
     def on_Empty_Load(self):
         """Prompt the user for a file save location and create an empty configuration file."""
+        import Backend as backend
+        import ConfigCodec as codec
         file_path, _ = QFileDialog.getSaveFileName(
             self.window,
             "Create New Config File",
@@ -425,72 +527,21 @@ class MainInputOutput:
         if file_path:
             try:
                 # Default content for the new configuration
-                default_content = {
-                    "UseBlockDatabase": False,
-                    "CheckBlockDatabaseAtStartup": False,
-                    "BlockDurability": 100.0,
-                    "EnableMetrics": True,
-                    "Checktool": {
-                        "AlwaysEnabled": False,
-                        "EnabledByDefault": False,
-                        "PreventActionWhenCheckingHandledBlocks": True,
-                        "PreventActionWhenCheckingNonHandledBlocks": True,
-                        "SilentWhenCheckingOnDisabledWorlds": False,
-                        "SilentWhenCheckingWithoutPermissions": False,
-                        "SilentWhenCheckingNonHandledBlocks": False,
-                        "SilentWhenCheckingHandledBlocks": False,
-                        "ShowBossBar": False,
-                        "BossBarColor": "PURPLE",
-                        "BossBarStyle": "SOLID",
-                        "BossBarDuration": 30
-                    },
-                    "Groups": {},
-                    "VanillaEntity": {},
-                    "Locale": {
-                        "NotAllowed": "You are not allowed to perform this action!",
-                        "Usage": "Usage: %DESCRIPTION%",
-                        "OnlyPlayerAllowed": "Only players can perform this action!",
-                        "PlayerDoesntExist": "Player %NAME% doesn't exist in the server!",
-                        "PlayerIsOffline": "Player %NAME% must be online to perform that",
-                        "EnterChecktoolMode": "You can now right-click a block with %PRETTY_ITEM% to display block durability",
-                        "LeaveChecktoolMode": "You can no longer check for a block durability",
-                        "ChecktoolToggledOn": "Checktool mode toggled on for player %NAME%",
-                        "ChecktoolToggledOff": "Checktool mode toggled off for player %NAME%",
-                        "ChecktoolUse": "Block health: %DURABILITY_PERCENTAGE%% (%PRETTY_MATERIAL%)",
-                        "ChecktoolUseBossBar": "%PRETTY_MATERIAL%: %DURABILITY_PERCENTAGE%%",
-                        "ChecktoolSet": "Checktool successfully set to %PRETTY_ITEM%!",
-                        "ChecktoolNotPersisted": "Checktool item was set to %PRETTY_ITEM%, but it couldn't be persisted",
-                        "ChecktoolGiven": "A checktool (%PRETTY_ITEM%) was given to player %NAME%",
-                        "ChecktoolReset": "Checktool successfully reset to bare hand (Air)",
-                        "ChecktoolNotHandled": "%PRETTY_MATERIAL% is not handled by the current configuration",
-                        "ChecktoolInfo": "Current checktool item: %PRETTY_ITEM%",
-                        "ChecktoolAlwaysEnabled": "Checktool can't be toggled off",
-                        "DisabledInThisWorld": "This functionality is disabled in this world",
-                        "Reloaded": "Reloaded successfully!",
-                        "DebugEnabled": "Debug mode has been enabled",
-                        "DebugDisabled": "Debug mode has been disabled"
-                    },
-                    "LocalePrefix": "[ExplodeAny]",
-                    "DisabledWorlds": []
-                }
+                default_content = backend.default_config()
 
 
                 # Save the empty configuration to the specified path
-                with open(file_path, "w") as file:
-                    yaml.dump(default_content, file, default_flow_style=False)
+                codec.write_file(file_path, default_content)
 
                 # Store the file path and initialize the config manager
                 self.file_path = file_path
                 self.config_manager = backend.YAMLConfigManager()
                 self.config_manager.load_yaml(file_path)
+                self.watcher.watch(file_path)
                 
                 file_name = file_path.split("/")[-1]  # Get the file name from the path
                 self.window.setWindowTitle(f"YAMLConfigManager - ExplodeAny - {file_name}")
 
-                # Initialize mappings
-                self.entity_to_block = {}
-                self.block_to_entity = {}
-
                 # Update the UI to reflect the empty configuration
                 middle_section = self.window.findChild(UI.MiddleSection)
                 if middle_section:
@@ -508,8 +559,7 @@ class MainInputOutput:
                 if Right_Section_Instance:
                     config_editor_instance = Right_Section_Instance.get_config_editor()
                     if config_editor_instance:
-                        # Use the correct parameter name
-                        config_editor_instance.clear_layout(config_editor_instance.group_layout)
+                        config_editor_instance.clear_pages()
                         config_editor_instance.group_box.setTitle("New Config: Add Entity & Block Group Names")
 
 
@@ -549,16 +599,9 @@ class MainInputOutput:
                 # Reload the file using the same file path
                 self.config_manager.load_yaml(self.file_path)
 
-                # Reinitialize mappings (optional)
-                self.entity_to_block = {}
-                self.block_to_entity = {}
-
-                # Parse VanillaEntity section again
-                vanilla_entity = self.config_manager.get_value('VanillaEntity', default={})
-                groups = self.config_manager.get_value('Groups', default={})
-
                 # Only clear the lists if both Groups and VanillaEntity are empty
-                if not vanilla_entity and not groups:
+                data = self.config_manager.get_yaml_data() or {}
+                if not data.get('VanillaEntity') and not data.get('Groups'):
                     # Clear entity and block lists if both are empty
                     entity_block_section = self.window.findChild(UI.EntityBlockSection)
                     if entity_block_section:
@@ -566,43 +609,12 @@ class MainInputOutput:
                         block_list_widget = entity_block_section.block_list_widget
                         entity_list_widget.clear()
                         block_list_widget.clear()
-                        
 
-                # Handle VanillaEntity data mapping
-                if vanilla_entity:
-                    for entity_group, data in vanilla_entity.items():
-                        materials = data.get('Materials', {})
-                        for block_group in materials.keys():
-                            # Map entity to block and vice versa
-                            self.entity_to_block[entity_group] = block_group
-                            self.block_to_entity[block_group] = entity_group
-
-                # Reorder the groups based on entity_to_block
-                ordered_groups = {}
-
-                # First, populate the ordered_groups dictionary by following the order of self.entity_to_block
-                for entity_group, block_group in self.entity_to_block.items():
-                    # Ensure the block_group exists in groups
-                    if entity_group in groups:
-                        ordered_groups[entity_group] = groups[entity_group]
-
-                    # Ensure the block_group also gets added in the right order
-                    if block_group in groups and block_group not in ordered_groups:
-                        ordered_groups[block_group] = groups[block_group]
-
-                # Add any remaining groups that were not in entity_to_block
-                for group_key, group_data in groups.items():
-                    if group_key not in ordered_groups:
-                        ordered_groups[group_key] = group_data
-
-                # Repopulate Groups with the ordered groups
+                # Repopulate Groups in pairing order
                 middle_section = self.window.findChild(UI.MiddleSection)
                 if middle_section:
                     group_selector = middle_section.config_section.get_group_selector()
-                    if ordered_groups:  # Only populate if ordered groups are not empty
-                        group_selector.populate_groups(ordered_groups, self.block_to_entity)
-                    else:
-                        print("No groups found in the YAML file.")
+                    self.populate_group_selector(group_selector)
 
             except Exception as e:
                 QMessageBox.critical(self.window, "Error", f"An error occurred while reloading the YAML file: {e}")
@@ -610,6 +622,195 @@ class MainInputOutput:
         else:
             QMessageBox.warning(self.window, "File Error", "No YAML file loaded to reload.")
 
+    def populate_group_selector(self, group_selector):
+        """
+        Fill the group selector from the backend's pairing index: each entity
+        group followed by its block groups, then the unpaired groups.
+        Returns the group names in display order.
+        """
+        pairs = self.config_manager.group_pairs()
+        ordered_groups = pairs.ordered_groups()
+        if ordered_groups:  # Only populate if ordered groups are not empty
+            group_selector.populate_groups(ordered_groups, pairs.block_to_entity)
+        else:
+            print("No groups found in the YAML file.")
+        return ordered_groups
+
+    def on_config_changed(self, file_path):
+        """
+        Merge the changes another program made to the open config and patch
+        the parts of the UI they affect.
+        """
+        if not self.config_manager or self._loader is not None:
+            return
+        changes = self.config_manager.reload_from_disk()
+        if changes is None:
+            # One of our own saves is still being written
+            self.watcher.retry()
+            return
+        if not changes:
+            return
+
+        print(f"{file_path} changed on disk ({len(changes)} changes).")
+        self.apply_external_changes(changes)
+        self.window.statusBar().showMessage(
+            f"Reloaded changes made to {os.path.basename(file_path)} on disk.", 5000
+        )
+
+    def apply_external_changes(self, changes):
+        """
+        Patch the group tiles, the entity/block lists and the editor page for
+        the given ConfigDiff changes. Only the tiles and lists that differ
+        are touched; nothing is rebuilt from scratch.
+        """
+        from ConfigPath import ConfigPath
+        middle_section = self.window.findChild(UI.MiddleSection)
+        if middle_section:
+            group_selector = middle_section.config_section.get_group_selector()
+            pairs = self.config_manager.group_pairs()
+            group_selector.update_groups(pairs.ordered_groups(), pairs.block_to_entity)
+
+        entity_block_section = self.window.findChild(UI.EntityBlockSection)
+        if entity_block_section:
+            for kind, list_widget, tab_widget in (
+                ("Entity", entity_block_section.entity_list_widget, entity_block_section.entity_tab_widget),
+                ("Block", entity_block_section.block_list_widget, entity_block_section.block_tab_widget),
+            ):
+                group = self.selected_entity_group if kind == "Entity" else self.selected_block_group
+                if group is None or not any(change.touches(("Groups", group)) for change in changes):
+                    continue
+                items = self.config_manager.get_value(ConfigPath(("Groups", group)))
+                if items is None:
+                    # The group was deleted on disk
+                    list_widget.clear()
+                    entity_block_section.update_tab_title(tab_widget, 0, f"{kind} Group")
+                    if kind == "Entity":
+                        self.selected_entity_group = None
+                    else:
+                        self.selected_block_group = None
+                else:
+                    self.fill_list_widget(list_widget, items)
+
+        Right_Section_Instance = self._get_right_section_instance()
+        if Right_Section_Instance and Right_Section_Instance.config_editor:
+            Right_Section_Instance.config_editor.apply_external_changes(changes)
+
+    def open_file(self, file_path, preloaded=None):
+        """
+        Open a config in a single pass: parse it once, build the pairing
+        index, fill the group selector and select the first two groups.
+        The editor page is only built for the last of them.
+
+        preloaded is the (data, group_pairs) result of a LoadWorker; the
+        file is then already parsed and only needs to be shown.
+        """
+        import Backend as backend
+        # Store the file path to use later for reloading
+        self.file_path = file_path
+
+        # Create an instance of the YAMLConfigManager if not already initialized
+        if not self.config_manager:
+            self.config_manager = backend.YAMLConfigManager()
+
+        # Load the YAML file (the only parse of this open)
+        self.config_manager.load_yaml(file_path, preloaded)
+        self.watcher.watch(file_path)
+        # Update the window title with the file path
+        file_name = file_path.split("/")[-1]  # Get the file name from the path
+        self.window.setWindowTitle(f"YAMLConfigManager - ExplodeAny - {file_name}")
+
+        # Populate the group list in pairing order
+        middle_section = self.window.findChild(UI.MiddleSection)
+        if not middle_section:
+            return
+        group_selector = middle_section.config_section.get_group_selector()
+        if not group_selector:
+            print("No group selector found, skipping group population.")
+            return
+        ordered_groups = self.populate_group_selector(group_selector)
+
+        # Clear any previous block group entry
+        middle_section.config_section.block_group_entry.clear()
+
+        # Manually trigger the group selection for the first two items if available
+        if len(ordered_groups) >= 2:
+            item1 = group_selector.group_list.item(0)  # First item
+            item2 = group_selector.group_list.item(1)  # Second item
+
+            # Ensure the items are valid before selecting
+            if item1:
+                self.handle_group_selection(item1, group_selector, show_editor=False)
+            if item2:
+                self.handle_group_selection(item2, group_selector)
+
+    def open_file_async(self, file_path):
+        """
+        Parse and index a config on the thread pool, showing a progress
+        dialog that can cancel it, and open it once it is ready. A load that
+        is still running is cancelled first and its result is ignored.
+        """
+        from LoadWorker import LoadWorker
+        self.cancel_load()
+
+        # Keep pending edits before the cached document can be replaced.
+        if self.config_manager:
+            self.config_manager.save()
+
+        loader = self._loader = LoadWorker(file_path)
+        progress = self._load_progress = QProgressDialog(
+            f"Loading {os.path.basename(file_path)}...", "Cancel", 0, 100, self.window
+        )
+        progress.setWindowTitle("Loading Configuration")
+        progress.setMinimumDuration(300)  # Small files open without a flash
+        progress.setAutoClose(False)
+        progress.canceled.connect(loader.cancel)
+
+        loader.signals.progress.connect(progress.setValue)
+        loader.signals.progress.connect(
+            lambda percent, message: progress.setLabelText(message)
+        )
+        loader.signals.loaded.connect(
+            lambda path, data, group_pairs: self._on_file_loaded(loader, path, data, group_pairs)
+        )
+        loader.signals.failed.connect(
+            lambda path, message: self._on_load_failed(loader, path, message)
+        )
+        loader.signals.cancelled.connect(lambda path: self._finish_load(loader))
+        QThreadPool.globalInstance().start(loader)
+
+    def cancel_load(self):
+        """Cancel the background load in progress, if any."""
+        if self._loader is not None:
+            self._loader.cancel()
+            self._finish_load(self._loader)
+
+    def _finish_load(self, loader):
+        """Forget loader and close its progress dialog, unless a newer load replaced it."""
+        if loader is not self._loader:
+            return
+        self._loader = None
+        if self._load_progress is not None:
+            self._load_progress.close()
+            self._load_progress.deleteLater()
+            self._load_progress = None
+
+    def _on_file_loaded(self, loader, file_path, data, group_pairs):
+        """Show a config parsed by a LoadWorker, unless the load went stale."""
+        if loader is not self._loader or loader.is_cancelled():
+            return
+        self._finish_load(loader)
+        try:
+            self.open_file(file_path, (data, group_pairs))
+        except Exception as e:
+            QMessageBox.critical(self.window, "Error", f"An unexpected error occurred: {e}")
+            print(f"Error loading YAML: {e}")
+
+    def _on_load_failed(self, loader, file_path, message):
+        if loader is not self._loader:
+            return
+        self._finish_load(loader)
+        QMessageBox.critical(self.window, "YAML Error", f"Error loading {file_path}: {message}")
+
     def on_load_yaml(self):
         """Open file dialog to load a YAML file and populate groups using YAMLConfigManager."""
         # Open file dialog to select a YAML file
@@ -619,97 +820,9 @@ class MainInputOutput:
         )
 
         if file_path:
+            # Parse errors are reported by the LoadWorker (see _on_load_failed).
             try:
-                # Store the file path to use later for reloading
-                self.file_path = file_path  # Store the path in an instance attribute
-
-                # Create an instance of the YAMLConfigManager and assign it to self.config_manager if not already initialized
-                if not self.config_manager:
-                    self.config_manager = backend.YAMLConfigManager()
-
-                # Load the YAML file
-                self.config_manager.load_yaml(file_path)
-                # Update the window title with the file path
-                file_name = file_path.split("/")[-1]  # Get the file name from the path
-                self.window.setWindowTitle(f"YAMLConfigManager - ExplodeAny - {file_name}")
-
-
-                # Initialize mappings
-                self.entity_to_block = {}
-                self.block_to_entity = {}
-
-                # Load sections and use empty dictionaries as defaults
-                vanilla_entity = self.config_manager.get_value("VanillaEntity", default={})
-                groups = self.config_manager.get_value("Groups", default={})
-
-                # Parse VanillaEntity section
-                if vanilla_entity:
-                    for entity_group, data in vanilla_entity.items():
-                        materials = data.get("Materials", {})
-                        for block_group in materials.keys():
-                            # Map entity to block and vice versa
-                            self.entity_to_block[entity_group] = block_group
-                            self.block_to_entity[block_group] = entity_group
-
-                # Reorder the groups based on entity_to_block
-                ordered_groups = {}
-
-                # First, populate the ordered_groups dictionary by following the order of self.entity_to_block
-                for entity_group, block_group in self.entity_to_block.items():
-                    # Ensure the entity_group and block_group exist in groups
-                    if entity_group in groups:
-                        ordered_groups[entity_group] = groups[entity_group]
-                    if block_group in groups and block_group not in ordered_groups:
-                        ordered_groups[block_group] = groups[block_group]
-
-                # Add any remaining groups that were not in entity_to_block
-                for group_key, group_data in groups.items():
-                    if group_key not in ordered_groups:
-                        ordered_groups[group_key] = group_data
-
-                # Now, populate the group list in the correct order
-                middle_section = self.window.findChild(UI.MiddleSection)
-                if middle_section:
-                    group_selector = middle_section.config_section.get_group_selector()
-                    if group_selector:
-                        # Clear the existing group list before repopulating
-                        group_selector.group_list.clear()
-
-                        # Repopulate the group list with new groups from ordered_groups
-                        for group_name in ordered_groups.keys():
-                            # Create a new QListWidgetItem for each group
-                            item = QListWidgetItem(group_name)
-                            # Add the styled item to the group list
-                            group_selector.group_list.addItem(item)
-
-                        # Force the widget to redraw (optional)
-                        group_selector.group_list.update()
-
-                        # Clear any previous block group entry
-                        middle_section.config_section.block_group_entry.clear()
-
-                        # Manually trigger the group selection for the first two items if available
-                        if len(ordered_groups) >= 2:
-                            # Get the first two items from ordered_groups
-                            item1 = group_selector.group_list.item(0)  # First item
-                            item2 = group_selector.group_list.item(1)  # Second item
-
-                            # Ensure the items are valid before selecting
-                            if item1:
-                                self.handle_group_selection(item1, group_selector)
-                            if item2:
-                                self.handle_group_selection(item2, group_selector)
-
-                        # Reload the YAML after populating groups
-                        self.reload_yaml()  # This will reload the same file you previously loaded
-                    else:
-                        print("No group selector found, skipping group population.")
-
-            except yaml.YAMLError as e:
-                # Handle YAML parsing errors (if the file is malformed)
-                QMessageBox.critical(self.window, "YAML Error", f"Error parsing YAML file: {e}")
-                print(f"Error parsing YAML file: {e}")
-
+                self.open_file_async(file_path)
             except Exception as e:
                 # Handle any other unexpected errors
                 QMessageBox.critical(self.window, "Error", f"An unexpected error occurred: {e}")
@@ -728,7 +841,40 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def main():
+class StartupTimer:
+    """
+    Records how long each phase of startup took, from the first line of this
+    module to the window being shown. Set EXPLODEANY_STARTUP_REPORT=1 to
+    print the phases once the event loop is running.
+    """
+
+    def __init__(self, started):
+        self.started = started
+        self.phases = []
+        self._last = started
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def elapsed(self):
+        return self._last - self.started
+
+    def report(self):
+        print("Startup time by phase:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<16} {seconds * 1000:7.1f} ms")
+        print(f"  {'total':<16} {self.elapsed() * 1000:7.1f} ms")
+
+
+def start(argv=None):
+    """
+    Create the application and show the main window without entering the
+    event loop. Returns (app, window, io_handler, timer).
+    """
+    timer = StartupTimer(_STARTED)
+    timer.mark("imports")
 
     # Check if the splash screen is needed (for bundled apps)
     if '_PYI_SPLASH_IPC' in os.environ and importlib.util.find_spec("pyi_splash"):
@@ -737,25 +883,29 @@ def main():
         pyi_splash.close()
         
     # Initialize the application
-    app = QApplication(sys.argv)
-    #app.setStyleSheet("QWidget { background-color: lightblue; }")
+    app = QApplication(sys.argv if argv is None else argv)
+    Theme.apply(app)
+    timer.mark("application")
     # Create the main window
     icon_path = resource_path("Icons/service-logo.png")
     window = UI.MainWindow()
     window.setWindowTitle("YAMLConfigManager - ExplodeAny")
-    window.setStyleSheet("QMainWindow { background-color: lightgrey; }")
     window.setWindowIcon(QIcon(icon_path))
-    
-
-
-
+    timer.mark("window")
 
     # Create an instance of MainInputOutput to handle input/output logic
     io_handler = MainInputOutput(window)
+    timer.mark("handlers")
 
     window.show()
-    
-    
+    timer.mark("shown")
+    return app, window, io_handler, timer
+
+
+def main():
+    app, window, io_handler, timer = start()
+    if os.environ.get("EXPLODEANY_STARTUP_REPORT"):
+        QTimer.singleShot(0, lambda: (timer.mark("first event"), timer.report()))
 
     # Run the application
     sys.exit(app.exec())
@@ -0,0 +1,109 @@
+import os
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QThread, pyqtSignal
+
+from DocumentCache import DocumentCache
+
+
+class SaveWorker(QThread):
+    """
+    Writer thread that saves configs without blocking the GUI.
+
+    request_save() only queues the document. The thread then takes a
+    snapshot through DocumentCache.snapshot(), which holds the document lock
+    for a short time, and serializes and writes it without the lock.
+    Requests for a file that is already queued are coalesced, so a burst of
+    saves writes the latest state once.
+
+    saved(file_path, bytes_written) and failed(file_path, message) are
+    delivered on the GUI thread. Pending saves are finished before the
+    application quits.
+    """
+
+    saved = pyqtSignal(str, int)
+    failed = pyqtSignal(str, str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """
+        Returns the shared SaveWorker, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(cls._instance.stop)
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._busy = False
+        self._stopping = False
+
+    def request_save(self, file_path, data):
+        """
+        Queue data to be written to file_path. Replaces a queued request for
+        the same file that has not been started yet.
+        """
+        with self._condition:
+            self._pending[os.path.abspath(file_path)] = data
+            self._stopping = False
+            self._condition.notify()
+        if not self.isRunning():
+            self.start()
+
+    def is_saving(self):
+        """
+        Returns True while saves are queued or being written.
+        """
+        with self._condition:
+            return bool(self._pending) or self._busy
+
+    def wait_until_idle(self):
+        """
+        Block until every queued save has been written.
+        """
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+
+    def stop(self):
+        """
+        Finish the queued saves and end the thread.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                file_path = next(iter(self._pending))
+                data = self._pending.pop(file_path)
+                self._busy = True
+
+            try:
+                cache = DocumentCache()
+                written = cache.write_snapshot(cache.snapshot(file_path, data))
+                if written:
+                    print(f"Saved {file_path} ({written} bytes) in the background.")
+                else:
+                    print(f"{file_path} is unchanged; nothing was written.")
+                self.saved.emit(file_path, written)
+            except Exception as e:
+                print(f"Error saving {file_path}: {e}")
+                self.failed.emit(file_path, str(e))
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
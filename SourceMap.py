@@ -0,0 +1,281 @@
+import ConfigCodec as codec
+
+
+class SourceMap:
+    """
+    Remembers where every mapping entry of a parsed config lives in the
+    original text, so a save can re-emit only the subtrees that changed and
+    splice them into the untouched text around them. Comments, key order and
+    formatting outside the changed subtrees are preserved.
+
+    Edits are kept as overlays on the original text (a small piece table), so
+    offsets recorded at parse time stay valid across any number of saves.
+
+    Entries are indexed by path tuple:
+        entries[path]  = (key_start, value_start, value_end, inline_scalar)
+        mappings[path] = (flow_style, key_column, last_child_path)
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.newline = "\r\n" if text.find("\r\n") != -1 else "\n"
+        self.entries = {}
+        self.mappings = {}
+        self._overlays = {}
+        self._inserts = {}
+
+    @classmethod
+    def parse(cls, raw, fast=True):
+        """
+        Parse raw config bytes. Returns (data, source_map); source_map is None
+        when the text cannot be mapped reliably. fast=False uses the
+        pure-Python loader instead of libyaml (see ConfigCodec.load).
+        """
+        text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        if text.startswith("\ufeff"):
+            return codec.load(raw, fast), None
+
+        data, node = codec.load_node(text, fast)
+        if not isinstance(node, codec.MappingNode) or not isinstance(data, dict):
+            return data, None
+
+        source_map = cls(text)
+        source_map.index(node, data, ())
+        return data, source_map
+
+    def index(self, node, data, path, offset=0):
+        """
+        Record the spans of a mapping node and everything below it. offset is
+        added to all marks when the node was parsed from a slice of the text
+        that starts at that index (see LazyLoader).
+        """
+        pairs = node.value
+        # Duplicate keys and merge keys ('<<') break the one-to-one relation
+        # between nodes and keys; such mappings are only ever re-emitted whole.
+        if len(pairs) != len(data) or not pairs:
+            return
+        previous = -1
+        for key_node, value_node in pairs:
+            key_start = key_node.start_mark.index
+            if key_start <= previous or value_node.start_mark.index < key_start:
+                return
+            previous = key_start
+
+        text = self.text
+        child_path = path
+        for (key_node, value_node), key in zip(pairs, data):
+            child_path = path + (key,)
+            value_start = value_node.start_mark.index + offset
+            value_end = value_node.end_mark.index + offset
+            # Plain scalars have style None from the pure-Python loader and
+            # "" from libyaml.
+            inline_scalar = (
+                isinstance(value_node, codec.ScalarNode)
+                and value_node.style in (None, "", "'", '"')
+                and text.find("\n", value_start, value_end) == -1
+            )
+            self.entries[child_path] = (
+                key_node.start_mark.index + offset,
+                value_start,
+                value_end,
+                inline_scalar,
+            )
+            value = data[key]
+            if isinstance(value_node, codec.MappingNode) and isinstance(value, dict):
+                self.index(value_node, value, child_path, offset)
+
+        self.mappings[path] = (
+            node.flow_style,
+            pairs[0][0].start_mark.column,
+            child_path,
+        )
+
+    def splice(self, data, changed_paths):
+        """
+        Apply the changed paths of data as overlays and return the new text,
+        or None when a full dump is required instead.
+        """
+        for path in changed_paths:
+            if not self._apply_change(data, tuple(path)):
+                return None
+        return self.render()
+
+    def render(self):
+        """
+        Build the current text from the original text and all overlays.
+        """
+        pieces = [
+            (start, end, -depth, replacement)
+            for start, end, depth, replacement, _ in self._overlays.values()
+        ]
+        pieces.extend(
+            (position, position, -len(path), replacement)
+            for path, (position, replacement) in self._inserts.items()
+            if replacement
+        )
+        pieces.sort(key=lambda piece: piece[:3])
+
+        output = []
+        position = 0
+        for start, end, _, replacement in pieces:
+            if start < position:
+                return None
+            output.append(self.text[position:start])
+            output.append(replacement)
+            position = end
+        output.append(self.text[position:])
+        return "".join(output)
+
+    def _apply_change(self, data, path):
+        covering = self._covering_entry(path)
+        if covering is not None:
+            return self._replace_entry(data, covering)
+
+        while path:
+            if path in self.entries:
+                found, _ = _lookup(data, path)
+                if found:
+                    if self._replace_scalar(data, path) or self._replace_entry(
+                        data, path
+                    ):
+                        return True
+                elif self._delete_entry(data, path):
+                    return True
+            elif path[:-1] in self.mappings and self._rebuild_inserts(
+                data, path[:-1]
+            ):
+                return True
+            path = path[:-1]
+        # The root mapping itself changed shape.
+        return False
+
+    def _covering_entry(self, path):
+        for length in range(1, len(path) + 1):
+            overlay = self._overlays.get(path[:length])
+            if overlay is not None and overlay[4]:
+                return path[:length]
+        return None
+
+    def _replace_scalar(self, data, path):
+        _, value_start, value_end, inline_scalar = self.entries[path]
+        if not inline_scalar:
+            return False
+        _, value = _lookup(data, path)
+        replacement = _emit_scalar(value)
+        if replacement is None:
+            return False
+        self._overlays[path] = (value_start, value_end, len(path), replacement, False)
+        return True
+
+    def _replace_entry(self, data, path):
+        region = self._entry_region(path)
+        if region is None:
+            return False
+        found, value = _lookup(data, path)
+        if not found:
+            return self._delete_entry(data, path)
+        start, end, column = region
+        replacement = self._emit_entry(path[-1], value, column)
+        self._set_entry_overlay(path, start, end, replacement)
+        return True
+
+    def _delete_entry(self, data, path):
+        found, parent = _lookup(data, path[:-1])
+        if not found or not isinstance(parent, dict) or not parent:
+            return False
+        region = self._entry_region(path)
+        if region is None:
+            return False
+        start, end, _ = region
+        self._set_entry_overlay(path, start, end, "")
+        return True
+
+    def _rebuild_inserts(self, data, mapping_path):
+        flow_style, column, last_child = self.mappings[mapping_path]
+        found, mapping = _lookup(data, mapping_path)
+        if flow_style or not found or not isinstance(mapping, dict) or not mapping:
+            # An emptied mapping is re-emitted whole as '{}' by its parent.
+            return False
+        key_start, _, value_end, _ = self.entries[last_child]
+        position = self._region_end(self._line_start(key_start), value_end)
+        replacement = "".join(
+            self._emit_entry(key, value, column)
+            for key, value in mapping.items()
+            if mapping_path + (key,) not in self.entries
+        )
+        self._inserts[mapping_path] = (position, replacement)
+        return True
+
+    def _set_entry_overlay(self, path, start, end, replacement):
+        depth = len(path)
+        for stale in [p for p in self._overlays if p[:depth] == path]:
+            del self._overlays[stale]
+        for stale in [p for p in self._inserts if p[:depth] == path]:
+            del self._inserts[stale]
+        self._overlays[path] = (start, end, depth, replacement, True)
+
+    def _entry_region(self, path):
+        """
+        Returns (start, end, column) of the whole lines holding an entry, or
+        None if the entry cannot be cut out on line boundaries.
+        """
+        flow_style, _, _ = self.mappings.get(path[:-1], (True, None, None))
+        if flow_style:
+            return None
+        key_start, _, value_end, _ = self.entries[path]
+        start = self._line_start(key_start)
+        if self.text[start:key_start].strip():
+            # e.g. the first key of a mapping inside a sequence ("- key: ...")
+            return None
+        return start, self._region_end(start, value_end), key_start - start
+
+    def _line_start(self, index):
+        return self.text.rfind("\n", 0, index) + 1
+
+    def _region_end(self, floor, value_end):
+        text = self.text
+        line_start = self._line_start(value_end)
+        if text[line_start:value_end].strip():
+            end = text.find("\n", value_end)
+            end = len(text) if end == -1 else end + 1
+        else:
+            end = line_start
+        # Leave trailing blank lines and comments outside of the region.
+        while end > floor:
+            previous = self._line_start(end - 1)
+            line = text[previous:end].strip()
+            if line and not line.startswith("#"):
+                break
+            end = previous
+        return end
+
+    def _emit_entry(self, key, value, column):
+        padding = " " * column
+        lines = codec.dump({key: value}).splitlines()
+        return "".join(
+            (padding + line if line else line) + self.newline for line in lines
+        )
+
+
+def _emit_scalar(value):
+    """
+    Emit a scalar exactly as the full writer would, or None if it does not
+    fit on a single line.
+    """
+    if isinstance(value, (dict, list)):
+        return None
+    text = codec.dump(value)
+    if text.endswith("\n...\n"):
+        text = text[:-5]
+    text = text.rstrip("\n")
+    if "\n" in text:
+        return None
+    return text
+
+
+def _lookup(data, path):
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return False, None
+        data = data[key]
+    return True, data
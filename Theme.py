@@ -0,0 +1,152 @@
+"""
+The editor's look, as one application stylesheet applied at startup.
+
+Widgets are matched by object name (the sections and their fixed controls)
+or by their "role" property (the fields the property editor builds), so
+creating a widget never parses a stylesheet of its own. Rules for a
+section and everything in it ("#name, #name *") come before the rules of
+the widgets inside it, so the inner rule wins, as a stylesheet set on the
+inner widget would.
+"""
+
+STYLESHEET = """
+QMainWindow {
+    background-color: lightgrey;
+}
+
+/* Middle section: group entry, group tiles, entity and block lists */
+#middleSection, #middleSection * {
+    background-color: lightgray;
+    border: 1px solid black;
+}
+#configSection, #configSection *,
+#entityBlockSection, #entityBlockSection * {
+    background-color: lightblue;
+    border: 1px solid black;
+}
+#entityFrame, #entityFrame *,
+#blockFrame, #blockFrame * {
+    border: 1px solid black;
+}
+#groupSelectorFrame, #groupSelectorFrame * {
+    border: 1px solid black;
+    border-radius: 5px;
+}
+
+QLabel#entityGroupLabel, QLabel#blockGroupLabel {
+    font-size: 16px;
+    font-weight: bold;
+    color: #333;
+    margin-bottom: 5px;
+}
+QLineEdit#entityGroupEntry, QLineEdit#blockGroupEntry {
+    padding: 5px;
+    border-radius: 4px;
+    border: 1px solid #ccc;
+    background-color: #fff;
+    font-size: 14px;
+}
+QLineEdit#entityGroupEntry[highlighted="true"], QLineEdit#blockGroupEntry[highlighted="true"] {
+    background-color: lightyellow;
+}
+QCheckBox#entityParticlesCheckbox, QCheckBox#entitySoundsCheckbox,
+QCheckBox#blockParticlesCheckbox, QCheckBox#blockSoundsCheckbox {
+    border: none;
+    font-size: 14px;
+    color: #333;
+}
+QCheckBox#entityParticlesCheckbox, QCheckBox#entitySoundsCheckbox {
+    margin-right: 15px;
+}
+QPushButton#addGroupButton {
+    font-size: 16px;
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    border-radius: 5px;
+}
+QLabel#groupKeyLabel {
+    font-size: 14px;
+    font-weight: bold;
+    color: #444;
+    margin-bottom: 5px;
+}
+
+/* Right section: property editor and save button */
+QPushButton#saveButton {
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 5px;
+    padding: 10px;
+    font-size: 14px;
+}
+QPushButton#saveButton:hover {
+    background-color: #45a049;
+}
+QGroupBox#editorGroupBox, QGroupBox#editorGroupBox QGroupBox {
+    font-family: 'Arial', sans-serif;
+    font-size: 16px;
+    color: #333;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding: 5px;
+}
+QGroupBox#editorGroupBox::title, QGroupBox#editorGroupBox QGroupBox::title {
+    subcontrol-origin: margin;
+    subcontrol-position: top center;
+    padding-left: 10px;
+}
+QLabel[role="fieldLabel"] {
+    padding: 4px;
+    font-size: 14px;
+    border: 2px solid #000000;
+    background-color: #ADD8E6;
+    border-radius: 8px;
+    margin: 0px;
+    color: black;
+    text-align: center;
+}
+QLineEdit[role="field"] {
+    padding: 4px;
+    font-size: 14px;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+}
+QLineEdit[role="field"]:focus {
+    border-color: #4CAF50;
+}
+QLineEdit[role="boolField"] {
+    padding: 4px;
+    font-size: 14px;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+    background-color: #f0f0f0;
+}
+QTreeView[role="propertyTree"] {
+    font-size: 14px;
+}
+QToolTip {
+    background-color: #333;
+    color: white;
+    border: 1px solid #888;
+    border-radius: 3px;
+}
+"""
+
+
+def apply(app):
+    """
+    Style the whole application. Call once, before the first window is shown.
+    """
+    app.setStyleSheet(STYLESHEET)
+
+
+def repolish(widget):
+    """
+    Restyle widget after one of the properties the stylesheet matches on
+    changed.
+    """
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
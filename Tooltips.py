@@ -0,0 +1,187 @@
+"""
+Help texts shown when hovering over a property in the editor, keyed by
+property name. Imported when the first property page is built, not at
+startup.
+"""
+
+TOOLTIPS = {
+    "ExplosionRadius": (
+        "Overrides the original explosion radius.\n\n"
+        "- **Default**: 0.0 (keeps original radius).\n"
+        "- **Range**: [0.0, ∞)\n"
+        "- **>0.0**: Custom explosion radius."
+    ),
+    "ExplosionFactor": (
+        "Multiplies the original explosion radius.\n\n"
+        "- **Default**: 1.0 (keeps original radius).\n"
+        "- **0.0**: Nullifies the explosion.\n"
+        "- **>1.0**: Magnifies the explosion radius."
+    ),
+    "ReplaceOriginalExplosion": (
+        "Determines whether the original explosion is replaced with a custom one.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: Replaces the original explosion (some properties may be lost).\n"
+        "- **False**: Only affects ExplodeAny calculations."
+    ),
+    "UnderwaterExplosionFactor": (
+        "Adjusts the explosion radius underwater.\n\n"
+        "- **Default**: 0.5 (reduces radius to half).\n"
+        "- **Range**: [0.0, ∞)\n"
+        "- **1.0**: No change underwater.\n"
+        "- **>1.0**: Magnifies the underwater radius."
+    ),
+    "ExplosionDamageBlocksUnderwater": (
+        "Determines whether explosions damage unmanaged vanilla blocks underwater.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: Custom explosion damages blocks like stone and dirt."
+    ),
+    "ReplaceOriginalExplosionWhenUnderwater": (
+        "Specifies whether the original explosion is replaced when underwater.\n\n"
+        "- **Default**: true.\n"
+        "- **True**: Replaces the explosion with a custom one.\n"
+        "- **False**: Both original and custom explosions occur."
+    ),
+    "ExplosionRemoveWaterloggedStateFromNearbyBlocks": (
+        "Allows explosions to remove the waterlogged state from nearby blocks.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: Waterlogged blocks lose their waterlogged state."
+    ),
+    "ExplosionRemoveWaterloggedStateFromNearbyBlocksOnSurface": (
+        "Applies ExplosionRemoveWaterloggedStateFromNearbyBlocks on surface explosions.\n\n"
+        "- **Default**: true."
+    ),
+    "ExplosionRemoveWaterloggedStateFromNearbyBlocksUnderwater": (
+        "Applies ExplosionRemoveWaterloggedStateFromNearbyBlocks to underwater explosions.\n\n"
+        "- **Default**: true."
+    ),
+    "ExplosionRemoveNearbyWaterloggedBlocks": (
+        "Removes nearby waterlogged blocks before the explosion.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: Prioritizes this over waterlogged state removal."
+    ),
+    "ExplosionRemoveNearbyLiquids": (
+        "Allows explosions to remove nearby liquids before detonating.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: Liquids in the explosion area are removed."
+    ),
+    "PackDroppedItems": (
+        "Packs dropped items into a single entity to reduce lag.\n\n"
+        "- **Default**: false.\n"
+        "- **True**: All dropped items spawn as one entity."
+    ),
+    "Particles": (
+        "Specifies particle effects during explosions.\n\n"
+        "- **Name**: Particle type (see Spigot Particle documentation).\n"
+        "- **DeltaX/Y/Z**: Size of the particle cube.\n"
+        "- **Amount**: Number of particles (higher values may reduce performance).\n"
+        "- **Speed**: Particle speed (must be ≥0).\n"
+        "- **Force**: Ensures particles are visible up to 256 blocks away.\n"
+        "- **Color**: Applies only to REDSTONE particles.\n"
+        "- **Size**: Particle size (applies to REDSTONE particles)."
+    ),
+    "Sound": (
+        "Specifies sound effects during explosions.\n\n"
+        "- **Name**: Sound type (see Spigot Sound documentation).\n"
+        "- **Volume**: Adjusts sound radius.\n"
+        "- **Pitch**: Speed of sound playback (range: 0.5–2.0)."
+    ),
+    "Damage": (
+        "Base damage used to calculate effective block damage.\n\n"
+        "- **Default**: Equal to BlockDurability.\n"
+        "- **Range**: [0.0, ∞)\n"
+        "- **0.0**: Block is unaffected by the explosion."
+    ),
+    "DropChance": (
+        "Chance of a block dropping items naturally when broken.\n\n"
+        "- **Default**: 0.0 (blocks never drop items).\n"
+        "- **Range**: [0.0, 100.0]\n"
+        "- **100.0**: Blocks always drop items."
+    ),
+    "DistanceAttenuationFactor": (
+        "Controls how damage decreases with distance from the explosion.\n\n"
+        "- **Default**: 0.0 (all blocks in range take equal damage).\n"
+        "- **Range**: [0.0, 1.0]\n"
+        "- **1.0**: Damage decreases linearly with distance."
+    ),
+    "UnderwaterDamageFactor": (
+        "Adjusts damage taken by blocks underwater.\n\n"
+        "- **Default**: 0.5 (halves underwater damage).\n"
+        "- **Range**: [0.0, ∞)\n"
+        "- **1.0**: Water has no effect.\n"
+        "- **>1.0**: Magnifies underwater damage."
+    ),
+    "FancyUnderwaterDetection": (
+        "Enables detailed water detection for underwater damage.\n\n"
+        "- **Default**: false (checks water only at the explosion center).\n"
+        "- **True**: Traces rays to detect water for each block."
+    ),
+    "Name": (
+        "Specifies the name of the particles to be spawned during the explosion.\n\n"
+        "- **Valid values**: Refer to Spigot Particle documentation for available types.\n"
+        "- **Default**: REDSTONE."
+    ),
+    "DeltaX": (
+        "Defines the size of the cube containing the particles along the X-axis.\n\n"
+        "- **Default**: 2.0\n"
+        "- **Higher values**: Larger spread of particles."
+    ),
+    "DeltaY": (
+        "Defines the size of the cube containing the particles along the Y-axis.\n\n"
+        "- **Default**: 2.0\n"
+        "- **Higher values**: Larger spread of particles."
+    ),
+    "DeltaZ": (
+        "Defines the size of the cube containing the particles along the Z-axis.\n\n"
+        "- **Default**: 2.0\n"
+        "- **Higher values**: Larger spread of particles."
+    ),
+    "Amount": (
+        "Sets the number of particles to be spawned.\n\n"
+        "- **Default**: 2000\n"
+        "- **Caution**: Large values can cause performance issues like FPS drops."
+    ),
+    "Speed": (
+        "Defines the speed of the particles.\n\n"
+        "- **Default**: 1.0\n"
+        "- **Higher values**: Faster particles."
+    ),
+    "Force": (
+        "If true, the particles can be seen up to 256 blocks away.\n\n"
+        "- **Default**: true."
+    ),
+    "Red": (
+        "Sets the red component of the particle color.\n\n"
+        "- **Default**: 255\n"
+        "- **Valid range**: [0, 255]."
+    ),
+    "Blue": (
+        "Sets the blue component of the particle color.\n\n"
+        "- **Default**: 0\n"
+        "- **Valid range**: [0, 255]."
+    ),
+    "Green": (
+        "Sets the green component of the particle color.\n\n"
+        "- **Default**: 255\n"
+        "- **Valid range**: [0, 255]."
+    ),
+    "Size": (
+        "Defines the size of the particles (only for REDSTONE particles).\n\n"
+        "- **Default**: 2.0\n"
+        "- **Higher values**: Larger particles."
+    ),
+    "Sound_Name": (
+        "Specifies the sound to be played when the entity explodes.\n\n"
+        "- **Valid values**: Refer to Spigot Sound documentation for available sounds.\n"
+        "- **Default**: ENTITY_OCELOT_HURT."
+    ),
+    "Sound_Volume": (
+        "Sets the volume of the explosion sound.\n\n"
+        "- **Default**: 1.0\n"
+        "- **Range**: [0.0, ∞). Higher values allow the sound to be heard from farther away."
+    ),
+    "Sound_Pitch": (
+        "Defines the pitch (speed) of the explosion sound.\n\n"
+        "- **Default**: 1.0\n"
+        "- **Range**: [0.5, 2.0]."
+    ),
+}
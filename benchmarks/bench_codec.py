@@ -0,0 +1,61 @@
+"""
+Compare the libyaml (C) and pure-Python YAML paths of ConfigCodec on large
+ExplodeAny configs.
+
+Usage:
+    python benchmarks/bench_codec.py [--groups 100 1000 5000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ConfigCodec as codec
+from generate_config import generate
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(group_counts, repeat):
+    if not codec.HAS_LIBYAML:
+        print("libyaml is not available; both columns use the pure-Python codec.")
+
+    header = f"{'groups':>8} {'size':>9} {'load py':>9} {'load C':>9} {'dump py':>9} {'dump C':>9} {'same':>5}"
+    print(header)
+    print("-" * len(header))
+
+    for count in group_counts:
+        data = generate(count)
+
+        dump_py, text_py = best_of(repeat, codec.dump, data, None, False)
+        dump_c, text_c = best_of(repeat, codec.dump, data, None, True)
+        payload = text_c.encode("utf-8")
+        load_py, _ = best_of(repeat, codec.load, payload, False)
+        load_c, _ = best_of(repeat, codec.load, payload, True)
+
+        print(
+            f"{count:>8} {len(payload) / 1024:>7.0f}KB "
+            f"{load_py:>8.3f}s {load_c:>8.3f}s {dump_py:>8.3f}s {dump_c:>8.3f}s "
+            f"{str(text_py == text_c):>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.groups, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
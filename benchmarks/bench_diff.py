@@ -0,0 +1,92 @@
+"""
+Time ConfigDiff on large configs: two identical copies, and copies with a
+handful of edits spread over Groups and VanillaEntity.
+
+"lazy" compares two lazily parsed copies of the same text, as the review
+dialog does when nothing was opened in the editor. With --check the script
+exits with status 1 if any diff takes a second or more.
+
+Usage:
+    python benchmarks/bench_diff.py [--groups 1000 3000] [--repeat 3] [--check]
+"""
+import argparse
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ConfigCodec as codec
+from bench_codec import best_of
+from ConfigDiff import diff
+from generate_config import generate
+from LazyLoader import parse
+
+BUDGET = 1.0
+
+
+def count_nodes(value):
+    if isinstance(value, dict):
+        return 1 + sum(count_nodes(item) for item in value.values())
+    if isinstance(value, list):
+        return 1 + sum(count_nodes(item) for item in value)
+    return 1
+
+
+def edit(data, count):
+    """Make a few changes of every kind the diff reports."""
+    groups = data["Groups"]
+    vanilla_entity = data["VanillaEntity"]
+    entity_groups = list(vanilla_entity)
+    for index in range(0, count, max(1, count // 5)):
+        entity_group = entity_groups[index]
+        for block_group in vanilla_entity[entity_group]["Materials"]:
+            groups[block_group].append("NEW_MATERIAL")
+        groups[entity_group].reverse()  # same set, no change
+        vanilla_entity[entity_group]["Properties"]["ExplosionRadius"] = 99.0
+    del vanilla_entity[entity_groups[-1]]
+    groups["NewGroup"] = ["STONE"]
+
+
+def run(group_counts, repeat, check):
+    header = f"{'groups':>8} {'nodes':>9} {'identical':>10} {'edited':>10} {'changes':>8} {'lazy':>10}"
+    print(header)
+    print("-" * len(header))
+
+    slowest = 0.0
+    for count in group_counts:
+        data = generate(count)
+        same = copy.deepcopy(data)
+        edited = copy.deepcopy(data)
+        edit(edited, count)
+        text = codec.dump(data)
+        old_lazy, _ = parse(text, with_source=False)
+        new_lazy, _ = parse(text, with_source=False)
+
+        identical, _ = best_of(repeat, diff, data, same)
+        changed, changes = best_of(repeat, diff, data, edited)
+        lazy, _ = best_of(repeat, diff, old_lazy, new_lazy)
+        slowest = max(slowest, identical, changed, lazy)
+
+        print(
+            f"{count:>8} {count_nodes(data):>9} {identical:>9.3f}s {changed:>9.3f}s "
+            f"{len(changes):>8} {lazy:>9.3f}s"
+        )
+
+    if check and slowest >= BUDGET:
+        print(f"A diff took {slowest:.3f}s, over the {BUDGET:.1f}s budget.")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[1000, 3000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    sys.exit(run(args.groups, args.repeat, args.check))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Time switching the property editor between the pages of a generated config
+(see generate_config.py), offscreen, and count the style work each switch
+causes: polish events (a widget being styled) and style changes (a widget's
+style being recomputed, e.g. when its stylesheet is set).
+
+"Properties" and "Materials" switch one editor between pages, rebuilding
+each from the widgets of the last; "revisits" goes back and forth between
+as many Properties pages as the editor keeps built (page_cache_size);
+"new editor" builds an editor with fresh widgets for every Properties page,
+as the first visit to a page does.
+
+Usage:
+    python benchmarks/bench_editor_pages.py [--pairs 200] [--pages 60]
+        [--blocks-per-entity 2]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+import Backend as backend
+import Theme
+from ConfigPath import ConfigPath
+from generate_config import write
+
+
+class StyleEventCounter(QObject):
+    """Counts polish and style change events delivered anywhere in the application."""
+
+    COUNTED = {QEvent.Type.Polish: "polish", QEvent.Type.StyleChange: "style changes"}
+
+    def __init__(self):
+        super().__init__()
+        self.counts = dict.fromkeys(self.COUNTED.values(), 0)
+
+    def eventFilter(self, watched, event):
+        name = self.COUNTED.get(event.type())
+        if name is not None:
+            self.counts[name] += 1
+        return False
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(percent / 100 * len(ordered)))]
+
+
+def run(pairs, pages, blocks_per_entity):
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    Theme.apply(app)
+    from Right_PropEditor import RightSection_Editor
+
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = os.path.join(folder, "config.yml")
+        write(file_path, pairs, blocks_per_entity=blocks_per_entity)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = backend.YAMLConfigManager()
+            manager.load_yaml(file_path)
+            entity_groups = list(manager.get_yaml_data()["VanillaEntity"])[:pages]
+
+        editor = RightSection_Editor(backend.RightSection_BackEnd(file_path), section="")
+        editor.show()
+        app.processEvents()
+
+        counter = StyleEventCounter()
+        app.installEventFilter(counter)
+
+        header = f"{'page':<11} {'switches':>8} {'p50':>9} {'p90':>9} {'fields':>7} {'polish':>7} {'restyled':>8}"
+        print(header)
+        print("-" * len(header))
+        for kind in ("Properties", "Materials", "revisits", "new editor"):
+            groups = entity_groups
+            if kind == "revisits":
+                recent = entity_groups[: editor.page_cache_size]
+                for group in recent:
+                    editor.reload_config(file_path, ConfigPath(("VanillaEntity", group, "Properties")))
+                app.processEvents()
+                groups = [recent[index % len(recent)] for index in range(len(entity_groups))]
+            counter.counts = dict.fromkeys(counter.counts, 0)
+            times = []
+            fields = 0
+            for group in groups:
+                start = time.perf_counter()
+                if kind == "revisits":
+                    editor.reload_config(file_path, ConfigPath(("VanillaEntity", group, "Properties")))
+                elif kind == "new editor":
+                    editor.close()
+                    editor.deleteLater()
+                    editor = RightSection_Editor(
+                        backend.RightSection_BackEnd(file_path),
+                        section=ConfigPath(("VanillaEntity", group, "Properties")),
+                    )
+                    editor.show()
+                else:
+                    editor.update_ui(ConfigPath(("VanillaEntity", group, kind)))
+                app.sendPostedEvents()
+                app.processEvents()
+                times.append(time.perf_counter() - start)
+                fields += len(editor.line_edits)
+            switches = len(times)
+            print(
+                f"{kind:<11} {switches:>8} {_percentile(times, 50) * 1000:>7.2f}ms"
+                f" {_percentile(times, 90) * 1000:>7.2f}ms {fields / switches:>7.1f}"
+                f" {counter.counts['polish'] / switches:>7.1f}"
+                f" {counter.counts['style changes'] / switches:>8.1f}"
+            )
+        app.removeEventFilter(counter)
+        editor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=60, help="entity groups to switch between")
+    parser.add_argument("--blocks-per-entity", type=int, default=2)
+    args = parser.parse_args()
+    run(args.pairs, args.pages, args.blocks_per_entity)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time FleetEdit on a fleet of generated server configs: a dry run, then the
+same edits written for real.
+
+Every config gets a --set over all entity groups, an item added to and
+removed from a block group, and a new group pair. With --check the script
+exits with status 1 if a file fails or a pass takes BUDGET seconds or more.
+
+Usage:
+    python benchmarks/bench_fleet.py [--files 300] [--groups 30] [--jobs N] [--check]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ConfigCodec as codec
+import FleetEdit
+from generate_config import generate
+
+BUDGET = 20.0
+
+
+def operations(data):
+    """The edits made to every config generated as data."""
+    block_groups = list(data["VanillaEntity"][next(iter(data["VanillaEntity"]))]["Materials"])
+    return [
+        ("set", "VanillaEntity.*.Properties.ExplosionRadius", "4.0"),
+        ("add", block_groups[0], ["FLEET_MATERIAL"]),
+        ("remove", block_groups[0], [data["Groups"][block_groups[0]][0]]),
+        ("pair", "FleetEntity", "FleetBlock", False, True),
+    ]
+
+
+def timed_pass(files, edits, dry_run, jobs):
+    start = time.perf_counter()
+    results = list(FleetEdit.run(files, edits, dry_run, jobs))
+    return time.perf_counter() - start, results
+
+
+def run(file_count, groups, jobs, check):
+    with tempfile.TemporaryDirectory() as folder:
+        data = generate(groups)
+        edits = operations(data)
+        text = codec.dump(data)
+        files = []
+        for index in range(file_count):
+            file_path = os.path.join(folder, f"server{index}", "config.yml")
+            os.makedirs(os.path.dirname(file_path))
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(text)
+            files.append(file_path)
+
+        print(f"{file_count} configs of {len(text) / 1024:.0f}KB, {jobs or os.cpu_count()} jobs")
+        header = f"{'pass':>8} {'total':>9} {'per file':>9} {'failed':>7}"
+        print(header)
+        print("-" * len(header))
+
+        slowest = 0.0
+        failed = 0
+        for name, dry_run in (("dry run", True), ("write", False)):
+            seconds, results = timed_pass(files, edits, dry_run, jobs)
+            failures = sum(result["status"] == FleetEdit.FAILED for result in results)
+            slowest = max(slowest, seconds)
+            failed += failures
+            print(f"{name:>8} {seconds:>8.2f}s {seconds / file_count * 1000:>7.1f}ms {failures:>7}")
+
+    if check and (failed or slowest >= BUDGET):
+        print(f"{failed} files failed; the slowest pass took {slowest:.2f}s (budget {BUDGET:.0f}s).")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--groups", type=int, default=30)
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    sys.exit(run(args.files, args.groups, args.jobs, args.check))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time opening a config through the GUI open pipeline and report how often
+the file was parsed, read and written while doing it.
+
+Runs the real MainWindow offscreen. Each open uses a fresh copy of the
+file, so nothing is served from the DocumentCache. With --check the script
+exits with status 1 unless every open parsed the file exactly once and
+wrote nothing.
+
+Usage:
+    python benchmarks/bench_open.py [--groups 100 1000] [--repeat 3] [--check]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+import Backend as backend
+import MainUIv6 as UI
+import Run_ConfigEditor
+from generate_config import write
+
+
+def open_once(io, source, folder, index):
+    file_path = os.path.join(folder, f"open{index}.yml")
+    shutil.copyfile(source, file_path)
+    io.config_manager.reset_io_stats()
+    start = time.perf_counter()
+    io.open_file(file_path)
+    QApplication.processEvents()
+    return time.perf_counter() - start, io.config_manager.io_stats()
+
+
+def run(group_counts, repeat, check):
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = UI.MainWindow()
+    io = Run_ConfigEditor.MainInputOutput(window)
+    io.config_manager = backend.YAMLConfigManager()
+
+    header = f"{'groups':>8} {'size':>9} {'open':>9} {'parses':>7} {'groups':>7} {'writes':>7} {'read':>9}"
+    print(header)
+    print("-" * len(header))
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for count in group_counts:
+            source = os.path.join(folder, f"config{count}.yml")
+            write(source, count)
+
+            results = [open_once(io, source, folder, n) for n in range(repeat)]
+            seconds = min(result[0] for result in results)
+            stats = results[-1][1]
+            for _, run_stats in results:
+                if run_stats["parses"] != 1 or run_stats["writes"]:
+                    failures += 1
+
+            print(
+                f"{count:>8} {os.path.getsize(source) / 1024:>7.0f}KB {seconds:>8.3f}s "
+                f"{stats['parses']:>7} {stats['group_parses']:>7} {stats['writes']:>7} "
+                f"{stats['bytes_read'] / 1024:>7.0f}KB"
+            )
+    io.config_manager.save()
+    window.close()
+
+    if check and failures:
+        print(f"{failures} opens did not parse the file exactly once without writing.")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    sys.exit(run(args.groups, args.repeat, args.check))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Measure the per-access cost of config path lookups: the old split-and-walk
+code against ConfigPath/PathResolver with string and prebuilt paths.
+
+"cold" is the first lookup of each path on a fresh resolver; the other
+resolver columns are repeated lookups, as when the editor saves a page.
+
+Usage:
+    python benchmarks/bench_paths.py [--groups 100 1000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_codec import best_of
+from ConfigPath import ConfigPath, PathResolver, _parse
+from generate_config import generate
+
+
+def split_walk(data, path):
+    """The lookup every accessor used to do on each call."""
+    for key in path.split("."):
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+        elif isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        else:
+            return None
+    return data
+
+
+def split_set(data, path, value):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        data = data.setdefault(key, {})
+    data[keys[-1]] = value
+
+
+def leaf_paths(data, path=()):
+    """Every scalar under VanillaEntity, as the property editor visits them."""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from leaf_paths(value, path + (key,))
+        else:
+            yield path + (key,)
+
+
+def per_access(repeat, func, paths):
+    def run_all():
+        for path in paths:
+            func(path)
+
+    seconds, _ = best_of(repeat, run_all)
+    return seconds / len(paths) * 1e9
+
+
+def run(group_counts, repeat):
+    header = f"{'groups':>8} {'paths':>8} {'get split':>10} {'cold':>10} {'get str':>10} {'get tuple':>10} {'set split':>10} {'set str':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for count in group_counts:
+        data = generate(count)
+        tuples = [
+            ConfigPath(("VanillaEntity",) + path)
+            for path in leaf_paths(data["VanillaEntity"])
+        ]
+        strings = [str(path) for path in tuples]
+        _parse.cache_clear()
+        cold = per_access(1, PathResolver(data).get, strings)
+        resolver = PathResolver(data)
+
+        get_split = per_access(repeat, lambda path: split_walk(data, path), strings)
+        get_str = per_access(repeat, resolver.get, strings)
+        get_tuple = per_access(repeat, resolver.get, tuples)
+        set_split = per_access(repeat, lambda path: split_set(data, path, 1), strings)
+
+        def path_set(path):
+            container, key = resolver.parent(path, create=True)
+            container[key] = 1
+
+        set_str = per_access(repeat, path_set, strings)
+
+        print(
+            f"{count:>8} {len(tuples):>8} {get_split:>8.0f}ns {cold:>8.0f}ns {get_str:>8.0f}ns "
+            f"{get_tuple:>8.0f}ns {set_split:>8.0f}ns {set_str:>8.0f}ns"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.groups, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
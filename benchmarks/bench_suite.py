@@ -0,0 +1,236 @@
+"""
+Time the main YAMLConfigManager operations on generated configs of several
+sizes (see generate_config.py) and write the results as JSON, so releases
+can be compared.
+
+Each size gets a fresh file. Timed operations: load_yaml (cold cache),
+get_value, set_nested_value, add_items_to_group, remove_item_from_group,
+Add_Group_Pairs, and the save paths: a spliced save, a full dump and a save
+with nothing to write. Per-call times are averages over --calls calls, the
+others are the best of --repeat runs.
+
+With --compare, every result is shown next to the same result of an earlier
+run; with --check as well, the script exits with status 1 if anything got
+more than --tolerance times slower.
+
+The default sizes run from a tiny config up to 25,000 pairs, i.e. 50,000
+groups (an entity group and a block group per pair). The largest size
+takes a few minutes, mostly for the full dump; pass --pairs to skip it.
+
+Usage:
+    python benchmarks/bench_suite.py [--pairs 10 1000 10000 25000] [--calls 100]
+        [--repeat 3] [--output results.json] [--compare old.json [--check]]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+import ConfigCodec as codec
+from DocumentCache import DocumentCache
+from generate_config import MATERIALS, write
+
+TOLERANCE = 1.5
+
+
+def _quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    _quiet(func, *args)
+    return time.perf_counter() - start
+
+
+def _best(repeat, func, *args):
+    return min(_timed(func, *args) for _ in range(repeat))
+
+
+def _per_call(calls, func):
+    """Average time of func(index) over calls calls."""
+
+    def run():
+        for index in range(calls):
+            func(index)
+
+    return _timed(run) / calls
+
+
+def _load_fresh(manager, source, folder, counter=[0]):
+    counter[0] += 1
+    file_path = os.path.join(folder, f"load{counter[0]}.yml")
+    shutil.copyfile(source, file_path)
+    manager.load_yaml(file_path)
+
+
+def bench_size(pairs, calls, repeat, folder):
+    source = os.path.join(folder, f"config{pairs}.yml")
+    size = write(source, pairs)
+    manager = backend.YAMLConfigManager()
+    cache = DocumentCache()
+    rng = random.Random(pairs)
+    results = {}
+
+    results["load_yaml"] = _best(repeat, _load_fresh, manager, source, folder)
+
+    file_path = os.path.join(folder, f"edit{pairs}.yml")
+    shutil.copyfile(source, file_path)
+    _quiet(manager.load_yaml, file_path)
+    data = manager.get_yaml_data()
+    entity_groups = list(data["VanillaEntity"])
+    block_groups = [name for name in data["Groups"] if name not in data["VanillaEntity"]]
+
+    def property_path(index):
+        return f"VanillaEntity.{rng.choice(entity_groups)}.Properties.ExplosionRadius"
+
+    results["get_value"] = _per_call(calls, lambda i: manager.get_value(property_path(i)))
+
+    def set_nested(index):
+        entity_group = rng.choice(entity_groups)
+        _quiet(manager.set_nested_value, entity_group, None, "Properties", "ExplosionRadius", float(index))
+
+    results["set_nested_value"] = _per_call(calls, set_nested)
+
+    added = [(rng.choice(block_groups), f"BENCH_{index}") for index in range(calls)]
+    results["add_items_to_group"] = _per_call(
+        calls, lambda i: _quiet(manager.add_items_to_group, added[i][0], [added[i][1]])
+    )
+    results["remove_item_from_group"] = _per_call(
+        calls, lambda i: _quiet(manager.remove_item_from_group, *added[i])
+    )
+
+    pair_calls = max(1, calls // 5)
+    results["Add_Group_Pairs"] = _per_call(
+        pair_calls,
+        lambda i: _quiet(
+            backend.Add_Group_Pairs, manager, f"BenchEntity{i}", f"BenchBlock{i}", True, True, True, True
+        ),
+    )
+
+    results["save (spliced)"] = _timed(manager.save)
+
+    def full_dump():
+        # The same document written without splicing, as a fresh config is.
+        cache.write(file_path, data)
+
+    splice_saves = DocumentCache.splice_saves
+    DocumentCache.splice_saves = False
+    try:
+        manager.set_value(f"Groups.{block_groups[0]}", list(MATERIALS[:5]))
+        results["save (full dump)"] = _timed(full_dump)
+    finally:
+        DocumentCache.splice_saves = splice_saves
+    results["save (unchanged)"] = _best(repeat, full_dump)
+
+    return size, results
+
+
+def run(pair_counts, calls, repeat):
+    compact_delay = backend.YAMLConfigManager.compact_delay
+    # Keep background compaction out of the timings; saves are timed on their own.
+    backend.YAMLConfigManager.compact_delay = 3600
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            for pairs in pair_counts:
+                size, results = bench_size(pairs, calls, repeat, folder)
+                for operation, seconds in results.items():
+                    rows.append(
+                        {"pairs": pairs, "bytes": size, "operation": operation, "seconds": seconds}
+                    )
+            _quiet(backend.YAMLConfigManager().save)
+    finally:
+        backend.YAMLConfigManager.compact_delay = compact_delay
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "libyaml": codec.HAS_LIBYAML,
+            "calls": calls,
+            "repeat": repeat,
+        },
+        "results": rows,
+    }
+
+
+def _format(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def report(results, baseline=None, tolerance=TOLERANCE):
+    """
+    Print the results, next to baseline's if given. Returns the number of
+    results more than tolerance times slower than the baseline.
+    """
+    previous = {}
+    if baseline is not None:
+        for row in baseline["results"]:
+            previous[(row["pairs"], row["operation"])] = row["seconds"]
+
+    header = f"{'pairs':>7} {'operation':<24} {'time':>10}"
+    if baseline is not None:
+        header += f" {'before':>10} {'ratio':>7}"
+    print(header)
+    print("-" * len(header))
+
+    slower = 0
+    for row in results["results"]:
+        line = f"{row['pairs']:>7} {row['operation']:<24} {_format(row['seconds']):>10}"
+        before = previous.get((row["pairs"], row["operation"]))
+        if before:
+            ratio = row["seconds"] / before
+            flag = " !" if ratio > tolerance else ""
+            slower += ratio > tolerance
+            line += f" {_format(before):>10} {ratio:>6.2f}x{flag}"
+        print(line)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, nargs="+", default=[10, 1000, 10000, 25000])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = run(args.pairs, args.calls, args.repeat)
+    slower = report(results, baseline, args.tolerance)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=1)
+        print(f"Results written to {args.output}.")
+
+    if args.check and slower:
+        print(f"{slower} results are more than {args.tolerance:.1f}x slower than before.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Time what users wait for in the editor window, offscreen: opening a config,
+clicking an entity group and a block group, saving a changed property and
+adding and removing items, each repeated on a config generated by
+generate_config.py.
+
+Clicks go through QTest on the real widgets and dialogs are answered as soon
+as they open, so every time covers the handlers, the page they build and the
+repaint, but not the user. A save is timed until the SaveWorker reports it
+written. Prints percentiles per action and exits with status 1 if the
+--percentile of an action is over its budget (BUDGETS, in milliseconds).
+
+Usage:
+    python benchmarks/check_gui_latency.py [--pairs 1000] [--runs 20]
+        [--percentile 90] [--budget "entity group=100" ...] [--output latency.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QEventLoop, Qt, QTimer, qInstallMessageHandler
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication
+
+import MainUIv6 as UI
+import Run_ConfigEditor
+from generate_config import write
+from SaveWorker import SaveWorker
+
+# Milliseconds the --percentile of each action may take.
+BUDGETS = {
+    "open": 3000,
+    "entity group": 250,
+    "block group": 250,
+    "save": 1000,
+    "add items": 150,
+    "remove items": 150,
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _qt_message(mode, context, message):
+    # Dialogs ask every platform for this; the offscreen one only warns.
+    if "propagateSizeHints" not in message:
+        sys.stderr.write(f"{message}\n")
+
+
+def _settle(app):
+    """Deliver the events an action posted, including the repaint."""
+    app.sendPostedEvents()
+    app.processEvents()
+
+
+def _answer_dialog(fill=None):
+    """Fill in and accept the next dialog as soon as it is shown."""
+
+    def answer():
+        dialog = QApplication.activeModalWidget()
+        if dialog is None:
+            QTimer.singleShot(0, answer)
+            return
+        if fill is not None:
+            fill(dialog)
+        dialog.accept()
+
+    QTimer.singleShot(0, answer)
+
+
+def _click(widget, pos=None):
+    if pos is None:
+        QTest.mouseClick(widget, Qt.MouseButton.LeftButton)
+    else:
+        QTest.mouseClick(widget, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, pos)
+
+
+class LatencyHarness:
+    """
+    Drives one MainWindow and MainInputOutput through the timed actions and
+    collects the samples, in seconds, per action.
+    """
+
+    def __init__(self, source, folder, seed=0):
+        self.source = source
+        self.folder = folder
+        self.rng = random.Random(seed)
+        self.samples = {action: [] for action in BUDGETS}
+        self.opened = 0
+        self.app, self.window, self.io_handler, _ = Run_ConfigEditor.start([sys.argv[0]])
+        middle_section = self.window.findChild(UI.MiddleSection)
+        self.group_selector = middle_section.config_section.get_group_selector()
+        self.entity_block_section = self.window.findChild(UI.EntityBlockSection)
+        self.right_section = self.window.findChild(UI.RightSection)
+        _settle(self.app)
+
+    def timed(self, action, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        _settle(self.app)
+        self.samples[action].append(time.perf_counter() - start)
+
+    def open(self):
+        """Open a fresh copy of the config, so nothing is cached yet."""
+        self.opened += 1
+        file_path = os.path.join(self.folder, f"open{self.opened}.yml")
+        shutil.copyfile(self.source, file_path)
+        self.timed("open", self.io_handler.open_file, file_path)
+
+    def click_group(self, action, group):
+        group_list = self.group_selector.group_list
+        item = group_list.findItems(group, Qt.MatchFlag.MatchExactly)[0]
+        group_list.scrollToItem(item)
+        _settle(self.app)
+        pos = group_list.visualItemRect(item).center()
+        self.timed(action, _click, group_list.viewport(), pos)
+
+    def save(self, run):
+        editor = self.right_section.get_config_editor()
+        line_edit = next(
+            line_edit
+            for line_edit in editor.line_edits.values()
+            if line_edit.text().replace(".", "", 1).isdigit()
+        )
+        line_edit.setText(str(run + 1000))
+
+        loop = QEventLoop()
+        worker = SaveWorker.instance()
+        worker.saved.connect(loop.quit)
+        worker.failed.connect(loop.quit)
+        QTimer.singleShot(30000, loop.quit)
+
+        def click_and_wait():
+            _click(self.right_section.switch_button)
+            loop.exec()
+
+        try:
+            self.timed("save", click_and_wait)
+        finally:
+            worker.saved.disconnect(loop.quit)
+            worker.failed.disconnect(loop.quit)
+
+    def add_and_remove(self, run):
+        names = [f"LATENCY_{run}_A", f"LATENCY_{run}_B"]
+        _answer_dialog(lambda dialog: dialog.line_edit.setText(", ".join(names)))
+        self.timed("add items", _click, self.entity_block_section.add_block_button)
+
+        block_list = self.entity_block_section.block_list_widget
+        for name in names:
+            block_list.findItems(name, Qt.MatchFlag.MatchExactly)[0].setSelected(True)
+        self.timed("remove items", _click, self.entity_block_section.remove_button)
+
+    def run(self, runs):
+        for run in range(runs):
+            self.open()
+            pairs = self.io_handler.config_manager.group_pairs()
+            groups = pairs.ordered_groups()
+            entity_group = self.rng.choice([group for group in groups if pairs.is_entity(group)])
+            block_group = self.rng.choice([group for group in groups if pairs.is_block(group)])
+
+            self.click_group("entity group", entity_group)
+            self.save(run)
+            self.click_group("block group", block_group)
+            self.add_and_remove(run)
+        self.io_handler.config_manager.save()
+        SaveWorker.instance().wait_until_idle()
+        return self.samples
+
+
+def measure(pairs, runs, seed=0):
+    """Returns the samples of every action, in seconds, on a config of pairs group pairs."""
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "config.yml")
+        write(source, pairs, seed=seed)
+        qInstallMessageHandler(_qt_message)
+        with contextlib.redirect_stdout(io.StringIO()):
+            harness = LatencyHarness(source, folder, seed)
+            samples = harness.run(runs)
+            harness.window.close()
+    return samples
+
+
+def report(samples, budgets, checked):
+    """Print the percentiles and return the actions over budget."""
+    header = f"{'action':<14} {'runs':>5}" + "".join(f" {f'p{p}':>9}" for p in PERCENTILES)
+    header += f" {'max':>9} {'budget':>9}"
+    print(header)
+    print("-" * len(header))
+
+    over = []
+    for action, times in samples.items():
+        milliseconds = [seconds * 1000 for seconds in times]
+        line = f"{action:<14} {len(times):>5}"
+        line += "".join(f" {percentile(milliseconds, p):>7.1f}ms" for p in PERCENTILES)
+        line += f" {max(milliseconds):>7.1f}ms {budgets[action]:>7.0f}ms"
+        if percentile(milliseconds, checked) > budgets[action]:
+            over.append(action)
+            line += " !"
+        print(line)
+    return over
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--percentile", type=float, default=90, help="percentile checked against the budgets")
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="ACTION=MS", help="override an action's budget"
+    )
+    parser.add_argument("--output", help="write the samples and percentiles to this JSON file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    for override in args.budget:
+        action, _, milliseconds = override.partition("=")
+        if action not in budgets:
+            parser.error(f"unknown action {action!r}; known: {', '.join(budgets)}")
+        budgets[action] = float(milliseconds)
+
+    samples = measure(args.pairs, args.runs, args.seed)
+    print(f"{args.pairs} group pairs, {args.runs} runs, budgets on p{args.percentile:g}")
+    over = report(samples, budgets, args.percentile)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "pairs": args.pairs,
+                    "runs": args.runs,
+                    "budgets": budgets,
+                    "actions": {
+                        action: {
+                            "samples": times,
+                            **{f"p{p}": percentile(times, p) for p in PERCENTILES},
+                        }
+                        for action, times in samples.items()
+                    },
+                },
+                file,
+                indent=1,
+            )
+        print(f"Results written to {args.output}.")
+
+    if over:
+        print(f"Over budget: {', '.join(over)}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Check that the config core can be used without Qt: import every headless
+module in a fresh interpreter, report how long that took and fail if Qt
+was pulled in or the import took BUDGET seconds or more.
+
+Usage:
+    python benchmarks/check_headless.py [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET = 0.1
+
+# Modules scripts and the command-line tools rely on; none may import Qt.
+HEADLESS = (
+    "Backend",
+    "ConfigCodec",
+    "ConfigDiff",
+    "ConfigPath",
+    "DocumentCache",
+    "EditJournal",
+    "FleetEdit",
+    "GroupIndex",
+    "GroupPairs",
+    "LazyLoader",
+    "SourceMap",
+)
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+for name in {HEADLESS!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+qt = sorted(name for name in sys.modules if name.split(".")[0] in ("PyQt5", "PyQt6", "PySide6"))
+print(seconds, ",".join(qt))
+"""
+
+
+def probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1].split(",") if len(output) > 1 else []
+
+
+def run(repeat):
+    results = [probe() for _ in range(repeat)]
+    seconds = min(result[0] for result in results)
+    qt = sorted({name for result in results for name in result[1]})
+    print(f"{len(HEADLESS)} modules imported in {seconds * 1000:.1f}ms (best of {repeat})")
+
+    if qt:
+        print(f"Qt was imported: {', '.join(qt)}")
+        return 1
+    if seconds >= BUDGET:
+        print(f"The import took {seconds:.3f}s, over the {BUDGET:.1f}s budget.")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Time how long the editor takes to show its window, phase by phase, in a
+fresh interpreter per run (offscreen, nothing opened).
+
+Exits with status 1 if the window took BUDGET seconds or more, or if a
+module that startup defers (PyYAML, the config backend and the document
+machinery under it, the property editor, the tooltips) was imported before
+the window was shown.
+
+Usage:
+    python benchmarks/check_startup.py [--repeat 5] [--budget 1.0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET = 1.0
+
+DEFERRED = (
+    "yaml",
+    "Backend",
+    "ConfigPath",
+    "ConfigDiff",
+    "DocumentCache",
+    "EditJournal",
+    "GroupIndex",
+    "GroupPairs",
+    "LazyLoader",
+    "LoadWorker",
+    "SourceMap",
+    "Right_PropEditor",
+    "Tooltips",
+)
+
+PROBE = f"""
+import json, sys
+import Run_ConfigEditor
+app, window, io_handler, timer = Run_ConfigEditor.start([sys.argv[0]])
+app.processEvents()
+timer.mark("first paint")
+loaded = [name for name in {DEFERRED!r} if name in sys.modules]
+print(json.dumps({{"phases": timer.phases, "total": timer.elapsed(), "loaded": loaded}}))
+"""
+
+
+def probe():
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat, budget):
+    results = [probe() for _ in range(repeat)]
+    best = min(results, key=lambda result: result["total"])
+
+    header = f"{'phase':<14} {'best run':>10}"
+    print(header)
+    print("-" * len(header))
+    for phase, seconds in best["phases"]:
+        print(f"{phase:<14} {seconds * 1000:>8.1f}ms")
+    print(f"{'total':<14} {best['total'] * 1000:>8.1f}ms")
+
+    loaded = sorted({name for result in results for name in result["loaded"]})
+    if loaded:
+        print(f"Loaded before the window was shown: {', '.join(loaded)}")
+        return 1
+    if best["total"] >= budget:
+        print(f"The window took {best['total']:.3f}s, over the {budget:.1f}s budget.")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=BUDGET)
+    args = parser.parse_args()
+    sys.exit(run(args.repeat, args.budget))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Generate realistic ExplodeAny configs of any size for benchmarks.
+
+A config starts from the defaults of a new config (Backend.default_config)
+and gets pairs of entity and block groups, built the way the editor builds
+them (_generate_properties, _generate_materials). Groups hold real entity
+types and block materials. The output is the same for the same arguments.
+
+Usage:
+    python benchmarks/generate_config.py out.yml [--pairs 1000] [--items 20]
+        [--particles 0.5] [--sounds 0.5] [--blocks-per-entity 1] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+import ConfigCodec as codec
+
+# Block materials explosions are commonly tuned for.
+MATERIALS = (
+    "STONE", "COBBLESTONE", "MOSSY_COBBLESTONE", "STONE_BRICKS", "CRACKED_STONE_BRICKS",
+    "DEEPSLATE", "COBBLED_DEEPSLATE", "DEEPSLATE_BRICKS", "DEEPSLATE_TILES", "TUFF",
+    "GRANITE", "DIORITE", "ANDESITE", "CALCITE", "BASALT", "BLACKSTONE",
+    "POLISHED_BLACKSTONE_BRICKS", "GILDED_BLACKSTONE", "NETHERRACK", "NETHER_BRICKS",
+    "RED_NETHER_BRICKS", "END_STONE", "END_STONE_BRICKS", "PURPUR_BLOCK", "OBSIDIAN",
+    "CRYING_OBSIDIAN", "ANCIENT_DEBRIS", "NETHERITE_BLOCK", "DIAMOND_BLOCK",
+    "EMERALD_BLOCK", "GOLD_BLOCK", "IRON_BLOCK", "COPPER_BLOCK", "LAPIS_BLOCK",
+    "REDSTONE_BLOCK", "COAL_BLOCK", "ANVIL", "CHIPPED_ANVIL", "DAMAGED_ANVIL",
+    "ENCHANTING_TABLE", "ENDER_CHEST", "CHEST", "BARREL", "FURNACE", "BLAST_FURNACE",
+    "HOPPER", "BEACON", "CONDUIT", "SPAWNER", "RESPAWN_ANCHOR", "LODESTONE",
+    "BRICKS", "MUD_BRICKS", "PRISMARINE", "PRISMARINE_BRICKS", "DARK_PRISMARINE",
+    "SANDSTONE", "RED_SANDSTONE", "QUARTZ_BLOCK", "SMOOTH_QUARTZ", "TERRACOTTA",
+    "WHITE_CONCRETE", "BLACK_CONCRETE", "GRAY_CONCRETE", "RED_CONCRETE",
+    "BLUE_CONCRETE", "GREEN_CONCRETE", "YELLOW_CONCRETE", "GLASS", "TINTED_GLASS",
+    "OAK_PLANKS", "SPRUCE_PLANKS", "BIRCH_PLANKS", "JUNGLE_PLANKS", "ACACIA_PLANKS",
+    "DARK_OAK_PLANKS", "MANGROVE_PLANKS", "CHERRY_PLANKS", "CRIMSON_PLANKS",
+    "WARPED_PLANKS", "OAK_LOG", "SPRUCE_LOG", "BIRCH_LOG", "DIRT", "GRASS_BLOCK",
+    "GRAVEL", "SAND", "CLAY", "MUD", "SNOW_BLOCK", "ICE", "PACKED_ICE", "BLUE_ICE",
+    "IRON_BARS", "IRON_DOOR", "IRON_TRAPDOOR", "CHAIN", "BEDROCK", "REINFORCED_DEEPSLATE",
+    "SCULK", "SCULK_CATALYST", "SHULKER_BOX", "BOOKSHELF", "TNT", "WATER", "LAVA",
+)
+
+# Entity group names are built from these so they read like real configs.
+_ENTITY_GROUP_NAMES = ("Tnt", "Creepers", "Withers", "Crystals", "Fireballs", "Beds")
+_BLOCK_GROUP_NAMES = ("Stone", "Ores", "Obsidian", "Bricks", "Wood", "Glass", "Storage")
+
+
+def generate(pairs, items=20, particles=0.5, sounds=0.5, blocks_per_entity=1, seed=0):
+    """
+    Returns a config with `pairs` entity groups, each paired with
+    `blocks_per_entity` block groups of `items` materials. particles and
+    sounds are the share (0 to 1) of groups that get Particles and Sound
+    sections.
+    """
+    rng = random.Random(seed)
+    data = backend.default_config()
+    groups = data["Groups"]
+    vanilla_entity = data["VanillaEntity"]
+
+    block_names = []
+    block_count = max(1, pairs * blocks_per_entity)
+    for index in range(block_count):
+        name = f"{_BLOCK_GROUP_NAMES[index % len(_BLOCK_GROUP_NAMES)]}{index}"
+        groups[name] = rng.sample(MATERIALS, min(items, len(MATERIALS)))
+        if items > len(MATERIALS):
+            groups[name] += [f"{rng.choice(MATERIALS)}_{n}" for n in range(items - len(MATERIALS))]
+        block_names.append(name)
+
+    for index in range(pairs):
+        name = f"{_ENTITY_GROUP_NAMES[index % len(_ENTITY_GROUP_NAMES)]}{index}"
+        groups[name] = rng.sample(backend.ENTITY_TYPES, rng.randint(1, 4))
+        paired = block_names[index * blocks_per_entity : (index + 1) * blocks_per_entity]
+        vanilla_entity[name] = {
+            "Materials": {
+                block: backend._generate_materials(
+                    rng.random() < particles, rng.random() < sounds
+                )
+                for block in paired
+            },
+            "Properties": backend._generate_properties(
+                rng.random() < particles, rng.random() < sounds
+            ),
+        }
+    return data
+
+
+def write(file_path, *args, **kwargs):
+    """
+    Generate a config (see generate) and write it to file_path. Returns its
+    size in bytes.
+    """
+    codec.write_file(file_path, generate(*args, **kwargs))
+    return os.path.getsize(file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="file to write the config to")
+    parser.add_argument("--pairs", type=int, default=1000, help="entity groups")
+    parser.add_argument("--items", type=int, default=20, help="materials per block group")
+    parser.add_argument("--particles", type=float, default=0.5, help="share with Particles")
+    parser.add_argument("--sounds", type=float, default=0.5, help="share with Sound")
+    parser.add_argument("--blocks-per-entity", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    size = write(
+        args.output,
+        args.pairs,
+        args.items,
+        args.particles,
+        args.sounds,
+        args.blocks_per_entity,
+        args.seed,
+    )
+    print(f"Wrote {args.output} ({args.pairs} pairs, {size / 1024:.0f}KB).")
+
+
+if __name__ == "__main__":
+    main()
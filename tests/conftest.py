@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    The QApplication shared by every GUI test. Qt allows one per process,
+    and objects such as the SaveWorker outlive a single test module.
+    """
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,65 @@
+"""
+Regression tests for ConfigDiff: values whose Python hash() is the same
+(hash(-1) == hash(-2) in CPython) must still be told apart.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from ConfigDiff import CHANGED, SubtreeHashes, diff, rebind
+from ConfigPath import ConfigPath
+
+
+def test_diff_tells_colliding_scalars_apart():
+    assert hash(-1) == hash(-2)
+    changes = diff({"a": {"x": -1}}, {"a": {"x": -2}})
+    assert [(change.kind, change.path, change.old, change.new) for change in changes] == [
+        (CHANGED, ConfigPath(("a", "x")), -1, -2)
+    ]
+
+
+def test_diff_tells_colliding_list_items_apart():
+    changes = diff({"a": [-1]}, {"a": [-2]})
+    assert [change.path for change in changes] == [ConfigPath(("a",))]
+
+
+def test_hashes_tell_types_apart():
+    hashes = SubtreeHashes()
+    values = [{"x": 1}, {"x": 1.0}, {"x": True}, {"x": "1"}, {"x": -1}, {"x": -2}]
+    assert len({hashes.of(value) for value in values}) == len(values)
+    assert hashes.of({"x": [-1]}) == SubtreeHashes().of({"x": [-1]})
+
+
+def test_rebind_adopts_colliding_scalar():
+    target = {"A": {"x": -1}}
+    inner = target["A"]
+    changes = rebind(target, {"A": {"x": -2}})
+    assert [change.path for change in changes] == [ConfigPath(("A", "x"))]
+    assert target == {"A": {"x": -2}}
+    assert target["A"] is inner
+
+
+def test_reload_from_disk_adopts_colliding_scalar(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": -1}}
+    backend.codec.write_file(file_path, data)
+
+    manager = backend.YAMLConfigManager()
+    manager.load_yaml(file_path)
+    path = ConfigPath(("VanillaEntity", "Tnt", "Properties", "ExplosionRadius"))
+    assert manager.get_value(path) == -1
+
+    # Another program changes the value; the file keeps its size.
+    with open(file_path, encoding="utf-8") as file:
+        text = file.read()
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(text.replace("ExplosionRadius: -1", "ExplosionRadius: -2"))
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    changes = manager.reload_from_disk()
+    assert [change.path for change in changes] == [path]
+    assert manager.get_value(path) == -2
@@ -0,0 +1,113 @@
+"""
+Changes another program makes to the open config are merged into the
+document while edits that are not saved yet are kept, and the editor's own
+saves are not mistaken for such changes.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from ConfigPath import ConfigPath
+
+PROPERTIES = "VanillaEntity.Tnt.Properties"
+RADIUS = ConfigPath(("VanillaEntity", "Tnt", "Properties", "ExplosionRadius"))
+DAMAGE = ConfigPath(("VanillaEntity", "Tnt", "Properties", "Damage"))
+
+
+def _write_config(file_path, radius, damage, blocks, later=0):
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {
+        "Materials": {},
+        "Properties": {"ExplosionRadius": radius, "Damage": damage},
+    }
+    data["Groups"]["Blocks"] = blocks
+    backend.codec.write_file(file_path, data)
+    # Make sure the change is seen even on file systems with coarse times.
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + later * 1_000_000_000))
+
+
+def _on_disk(file_path):
+    with open(file_path, "rb") as file:
+        return backend.codec.load(file.read())
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "compact_delay", 3600)
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, 1, 1.0, ["STONE"])
+    manager = backend.YAMLConfigManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(file_path)
+    yield manager
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.save()
+
+
+def test_disk_changes_merge_with_unsaved_edits(manager):
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.add_values(PROPERTIES, {"ExplosionRadius": 5})  # Journalled only
+        assert _on_disk(manager.file_path)["VanillaEntity"]["Tnt"]["Properties"]["ExplosionRadius"] == 1
+
+        # Another program changes the same value and two others.
+        _write_config(manager.file_path, 2, 3.0, ["STONE", "DIRT"], later=1)
+        changes = manager.reload_from_disk()
+
+        assert {change.path for change in changes} >= {DAMAGE, ConfigPath(("Groups", "Blocks"))}
+        assert manager.get_value(RADIUS) == 5  # The local edit wins
+        assert manager.get_value(DAMAGE) == 3.0  # Disk-only changes are adopted
+        assert manager.get_value("Groups.Blocks") == ["STONE", "DIRT"]
+
+        manager.save()
+
+    data = _on_disk(manager.file_path)
+    assert data["VanillaEntity"]["Tnt"]["Properties"] == {"ExplosionRadius": 5, "Damage": 3.0}
+    assert data["Groups"]["Blocks"] == ["STONE", "DIRT"]
+
+
+def test_own_saves_are_not_reloaded(manager):
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.add_values(PROPERTIES, {"ExplosionRadius": 5})
+        manager.save()
+        editor_backend = backend.RightSection_BackEnd(manager.file_path)
+        editor_backend.update_value(DAMAGE, 4.0)
+        editor_backend.save_config()
+
+        parses = manager.io_stats()["parses"]
+        assert manager.reload_from_disk() == []
+
+    assert manager.io_stats()["parses"] == parses
+    assert manager.get_value(RADIUS) == 5
+    assert manager.get_value(DAMAGE) == 4.0
+
+
+def test_watcher_reports_own_save_without_changes(app, manager):
+    from ConfigWatcher import ConfigWatcher
+
+    watcher = ConfigWatcher()
+    watcher.debounce = 50
+    reported = []
+    watcher.changed.connect(lambda file_path: reported.append(manager.reload_from_disk()))
+    watcher.watch(manager.file_path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.add_values(PROPERTIES, {"ExplosionRadius": 5})
+            manager.save()
+            parses = manager.io_stats()["parses"]
+            deadline = time.monotonic() + 5
+            while not reported and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert reported == [[]]
+    assert manager.io_stats()["parses"] == parses
@@ -0,0 +1,47 @@
+"""
+A cached property page is reused only while the digest of its section is
+unchanged, so the digest must change for values whose Python hash() is the
+same (hash(-1) == hash(-2) in CPython).
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+import Backend as backend
+from ConfigPath import ConfigPath
+from Right_PropEditor import RightSection_Editor
+
+TNT = ConfigPath(("VanillaEntity", "Tnt", "Properties"))
+OTHER = ConfigPath(("VanillaEntity", "Other", "Properties"))
+RADIUS = TNT.child("ExplosionRadius")
+
+
+def test_cached_page_shows_colliding_change(app, tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    for name in ("Tnt", "Other"):
+        data["VanillaEntity"][name] = {"Materials": {}, "Properties": {"ExplosionRadius": -1}}
+    backend.codec.write_file(file_path, data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        backend.YAMLConfigManager().load_yaml(file_path)
+
+    editor = RightSection_Editor(backend.RightSection_BackEnd(""), section="")
+    editor.reload_config(file_path, TNT)
+    app.processEvents()
+    page = editor.page
+    assert editor.line_edits[RADIUS].text() == "-1"
+
+    editor.reload_config(file_path, OTHER)
+    editor.backend.update_value(RADIUS, -2)
+    editor.reload_config(file_path, TNT)
+    app.processEvents()
+
+    assert editor.page is page
+    assert editor.line_edits[RADIUS].text() == "-2"
@@ -0,0 +1,91 @@
+"""
+FleetEdit must write a file exactly when its values change, even when the
+old and new value have the same hash() (hash(-1) == hash(-2) in CPython),
+and must leave the application's settings as it found them.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+import FleetEdit
+from DocumentCache import DocumentCache
+
+RADIUS = "VanillaEntity.Tnt.Properties.ExplosionRadius"
+
+
+def _write_config(file_path, radius):
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": radius}}
+    data["Groups"]["Blocks"] = ["STONE"]
+    backend.codec.write_file(file_path, data)
+
+
+def _radius(file_path):
+    with open(file_path, "rb") as file:
+        return backend.codec.load(file.read())["VanillaEntity"]["Tnt"]["Properties"][
+            "ExplosionRadius"
+        ]
+
+
+def _writes():
+    stats = DocumentCache().stats()
+    return stats["writes"] + stats["skipped_writes"]
+
+
+def test_set_colliding_value_is_written(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, -1)
+
+    result = FleetEdit.edit_file(file_path, [("set", RADIUS, "-2")])
+
+    assert result["status"] == FleetEdit.CHANGED, result
+    assert _radius(file_path) == -2
+
+
+def test_set_same_value_writes_nothing(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, -1)
+    before = _writes()
+
+    result = FleetEdit.edit_file(file_path, [("set", RADIUS, "-1")])
+
+    assert result["status"] == FleetEdit.UNCHANGED, result
+    assert _writes() == before
+
+
+def test_edit_writes_once(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, -1)
+    before = _writes()
+
+    result = FleetEdit.edit_file(
+        file_path, [("set", RADIUS, "4.0"), ("add", "Blocks", ["OBSIDIAN"])]
+    )
+
+    assert result["status"] == FleetEdit.CHANGED, result
+    assert _writes() == before + 1
+    assert _radius(file_path) == 4.0
+
+
+def test_edit_restores_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", True)
+    monkeypatch.setattr(DocumentCache, "lazy_loading", True)
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, -1)
+
+    FleetEdit.edit_file(file_path, [("set", RADIUS, "-2")])
+
+    assert backend.YAMLConfigManager.journal_enabled is True
+    assert DocumentCache.lazy_loading is True
+
+
+def test_set_empty_value_sets_empty_string(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, -1)
+
+    result = FleetEdit.edit_file(file_path, [("set", RADIUS, "")])
+
+    assert result["status"] == FleetEdit.CHANGED, result
+    assert _radius(file_path) == ""
@@ -0,0 +1,90 @@
+"""
+Importing group items from a text or CSV file (read_group_items and
+YAMLConfigManager.import_group_items).
+"""
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from Backend import read_group_items
+
+
+def _items_file(tmp_path, text, encoding="utf-8"):
+    file_path = tmp_path / "items.csv"
+    file_path.write_bytes(text.encode(encoding))
+    return str(file_path)
+
+
+def test_header_row_is_skipped(tmp_path):
+    file_path = _items_file(tmp_path, "group,material\nBlocks,STONE\n")
+    assert read_group_items(file_path) == ({"Blocks": ["STONE"]}, 0)
+
+
+def test_header_row_is_skipped_in_any_case(tmp_path):
+    file_path = _items_file(tmp_path, "Group, Material\nBlocks,STONE\n")
+    assert read_group_items(file_path) == ({"Blocks": ["STONE"]}, 0)
+
+
+def test_comments_and_blank_lines_are_ignored(tmp_path):
+    file_path = _items_file(tmp_path, "# Blocks for the arena\n\nBlocks,STONE\n  # indented\n,\n")
+    assert read_group_items(file_path) == ({"Blocks": ["STONE"]}, 0)
+
+
+def test_single_column_rows_go_to_default_group(tmp_path):
+    file_path = _items_file(tmp_path, "STONE\nOres,IRON_ORE\nDIRT\n")
+    assert read_group_items(file_path, "Blocks") == (
+        {"Blocks": ["STONE", "DIRT"], "Ores": ["IRON_ORE"]},
+        0,
+    )
+
+
+def test_byte_order_mark_is_dropped(tmp_path):
+    file_path = _items_file(tmp_path, "group,material\nBlocks,STONE\n", "utf-8-sig")
+    assert read_group_items(file_path) == ({"Blocks": ["STONE"]}, 0)
+
+
+def test_materials_are_normalized_and_deduplicated(tmp_path):
+    file_path = _items_file(
+        tmp_path, "Blocks, stone\nBlocks,STONE\nBlocks,crying obsidian\nBlocks,Crying-Obsidian\n"
+    )
+    assert read_group_items(file_path) == ({"Blocks": ["STONE", "CRYING_OBSIDIAN"]}, 0)
+
+
+def test_rows_without_a_group_are_counted(tmp_path):
+    # No default group for a bare material, and an empty group name.
+    file_path = _items_file(tmp_path, "STONE\n,DIRT\nBlocks,SAND\n")
+    assert read_group_items(file_path) == ({"Blocks": ["SAND"]}, 2)
+
+
+def test_import_is_one_transaction_with_one_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", False)
+    config_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["Groups"]["Blocks"] = ["STONE"]
+    data["Groups"]["Ores"] = ["COAL_ORE"]
+    backend.codec.write_file(config_path, data)
+    file_path = _items_file(
+        tmp_path, "group,material\nBlocks,stone\nBlocks,dirt\nOres,iron ore\nMissing,SAND\nGRAVEL\n"
+    )
+
+    manager = backend.YAMLConfigManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(config_path)
+        writes = manager.io_stats()["writes"]
+        summary = manager.import_group_items(file_path)
+
+    assert summary == {
+        "added": {"Blocks": 1, "Ores": 1},
+        "duplicates": 1,
+        "unknown_groups": ["Missing"],
+        "skipped_rows": 1,
+    }
+    assert manager.io_stats()["writes"] == writes + 1
+    with open(config_path, "rb") as file:
+        groups = backend.codec.load(file.read())["Groups"]
+    assert groups["Blocks"] == ["STONE", "DIRT"]
+    assert groups["Ores"] == ["COAL_ORE", "IRON_ORE"]
@@ -0,0 +1,79 @@
+"""
+The GroupIndex of a group must agree with the group's list on disk after
+every add (with and without dedupe) and removal.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from GroupIndex import GroupIndex
+
+ABSENT = ["BEDROCK", "BARRIER"]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", False)
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["Groups"]["Blocks"] = ["STONE", "DIRT", "SAND"]
+    backend.codec.write_file(file_path, data)
+
+    manager = backend.YAMLConfigManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(file_path)
+    return manager
+
+
+def _check_against_disk(manager):
+    with open(manager.file_path, "rb") as file:
+        on_disk = backend.codec.load(file.read())["Groups"]["Blocks"]
+    assert manager.get_value("Groups.Blocks") == on_disk
+    for item in on_disk:
+        assert manager.group_contains("Blocks", item)
+    for item in ABSENT:
+        assert not manager.group_contains("Blocks", item)
+    if manager.dedupe_group_items:
+        assert manager.new_group_items("Blocks", on_disk + ABSENT) == ABSENT
+    return on_disk
+
+
+def test_index_follows_adds_and_removals(manager, monkeypatch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        _check_against_disk(manager)
+
+        manager.add_items_to_group("Blocks", ["GRAVEL", "STONE", "GRAVEL"])
+        assert _check_against_disk(manager) == ["STONE", "DIRT", "SAND", "GRAVEL"]
+
+        manager.add_items_to_group("Blocks", ["DIRT", "CLAY"], dedupe=False)
+        assert _check_against_disk(manager) == ["STONE", "DIRT", "SAND", "GRAVEL", "DIRT", "CLAY"]
+
+        # One of the two DIRT entries goes; the other is still listed.
+        manager.remove_item_from_group("Blocks", "DIRT")
+        assert _check_against_disk(manager) == ["STONE", "SAND", "GRAVEL", "DIRT", "CLAY"]
+
+        manager.remove_items_from_group("Blocks", ["CLAY", "STONE", "BEDROCK", "DIRT"])
+        assert _check_against_disk(manager) == ["SAND", "GRAVEL"]
+
+        monkeypatch.setattr(backend.YAMLConfigManager, "dedupe_group_items", False)
+        manager.add_items_to_group("Blocks", ["SAND"])
+        assert _check_against_disk(manager) == ["SAND", "GRAVEL", "SAND"]
+
+
+def test_remove_many_matches_repeated_remove():
+    items = ["A", "B", "A", "C", "B", "A"]
+    one_by_one = GroupIndex(list(items))
+    for item in ["A", "B", "D", "A"]:
+        one_by_one.remove(item)
+    batch = GroupIndex(list(items))
+
+    assert batch.remove_many(["A", "B", "D", "A"]) == ["A", "B", "A"]
+    assert batch.items == one_by_one.items == ["C", "B", "A"]
+    assert len(batch) == 3 and "A" in batch and "D" not in batch
+    assert batch.matches(batch.items)
@@ -0,0 +1,62 @@
+"""
+The GroupPairs index kept in step by YAMLConfigManager must always equal
+an index built from scratch from the same document.
+"""
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from GroupPairs import GroupPairs
+
+
+def _check_against_rebuild(manager):
+    data = manager.get_yaml_data()
+    rebuilt = GroupPairs(data["VanillaEntity"], data["Groups"])
+    pairs = manager.group_pairs()
+    assert pairs.entity_to_blocks == rebuilt.entity_to_blocks
+    assert pairs.block_to_entity == rebuilt.block_to_entity
+    assert pairs.orphans() == rebuilt.orphans()
+    assert pairs.ordered_groups() == rebuilt.ordered_groups()
+
+
+def test_index_matches_rebuild_after_each_operation(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", False)
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["Groups"]["Loose"] = ["STONE"]
+    backend.codec.write_file(file_path, data)
+    items_path = tmp_path / "items.csv"
+    items_path.write_text("Blocks1,OBSIDIAN\nCreepers,CREEPER\nNew,SAND\n", encoding="utf-8")
+
+    manager = backend.YAMLConfigManager()
+    materials = "VanillaEntity.{}.Materials"
+    steps = [
+        lambda: backend.Add_Group_Pairs(manager, "Creepers", "Blocks1", True, True, True, True),
+        lambda: backend.Add_Group_Pairs(manager, "Tnt", "Blocks2", False, False, False, False),
+        lambda: manager.import_group_items(str(items_path)),
+        # Blocks1 is now listed by both entity groups; the last one wins.
+        lambda: manager.add_values(materials.format("Tnt"), {"Blocks1": {}}),
+        # Tnt drops Blocks1 again; Blocks1 goes back to Creepers.
+        lambda: manager.add_values("VanillaEntity.Tnt", {"Materials": {"Blocks2": {}}}),
+        lambda: manager.add_values(materials.format("Tnt"), {"Blocks1": {}}),
+        lambda: manager.rename_group("Blocks1", "Ores"),
+        lambda: manager.rename_group("Tnt", "Bombs"),
+        lambda: manager.delete_group("Blocks2"),
+        lambda: manager.delete_group("Ores"),
+        lambda: manager.add_values(materials.format("Creepers"), {"Loose": {}}),
+        lambda: manager.delete_group("Creepers"),
+        lambda: manager.rename_group("Loose", "Stones"),
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(file_path)
+        pairs = manager.group_pairs()
+        _check_against_rebuild(manager)
+        for step in steps:
+            step()
+            # Updated in place, not dropped and rebuilt on next use.
+            assert manager.group_pairs() is pairs
+            _check_against_rebuild(manager)
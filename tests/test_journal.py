@@ -0,0 +1,127 @@
+"""
+Edits are fsynced to a journal next to the config before the config itself
+is rewritten. A journal left behind by a crash is replayed on the next load
+when it belongs to the config on disk, and discarded otherwise.
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Backend as backend
+from EditJournal import EditJournal
+
+TNT = "VanillaEntity.Tnt.Properties"
+
+# Edit a config, then die without compacting the journal or cleaning up.
+KILLED_SESSION = textwrap.dedent(
+    """
+    import os, sys
+    sys.path.insert(0, sys.argv[1])
+    import Backend
+    Backend.YAMLConfigManager.compact_delay = 3600
+    manager = Backend.YAMLConfigManager()
+    manager.load_yaml(sys.argv[2])
+    manager.add_values(%r, {"ExplosionRadius": 7})
+    manager.add_items_to_group("Blocks", ["OBSIDIAN"])
+    os._exit(0)
+    """
+    % TNT
+)
+
+
+def _write_config(file_path):
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": 1}}
+    data["Groups"]["Blocks"] = ["STONE"]
+    backend.codec.write_file(file_path, data)
+
+
+def _read(file_path):
+    with open(file_path, "rb") as file:
+        return backend.codec.load(file.read())
+
+
+def _killed_session(file_path):
+    with open(file_path, "rb") as file:
+        before = file.read()
+    subprocess.run([sys.executable, "-c", KILLED_SESSION, ROOT, file_path], check=True)
+    with open(file_path, "rb") as file:
+        assert file.read() == before  # Nothing but the journal was written
+    assert os.path.exists(file_path + EditJournal.SUFFIX)
+
+
+def _load(file_path):
+    manager = backend.YAMLConfigManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(file_path)
+    return manager
+
+
+def test_edits_survive_a_hard_kill(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path)
+    _killed_session(file_path)
+
+    manager = _load(file_path)
+
+    assert manager.get_value(TNT + ".ExplosionRadius") == 7
+    assert manager.get_value("Groups.Blocks") == ["STONE", "OBSIDIAN"]
+    # The replayed edits are compacted into the config right away.
+    data = _read(file_path)
+    assert data["VanillaEntity"]["Tnt"]["Properties"]["ExplosionRadius"] == 7
+    assert data["Groups"]["Blocks"] == ["STONE", "OBSIDIAN"]
+    assert not os.path.exists(file_path + EditJournal.SUFFIX)
+
+
+def test_stale_journal_is_discarded(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path)
+    _killed_session(file_path)
+    # Another program replaces the config; the journal no longer applies.
+    data = _read(file_path)
+    data["Groups"]["Blocks"] = ["DIRT"]
+    backend.codec.write_file(file_path, data)
+
+    manager = _load(file_path)
+
+    assert manager.get_value(TNT + ".ExplosionRadius") == 1
+    assert manager.get_value("Groups.Blocks") == ["DIRT"]
+    assert _read(file_path) == data
+    assert not os.path.exists(file_path + EditJournal.SUFFIX)
+
+
+def test_compaction_folds_the_journal_into_the_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "compact_delay", 3600)
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path)
+    manager = _load(file_path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.add_items_to_group("Blocks", ["OBSIDIAN"])
+        assert os.path.exists(file_path + EditJournal.SUFFIX)
+        assert _read(file_path)["Groups"]["Blocks"] == ["STONE"]
+        manager.save()
+
+    assert _read(file_path)["Groups"]["Blocks"] == ["STONE", "OBSIDIAN"]
+    assert not os.path.exists(file_path + EditJournal.SUFFIX)
+
+
+def test_truncated_last_entry_is_ignored(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path)
+    _killed_session(file_path)
+    # A crash in the middle of an append leaves a partial last line.
+    with open(file_path + EditJournal.SUFFIX, "ab") as journal:
+        journal.write(b'{"op":"set","path":["Groups","Blo')
+
+    manager = _load(file_path)
+
+    assert manager.get_value(TNT + ".ExplosionRadius") == 7
+    assert manager.get_value("Groups.Blocks") == ["STONE", "OBSIDIAN"]
+    assert not os.path.exists(file_path + EditJournal.SUFFIX)
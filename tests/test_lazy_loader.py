@@ -0,0 +1,48 @@
+"""
+The lazy parse must give the same entity groups and block groups as a full
+parse, including for groups that take keys from an anchor.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ConfigCodec as codec
+from LazyLoader import material_keys, parse, resolve
+
+BASE = """\
+  base: &base
+    Materials:
+      B1:
+        Damage: 1
+"""
+
+ENTITIES = """\
+  Tnt:
+    <<: *base
+    Properties:
+      X: 1
+  Other:
+    Materials:
+      B2:
+        Damage: 1
+"""
+
+CONFIGS = {
+    # The anchor in another top-level section
+    "other section": "Defaults:\n" + BASE + "VanillaEntity:\n" + ENTITIES,
+    # The anchor on an entity group of its own
+    "same section": "VanillaEntity:\n" + BASE.replace("base:", "Base:") + ENTITIES,
+}
+
+
+@pytest.mark.parametrize("text", CONFIGS.values(), ids=list(CONFIGS))
+def test_merge_keys_match_full_parse(text):
+    full = codec.load(text)["VanillaEntity"]
+    lazy = parse(text)[0]["VanillaEntity"]
+
+    assert material_keys(lazy, "Tnt") == material_keys(full, "Tnt") == ["B1"]
+    assert material_keys(lazy, "Other") == ["B2"]
+    assert {key: resolve(value) for key, value in lazy.items()} == full
@@ -0,0 +1,48 @@
+"""
+Reopening a config that another program changed, while edits to it are not
+written yet, must keep both the edits and the other program's changes.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from ConfigPath import ConfigPath
+from DocumentCache import DocumentCache
+
+RADIUS = ConfigPath(("VanillaEntity", "Tnt", "Properties", "ExplosionRadius"))
+DAMAGE = ConfigPath(("VanillaEntity", "Tnt", "Properties", "Damage"))
+
+
+def _write_config(file_path, radius):
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {
+        "Materials": {},
+        "Properties": {"ExplosionRadius": radius, "Damage": 1.0},
+    }
+    backend.codec.write_file(file_path, data)
+    # Make sure the change is seen even on file systems with coarse times.
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + radius * 1_000_000_000))
+
+
+def test_reopen_keeps_unsaved_edits_after_change_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "compact_delay", 3600)
+    file_path = str(tmp_path / "config.yml")
+    _write_config(file_path, 1)
+
+    manager = backend.YAMLConfigManager()
+    manager.load_yaml(file_path)
+    manager.set_value(DAMAGE, 9.0)  # Journalled, not written yet
+
+    _write_config(file_path, 2)
+    # What a LoadWorker does on its thread before load_yaml() runs.
+    preloaded = DocumentCache().load(file_path)
+    manager.load_yaml(file_path, (preloaded, None))
+
+    assert manager.get_value(RADIUS) == 2
+    assert manager.get_value(DAMAGE) == 9.0
+    with open(file_path, "rb") as file:
+        on_disk = backend.codec.load(file.read())
+    assert on_disk["VanillaEntity"]["Tnt"]["Properties"] == {"ExplosionRadius": 2, "Damage": 9.0}
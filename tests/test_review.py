@@ -0,0 +1,79 @@
+"""
+Saving a property page must not read the file on the GUI thread. The
+review of a save is opt-in, and its diff runs on the thread pool.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+from PyQt6.QtCore import QThreadPool
+
+import Backend as backend
+import Right_PropEditor
+from ConfigPath import ConfigPath
+from Right_PropEditor import RightSection_Editor
+
+TNT = ConfigPath(("VanillaEntity", "Tnt", "Properties"))
+RADIUS = TNT.child("ExplosionRadius")
+
+
+@pytest.fixture
+def editor(app, tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": -1}}
+    backend.codec.write_file(file_path, data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        backend.YAMLConfigManager().load_yaml(file_path)
+
+    editor = RightSection_Editor(backend.RightSection_BackEnd(""), section="")
+    editor.reload_config(file_path, TNT)
+    app.processEvents()
+    return editor
+
+
+def _radius_on_disk(editor):
+    editor.save_worker.wait_until_idle()
+    with open(editor.backend.file_path, "rb") as file:
+        data = backend.codec.load(file.read())
+    return data["VanillaEntity"]["Tnt"]["Properties"]["ExplosionRadius"]
+
+
+def test_save_does_not_review_by_default(editor, monkeypatch):
+    def pending_changes(values=None):
+        raise AssertionError("The file was diffed on save.")
+
+    monkeypatch.setattr(editor.backend, "pending_changes", pending_changes)
+    editor.line_edits[RADIUS].setText("-2")
+    editor.save_changes()
+
+    assert _radius_on_disk(editor) == -2
+
+
+def test_review_runs_off_the_gui_thread(app, editor, monkeypatch):
+    shown = []
+
+    def exec_dialog(dialog):
+        shown.append(dialog.windowTitle())
+        return QtWidgets.QDialog.DialogCode.Accepted
+
+    monkeypatch.setattr(editor, "review_before_save", True)
+    monkeypatch.setattr(Right_PropEditor.ReviewChangesDialog, "exec", exec_dialog)
+    editor.line_edits[RADIUS].setText("-2")
+    editor.save_changes()
+
+    # Nothing is applied until the review comes back.
+    assert not shown
+    assert editor.backend.get_section(RADIUS) == -1
+
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert shown == ["Review Changes"]
+    assert _radius_on_disk(editor) == -2
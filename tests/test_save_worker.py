@@ -0,0 +1,91 @@
+"""
+SaveWorker: a burst of saves of one file is written once with the latest
+values, and the document can be edited while its snapshot is written.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("PyQt6.QtCore")
+
+import Backend as backend
+from ConfigPath import ConfigPath
+from DocumentCache import DocumentCache
+from SaveWorker import SaveWorker
+
+RADIUS = ConfigPath(("VanillaEntity", "Tnt", "Properties", "ExplosionRadius"))
+
+
+@pytest.fixture
+def editor_backend(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": 1}}
+    backend.codec.write_file(file_path, data)
+    return backend.RightSection_BackEnd(file_path)
+
+
+@pytest.fixture
+def worker(app):
+    worker = SaveWorker()
+    yield worker
+    worker.stop()
+
+
+def _radius_on_disk(file_path):
+    with open(file_path, "rb") as file:
+        data = backend.codec.load(file.read())
+    return data["VanillaEntity"]["Tnt"]["Properties"]["ExplosionRadius"]
+
+
+def test_burst_of_saves_is_written_once(editor_backend, worker):
+    file_path = editor_backend.file_path
+    saved = []
+    worker.saved.connect(lambda path, written: saved.append(path))
+    writes = DocumentCache().stats()["writes"]
+
+    # Holding the worker's condition keeps it from taking a request until
+    # the whole burst is queued, as when saves come faster than writes.
+    with contextlib.redirect_stdout(io.StringIO()):
+        with worker._condition:
+            for radius in range(2, 7):
+                editor_backend.update_value(RADIUS, radius)
+                worker.request_save(file_path, editor_backend.config_data)
+        worker.wait_until_idle()
+
+    assert DocumentCache().stats()["writes"] == writes + 1
+    assert _radius_on_disk(file_path) == 6
+
+
+@pytest.mark.parametrize("splice", [True, False], ids=["splice", "full dump"])
+def test_edits_during_a_write_do_not_reach_it(editor_backend, worker, monkeypatch, splice):
+    monkeypatch.setattr(DocumentCache, "splice_saves", splice)
+    file_path = editor_backend.file_path
+    write_snapshot = DocumentCache.write_snapshot
+    edited = []
+
+    def edit_then_write(cache, snapshot, written=None):
+        # The GUI keeps editing after the snapshot was taken.
+        if not edited:
+            editor_backend.update_value(RADIUS, 99)
+            edited.append(True)
+        return write_snapshot(cache, snapshot, written)
+
+    monkeypatch.setattr(DocumentCache, "write_snapshot", edit_then_write)
+    with contextlib.redirect_stdout(io.StringIO()):
+        editor_backend.update_value(RADIUS, 5)
+        worker.request_save(file_path, editor_backend.config_data)
+        worker.wait_until_idle()
+
+        assert _radius_on_disk(file_path) == 5
+        assert editor_backend.get_section(RADIUS) == 99
+
+        worker.request_save(file_path, editor_backend.config_data)
+        worker.wait_until_idle()
+
+    assert _radius_on_disk(file_path) == 99
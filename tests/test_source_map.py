@@ -0,0 +1,77 @@
+"""
+Splice saves: a changed scalar replaces only the value, so the rest of its
+line, e.g. a trailing comment, is kept. libyaml gives plain scalars the
+style "" where the pure-Python loader gives None; both must take the
+value-only path.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ConfigCodec as codec
+from Backend import RightSection_BackEnd
+from SourceMap import SourceMap
+
+TEXT = """\
+VanillaEntity:
+  Tnt:
+    Properties:
+      Damage: 50.0   # keep me
+      Name: 'Boom'   # quoted
+"""
+
+LOADERS = [pytest.param(False, id="python")]
+if codec.HAS_LIBYAML:
+    LOADERS.append(pytest.param(True, id="libyaml"))
+
+
+@pytest.mark.parametrize("fast", LOADERS)
+def test_splice_keeps_trailing_comments(fast):
+    data, source_map = SourceMap.parse(TEXT, fast)
+    properties = data["VanillaEntity"]["Tnt"]["Properties"]
+    properties["Damage"] = 75.0
+    properties["Name"] = "Bang"
+
+    text = source_map.splice(
+        data,
+        [
+            ("VanillaEntity", "Tnt", "Properties", "Damage"),
+            ("VanillaEntity", "Tnt", "Properties", "Name"),
+        ],
+    )
+    assert text == TEXT.replace("50.0", "75.0").replace("'Boom'", "Bang")
+
+
+def test_save_keeps_trailing_comments(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(TEXT)
+
+    editor_backend = RightSection_BackEnd(file_path)
+    editor_backend.update_value("VanillaEntity.Tnt.Properties.Damage", 75.0)
+    editor_backend.save_config()
+
+    with open(file_path, encoding="utf-8") as file:
+        assert file.read() == TEXT.replace("50.0", "75.0")
+
+
+def test_save_of_unchanged_values_keeps_file(tmp_path):
+    file_path = str(tmp_path / "config.yml")
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(TEXT)
+
+    editor_backend = RightSection_BackEnd(file_path)
+    # What saving a property page does: every field is applied, changed or not.
+    editor_backend.apply_values(
+        {
+            "VanillaEntity.Tnt.Properties.Damage": editor_backend.convert_to_type("50.0"),
+            "VanillaEntity.Tnt.Properties.Name": editor_backend.convert_to_type("Boom"),
+        }
+    )
+    editor_backend.save_config()
+
+    with open(file_path, encoding="utf-8") as file:
+        assert file.read() == TEXT
@@ -0,0 +1,103 @@
+"""
+YAMLConfigManager.transaction(): the mutations in a block are written
+once, when the outermost block exits, or rolled back entirely if it raises.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Backend as backend
+from EditJournal import EditJournal
+from LazyLoader import snapshot
+
+JOURNAL = [pytest.param(True, id="journal"), pytest.param(False, id="no journal")]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.YAMLConfigManager, "compact_delay", 3600)
+    file_path = str(tmp_path / "config.yml")
+    data = backend.default_config()
+    data["VanillaEntity"]["Tnt"] = {"Materials": {}, "Properties": {"ExplosionRadius": 1}}
+    data["Groups"]["Blocks"] = ["STONE", "DIRT"]
+    data["Groups"]["Creepers"] = ["CREEPER"]
+    backend.codec.write_file(file_path, data)
+
+    manager = backend.YAMLConfigManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_yaml(file_path)
+    yield manager
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.save()
+
+
+def _mutate(manager):
+    manager.add_values("VanillaEntity.Tnt.Properties", {"ExplosionRadius": 9})
+    manager.add_items_to_group("Blocks", ["OBSIDIAN"])
+    manager.remove_item_from_group("Blocks", "STONE")
+    manager.rename_group("Creepers", "Mobs")
+
+
+def _file_bytes(manager):
+    with open(manager.file_path, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("journal", JOURNAL)
+def test_exception_rolls_back_memory_and_file(manager, monkeypatch, journal):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", journal)
+    data_before = snapshot(manager.get_yaml_data())
+    file_before = _file_bytes(manager)
+    writes = manager.io_stats()["writes"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pytest.raises(RuntimeError):
+            with manager.transaction():
+                _mutate(manager)
+                raise RuntimeError("stop")
+
+    assert snapshot(manager.get_yaml_data()) == data_before
+    assert list(manager.get_yaml_data()["Groups"]) == list(data_before["Groups"])
+    assert _file_bytes(manager) == file_before
+    assert manager.io_stats()["writes"] == writes
+    assert not os.path.exists(manager.file_path + EditJournal.SUFFIX)
+
+
+@pytest.mark.parametrize("journal", JOURNAL)
+def test_nested_transactions_write_on_outermost_commit(manager, monkeypatch, journal):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", journal)
+    writes = manager.io_stats()["writes"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with manager.transaction():
+            with manager.transaction():
+                manager.add_items_to_group("Blocks", ["OBSIDIAN"])
+            assert manager.io_stats()["writes"] == writes
+            with manager.transaction():
+                manager.remove_item_from_group("Blocks", "STONE")
+            assert manager.io_stats()["writes"] == writes
+
+    assert manager.io_stats()["writes"] == writes + 1
+
+
+@pytest.mark.parametrize("journal", JOURNAL)
+def test_many_mutations_write_once(manager, monkeypatch, journal):
+    monkeypatch.setattr(backend.YAMLConfigManager, "journal_enabled", journal)
+    writes = manager.io_stats()["writes"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with manager.transaction():
+            _mutate(manager)
+            for item in ["SAND", "GRAVEL", "CLAY"]:
+                manager.add_items_to_group("Blocks", [item])
+
+    assert manager.io_stats()["writes"] == writes + 1
+    if not journal:
+        data = backend.codec.load(_file_bytes(manager))
+        assert data["Groups"]["Blocks"] == ["DIRT", "OBSIDIAN", "SAND", "GRAVEL", "CLAY"]
+        assert data["VanillaEntity"]["Tnt"]["Properties"]["ExplosionRadius"] == 9